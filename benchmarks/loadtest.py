@@ -0,0 +1,321 @@
+"""Uji beban: banyak sesi dashboard bersamaan lewat websocket Streamlit, sepenuhnya lokal.
+
+    python -m benchmarks.loadtest --sessions 1,5,10 --iterations 3
+    python -m benchmarks.loadtest --url ws://localhost:8501 --pid 12345 --sessions 20
+
+Tanpa `--url`, `streamlit run neet_dashboard.py` dijalankan di port lokal.
+Setiap sesi meniru browser: mengirim `BackMsg.rerun_script` berisi status
+widget dan membaca `ForwardMsg` sampai `script_finished`. ID widget dipelajari
+dari elemen yang dikirim server, dan widget di dalam fragment dijalankan
+ulang sebagai rerun fragment. Skenario tiap iterasi adalah menggeser
+`tahun_slider`, memilih `sim_region_selector` dan `sim_province_selector`,
+lalu menggeser slider simulasi beberapa kali. Hasilnya berupa latensi rerun
+p50/p95/p99 per jenis interaksi, byte yang dikirim server per interaksi,
+dan RSS proses server (dari /proc) per sesi.
+
+Membutuhkan `websockets` (lihat requirements-dev.txt) dan modul proto internal
+Streamlit, yang dapat berubah antar versi; diuji dengan streamlit 1.66.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, "neet_dashboard.py")
+TESTED_STREAMLIT = "1.66"
+
+
+def check_client_libraries():
+    """Berhenti dengan pesan jelas bila websockets atau proto Streamlit tidak dapat diimpor."""
+    try:
+        import streamlit
+        import websockets
+        from streamlit.proto import BackMsg_pb2, ForwardMsg_pb2, WidgetStates_pb2
+    except ImportError as error:
+        raise SystemExit(
+            f"benchmarks.loadtest tidak dapat mengimpor {error.name or error}: alat ini membutuhkan paket websockets "
+            f"dan modul proto Streamlit (diuji dengan streamlit {TESTED_STREAMLIT}). "
+            "Pasang dengan `pip install -r requirements-dev.txt`."
+        ) from error
+    if not streamlit.__version__.startswith(TESTED_STREAMLIT + "."):
+        print(f"Peringatan: streamlit {streamlit.__version__} terpasang, alat ini diuji dengan {TESTED_STREAMLIT}; "
+              "format pesan websocket mungkin berbeda.", file=sys.stderr)
+
+
+def rss_kib(pid):
+    """RSS proses `pid` dalam KiB dari /proc (Linux); `None` bila tidak tersedia."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def start_server(port, timeout=120):
+    """Menjalankan dashboard di `port` dan menunggu endpoint kesehatan siap."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", DASHBOARD, "--server.headless=true", f"--server.port={port}",
+         "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit berhenti dengan kode {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("server tidak siap dalam batas waktu")
+
+
+class Session:
+    """Satu sesi browser tiruan di atas websocket `/_stcore/stream`."""
+
+    def __init__(self, url, rng):
+        self.url = url.rstrip("/") + "/_stcore/stream"
+        self.rng = rng
+        self.widgets = {}  # key pengguna -> (elemen proto, fragment_id)
+        self.states = {}  # id widget -> WidgetState
+        self.samples = []
+
+    async def __aenter__(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    async def rerun(self, action, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = ""
+        client_state.fragment_id = fragment_id
+        present = {element.id for element, _ in self.widgets.values()}
+        client_state.widget_states.widgets.extend(state for wid, state in self.states.items() if wid in present)
+
+        if not fragment_id:
+            self.widgets = {}
+        started = time.perf_counter()
+        await self.ws.send(message.SerializeToString())
+        received = 0
+        while True:
+            raw = await self.ws.recv()
+            received += len(raw)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                self._learn(forward.delta.new_element, forward.delta.fragment_id)
+            elif kind == "script_finished":
+                status = forward.script_finished
+                if status in (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY):
+                    break
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("skrip dashboard gagal dikompilasi")
+        self.samples.append({"action": action, "seconds": time.perf_counter() - started, "bytes": received})
+
+    def _learn(self, element, fragment_id):
+        kind = element.WhichOneof("type")
+        widget = getattr(element, kind)
+        widget_id = getattr(widget, "id", "") if hasattr(widget, "id") else ""
+        if widget_id.startswith("$$ID-") and not widget_id.endswith("-None"):
+            key = widget_id.split("-", 2)[2]
+            self.widgets[key] = (widget, fragment_id)
+
+    def _set(self, key, **value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget, fragment_id = self.widgets[key]
+        state = WidgetState(id=widget.id)
+        for field, field_value in value.items():
+            if isinstance(field_value, list):
+                getattr(state, field).data.extend(field_value)
+            else:
+                setattr(state, field, field_value)
+        self.states[widget.id] = state
+        return fragment_id
+
+    async def select(self, key, action):
+        widget, _ = self.widgets[key]
+        fragment_id = self._set(key, string_value=self.rng.choice(list(widget.options)))
+        await self.rerun(action, fragment_id)
+
+    async def slide(self, key, action):
+        widget, _ = self.widgets[key]
+        low, high = widget.min, widget.max
+        value = low + (high - low) * self.rng.random()
+        if widget.data_type == widget.INT:
+            value = float(round(value))
+        fragment_id = self._set(key, double_array_value=[value])
+        await self.rerun(action, fragment_id)
+
+    def simulation_sliders(self):
+        return [key for key, (widget, _) in self.widgets.items()
+                if key.endswith("_sim") and hasattr(widget, "data_type") and not widget.disabled]
+
+
+async def run_session(url, iterations, drags, think_time, seed):
+    rng = random.Random(seed)
+
+    async def think():
+        if think_time:
+            await asyncio.sleep(think_time * rng.uniform(0.5, 1.5))
+
+    async with Session(url, rng) as session:
+        await session.rerun("muat_awal")
+        for _ in range(iterations):
+            await think()
+            await session.slide("tahun_slider", "tahun_slider")
+            await think()
+            await session.select("sim_region_selector", "sim_region_selector")
+            await think()
+            await session.select("sim_province_selector", "sim_province_selector")
+            for _ in range(drags):
+                sliders = session.simulation_sliders()
+                if not sliders:
+                    break
+                await think()
+                await session.slide(rng.choice(sliders), "slider_simulasi")
+        return session.samples
+
+
+async def run_level(url, pid, sessions, iterations, drags, think_time, seed, sample_every=0.25):
+    peak = rss_kib(pid) if pid else None
+    stop = asyncio.Event()
+
+    async def sample_rss():
+        nonlocal peak
+        while not stop.is_set():
+            current = rss_kib(pid)
+            if current is not None:
+                peak = max(peak or 0, current)
+            await asyncio.sleep(sample_every)
+
+    sampler = asyncio.create_task(sample_rss()) if pid else None
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_session(url, iterations, drags, think_time, seed + i) for i in range(sessions)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if sampler:
+        await sampler
+
+    samples = [sample for result in results if not isinstance(result, BaseException) for sample in result]
+    errors = [repr(result) for result in results if isinstance(result, BaseException)]
+    return samples, errors, peak, elapsed
+
+
+def summarize(samples):
+    groups = {}
+    for sample in samples:
+        groups.setdefault(sample["action"], []).append(sample)
+    groups["semua_interaksi"] = [sample for sample in samples if sample["action"] != "muat_awal"]
+    rows = []
+    for action, group in groups.items():
+        seconds = [sample["seconds"] for sample in group]
+        rows.append({
+            "action": action,
+            "count": len(group),
+            "p50_ms": percentile(seconds, 50) * 1000,
+            "p95_ms": percentile(seconds, 95) * 1000,
+            "p99_ms": percentile(seconds, 99) * 1000,
+            "mean_bytes": statistics.fmean(sample["bytes"] for sample in group) if group else float("nan"),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10", help="jumlah sesi bersamaan; beberapa level dipisah koma")
+    parser.add_argument("--iterations", type=int, default=3, help="pengulangan skenario per sesi")
+    parser.add_argument("--drags", type=int, default=3, help="jumlah geseran slider simulasi per iterasi")
+    parser.add_argument("--think-time", type=float, default=0.5, help="jeda rata-rata antar interaksi (detik)")
+    parser.add_argument("--port", type=int, default=8599, help="port server lokal yang dijalankan alat ini")
+    parser.add_argument("--url", help="server yang sudah berjalan, mis. ws://localhost:8501 (tanpa menjalankan server)")
+    parser.add_argument("--pid", type=int, help="PID server untuk pengukuran RSS bila memakai --url")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="simpan hasil lengkap sebagai JSON")
+    args = parser.parse_args(argv)
+    check_client_libraries()
+
+    levels = [int(value) for value in args.sessions.split(",") if value.strip()]
+    server = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        print(f"Menjalankan dashboard di port {args.port} ...", flush=True)
+        server = start_server(args.port)
+        url, pid = f"ws://localhost:{args.port}", server.pid
+
+    report = {"levels": []}
+    try:
+        # sesi pemanasan agar cache Streamlit terisi sebelum pengukuran
+        asyncio.run(run_level(url, None, 1, 0, 0, 0, args.seed))
+        idle = rss_kib(pid) if pid else None
+        report["idle_rss_kib"] = idle
+        for level in levels:
+            samples, errors, peak, elapsed = asyncio.run(
+                run_level(url, pid, level, args.iterations, args.drags, args.think_time, args.seed)
+            )
+            rows = summarize(samples)
+            per_session = (peak - idle) / level if peak is not None and idle is not None else None
+            report["levels"].append({"sessions": level, "seconds": elapsed, "errors": errors,
+                                     "peak_rss_kib": peak, "rss_per_session_kib": per_session, "actions": rows})
+
+            print(f"\n== {level} sesi bersamaan ({elapsed:.1f} dtk, {len(errors)} galat) ==")
+            print(f"{'interaksi':<24}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'byte/interaksi':>16}")
+            for row in rows:
+                print(f"{row['action']:<24}{row['count']:>6}{row['p50_ms']:>10.0f}{row['p95_ms']:>10.0f}"
+                      f"{row['p99_ms']:>10.0f}{row['mean_bytes']:>16,.0f}")
+            if peak is not None:
+                print(f"RSS server: puncak {peak / 1024:,.1f} MiB, idle {idle / 1024:,.1f} MiB, "
+                      f"~{per_session / 1024:,.1f} MiB per sesi")
+            for error in errors[:5]:
+                print(f"  galat: {error}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nHasil disimpan ke {args.json}")
+    return 1 if any(level["errors"] for level in report["levels"]) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,395 @@
+"""Benchmark jalur panas dashboard: waktu, puncak memori dan ukuran payload figur.
+
+Jalankan dari folder repo:
+
+    python -m benchmarks.run                      # jalankan dan bandingkan dengan baseline.json
+    python -m benchmarks.run --only app_          # hanya benchmark yang namanya memuat "app_"
+    python -m benchmarks.run --save benchmarks/baseline.json   # perbarui baseline
+
+Setiap benchmark dijalankan `--repeat` kali untuk waktu (diambil minimum dan
+median), lalu sekali lagi di bawah `tracemalloc` untuk puncak memori Python.
+Perbandingan memakai median, dinormalisasi dengan beban kalibrasi tetap yang
+diukur tepat sebelum tiap benchmark, agar mesin yang sedang lebih lambat atau
+lebih cepat tidak terbaca sebagai regresi; kenaikan di bawah `--time-floor-ms`
+diabaikan.
+Benchmark `app_*` menjalankan `neet_dashboard.py` tanpa browser lewat
+`streamlit.testing.v1.AppTest`; payload adalah jumlah byte spesifikasi
+Plotly yang dikirim ke browser pada rerun tersebut.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, "neet_dashboard.py")
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+PANEL = "data/neet_data_34prov.csv"
+PARAMS = "data/model_params_region.csv"
+GEOJSON = "data/gadm41_IDN_1.json"
+MAP_TOLERANCE = 0.005  # sama dengan MAP_TOLERANCE di dashboard
+
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=None, tolerance=None):
+    """Mendaftarkan benchmark. Fungsi terdaftar menerima `state` dan mengembalikan
+    fungsi langkah yang diukur; bila langkah mengembalikan `int`, nilai itu dicatat
+    sebagai ukuran payload (byte). `tolerance` menggantikan `--time-tolerance`
+    untuk benchmark yang waktunya memang lebih bervariasi."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat, tolerance)
+        return setup
+    return register
+
+
+class State:
+    """Objek bersama antar-benchmark yang dibuat sekali saat pertama dibutuhkan."""
+
+    def __init__(self):
+        self._values = {}
+
+    def get(self, name, build):
+        if name not in self._values:
+            self._values[name] = build()
+        return self._values[name]
+
+    def panel(self):
+        from neetify.data import load_panel
+        return self.get("panel", lambda: load_panel(PANEL))
+
+    def store(self):
+        from neetify.geometry import GeometryStore
+        from neetify.registry import mapping
+        return self.get("store", lambda: GeometryStore.from_file(GEOJSON, aliases=mapping, precision=3))
+
+    def cube(self):
+        from neetify.panel import PanelCube
+        return self.get("cube", lambda: PanelCube.build(self.panel()))
+
+    def model(self):
+        from neetify.data import load_model_params
+        from neetify.model import RegionalModel
+        return self.get("model", lambda: RegionalModel.from_frame(load_model_params(PARAMS)))
+
+
+def _plotly_bytes(at):
+    return sum(len(chart.proto.spec) for chart in at.get("plotly_chart"))
+
+
+def _check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return at
+
+
+def _new_session():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(DASHBOARD, default_timeout=300)
+
+
+# --- jalur data ---
+
+@benchmark("panel_load_normalize")
+def bench_panel_load(state):
+    from neetify.data import load_panel
+    from neetify.panel import CompactPanel
+
+    return lambda: CompactPanel.build(load_panel(PANEL))
+
+
+@benchmark("panel_load_cached")
+def bench_panel_load_cached(state):
+    import tempfile
+
+    from neetify.data import ColumnarCache, load_panel
+    from neetify.panel import CompactPanel
+
+    tables = ColumnarCache(tempfile.mkdtemp(prefix="neetify-bench-"))
+    load_panel(PANEL, tables)
+    return lambda: CompactPanel.build(load_panel(PANEL, tables))
+
+
+@benchmark("assign_regions")
+def bench_assign_regions(state):
+    from neetify.registry import assign_regions
+
+    provinces = state.panel()["provinsi"].astype(str)
+    return lambda: assign_regions(provinces)
+
+
+@benchmark("geojson_load_normalize")
+def bench_geojson(state):
+    from neetify.geometry import GeometryStore
+    from neetify.registry import mapping
+
+    def step():
+        geojson = GeometryStore.from_file(GEOJSON, aliases=mapping, precision=3).geojson(MAP_TOLERANCE)
+        return len(json.dumps(geojson, separators=(",", ":")))
+    return step
+
+
+@benchmark("year_merge_tooltip")
+def bench_year_merge(state):
+    from neetify.panel import PanelCube
+
+    panel = state.panel()
+    years = sorted(panel["tahun"].unique())
+
+    def step():
+        cube = PanelCube.build(panel)
+        for tahun in years:
+            cube.year(tahun)
+    return step
+
+
+@benchmark("choropleth_build", tolerance=0.75)
+def bench_choropleth(state):
+    from neetify.figures import choropleth_map
+
+    store, cube = state.store(), state.cube()
+    geojson = store.geojson(MAP_TOLERANCE)
+    tahun = max(cube.years)
+
+    def step():
+        data = cube.year(tahun)
+        fig = choropleth_map(geojson, store.featureidkey, data["provinsi"], data["neet_rate"], data["tooltip"],
+                             f"NEET Rate per Provinsi - {tahun}")
+        return len(fig.to_json())
+    return step
+
+
+@benchmark("animated_choropleth_build", repeat=3, tolerance=0.75)
+def bench_animated(state):
+    from neetify.figures import animated_choropleth
+
+    store, cube = state.store(), state.cube()
+    return lambda: len(animated_choropleth(cube.frame, store.geojson(MAP_TOLERANCE), store.featureidkey).to_json())
+
+
+@benchmark("simulation_predict")
+def bench_predict(state):
+    from neetify.inputs import default_inputs
+
+    model = state.model()
+    inputs = default_inputs(state.panel(), "JAWABARAT", model.variables)
+    return lambda: [model.predict_one("JAWA", inputs) for _ in range(100)]
+
+
+@benchmark("simulation_compare_national")
+def bench_compare(state):
+    from neetify.scenarios import ScenarioScorer
+
+    scorer = ScenarioScorer(state.model(), state.panel())
+    return lambda: scorer.compare({"TPT": -1.0, "PPM": -1.0})
+
+
+@benchmark("simulation_target_plan")
+def bench_target(state):
+    from neetify.optimize import target_plan
+
+    model, panel = state.model(), state.panel()
+    return lambda: target_plan(model, panel, 15.0)
+
+
+# --- dashboard lewat AppTest ---
+
+def _clear_streamlit_caches():
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+@benchmark("app_cold_start", repeat=3, tolerance=0.75)
+def bench_app_cold(state):
+    def step():
+        _clear_streamlit_caches()
+        return _plotly_bytes(_check(_new_session().run()))
+    return step
+
+
+@benchmark("app_session", tolerance=0.75)
+def bench_app_session(state):
+    _check(_new_session().run())
+    return lambda: _plotly_bytes(_check(_new_session().run()))
+
+
+@benchmark("app_rerun_year", tolerance=0.75)
+def bench_app_year(state):
+    at = _check(_new_session().run())
+    years = iter([2016, 2024] * 100)
+
+    def step():
+        at.slider(key="tahun_slider").set_value(next(years)).run()
+        return _plotly_bytes(_check(at))
+    return step
+
+
+@benchmark("app_rerun_simulation", tolerance=0.75)
+def bench_app_simulation(state):
+    at = _check(_new_session().run())
+    at.sidebar.selectbox(key="sim_region_selector").set_value("JAWA").run()
+    key = next(s.key for s in _check(at).slider if s.key and s.key.endswith("_sim") and not s.disabled)
+    low, high = at.slider(key=key).min, at.slider(key=key).max
+    values = iter([low + (high - low) / 3, low + (high - low) * 2 / 3] * 100)
+
+    def step():
+        at.slider(key=key).set_value(next(values)).run()
+        return _plotly_bytes(_check(at))
+    return step
+
+
+def _calibration_step():
+    total = 0
+    for i in range(200_000):
+        total += i % 7
+    return total + float(np.sort(np.sin(np.arange(200_000, dtype=float))).sum())
+
+
+def calibrate(repeat=9):
+    """Median waktu beban tetap (loop Python dan numpy) sebagai ukuran kecepatan mesin saat ini."""
+    return measure(lambda state: _calibration_step, repeat, None, memory=False)["time_median_s"]
+
+
+def measure(setup, repeat, state, min_sample=0.2, memory=True):
+    """Waktu per langkah; langkah cepat diulang dalam satu sampel hingga ±`min_sample` detik (seperti `timeit`).
+
+    Seperti `timeit`, pengumpulan sampah dimatikan selama pengukuran waktu.
+    """
+    step = setup(state)
+    started = time.perf_counter()
+    result = step()
+    first = time.perf_counter() - started
+    number = max(1, int(min_sample / max(first, 1e-9)))
+
+    times = [first] if number == 1 else []
+    gc.collect()
+    gc.disable()
+    try:
+        while len(times) < repeat:
+            started = time.perf_counter()
+            for _ in range(number):
+                result = step()
+            times.append((time.perf_counter() - started) / number)
+    finally:
+        gc.enable()
+
+    payload = result if isinstance(result, int) else None
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            step()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "time_min_s": min(times),
+        "time_median_s": statistics.median(times),
+        "peak_kib": None if peak is None else peak / 1024,
+        "payload_bytes": payload,
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def compare(results, baseline, time_tolerance, size_tolerance, time_floor=0.001, memory_floor=64):
+    """Baris perbandingan dan daftar regresi (metrik yang melebihi baseline × (1 + toleransi)).
+
+    Waktu median dibagi rasio kalibrasi benchmark itu (saat ini terhadap
+    baseline). Kenaikan yang lebih kecil dari `time_floor` detik atau
+    `memory_floor` KiB tidak dihitung. Toleransi per benchmark dari
+    `@benchmark` menggantikan `time_tolerance`.
+    """
+    rows, regressions = [], []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, "baru", ""))
+            continue
+        notes, status = [], "ok"
+        tolerance = BENCHMARKS[name][2] if name in BENCHMARKS and BENCHMARKS[name][2] is not None else time_tolerance
+        for metric, limit in (("time_median_s", tolerance), ("peak_kib", size_tolerance),
+                              ("payload_bytes", size_tolerance)):
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            if metric == "time_median_s" and current.get("calibration_s") and previous.get("calibration_s"):
+                new = new * previous["calibration_s"] / current["calibration_s"]
+            floor = {"time_median_s": time_floor, "peak_kib": memory_floor}.get(metric, 0)
+            if 0 < new - old < floor:
+                notes.append(f"{metric} ×{new / old:.2f} (di bawah ambang)")
+                continue
+            ratio = new / old
+            notes.append(f"{metric} ×{ratio:.2f}")
+            if ratio > 1 + limit:
+                status = "regresi"
+                regressions.append(f"{name}: {metric} {old:,.4g} -> {new:,.4g} (×{ratio:.2f}, batas ×{1 + limit:.2f})")
+        rows.append((name, status, ", ".join(notes)))
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=9, help="jumlah pengulangan waktu per benchmark")
+    parser.add_argument("--only", action="append", help="jalankan benchmark yang namanya memuat teks ini (boleh berulang)")
+    parser.add_argument("--save", help="simpan hasil sebagai JSON (mis. benchmarks/baseline.json)")
+    parser.add_argument("--compare", default=BASELINE, help="baseline JSON pembanding (bawaan: benchmarks/baseline.json)")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="kenaikan waktu median yang masih diterima (0.5 = +50%%)")
+    parser.add_argument("--time-floor-ms", type=float, default=1.0, help="kenaikan waktu di bawah batas ini (ms) diabaikan")
+    parser.add_argument("--size-tolerance", type=float, default=0.1, help="kenaikan memori/payload yang masih diterima")
+    parser.add_argument("--memory-floor-kib", type=float, default=64, help="kenaikan puncak memori di bawah batas ini (KiB) diabaikan")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    state = State()
+    results = {}
+    for name, (setup, repeat, _) in BENCHMARKS.items():
+        if args.only and not any(part in name for part in args.only):
+            continue
+        calibration = calibrate()
+        result = measure(setup, min(repeat or args.repeat, args.repeat), state)
+        result["calibration_s"] = calibration
+        results[name] = result
+        payload = "" if result["payload_bytes"] is None else f"{result['payload_bytes']:>12,} B"
+        print(f"{name:<30} {result['time_min_s'] * 1000:>10.1f} ms (median {result['time_median_s'] * 1000:.1f},"
+              f" kalibrasi {calibration * 1000:.1f}) {result['peak_kib']:>10,.0f} KiB {payload}", flush=True)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                                "cpus": os.cpu_count()},
+                "results": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Hasil disimpan ke {args.save}")
+        return 0
+
+    if not args.compare or not os.path.exists(args.compare):
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)["results"]
+    rows, regressions = compare(results, baseline, args.time_tolerance, args.size_tolerance,
+                                args.time_floor_ms / 1000, args.memory_floor_kib)
+    print(f"\nPerbandingan dengan {os.path.relpath(args.compare)}:")
+    for name, status, notes in rows:
+        print(f"  {name:<30} {status:<7} {notes}")
+    if regressions:
+        print("\nRegresi:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,30 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import json
+import functools
 import math
+import os
+
+import streamlit.components.v1 as components
+
+from neetify import profiling
+from neetify.data import ColumnarCache, file_fingerprint, load_model_params, load_panel
+from neetify.forecast import TrendForecaster
+from neetify.figures import (animated_choropleth, choropleth_map, lisa_map, prediction_histogram, ranking_chart,
+                             response_heatmap, tornado_chart)
+from neetify.geometry import GeometryStore
+from neetify.inputs import default_inputs, input_bounds, percentage_vars
+from neetify.model import RegionalModel, all_potential_vars, classify_variables, formula_latex, significance_threshold, var_descriptions
+from neetify.optimize import target_plan
+from neetify.panel import CompactPanel, PanelCube
+from neetify.profiling import Profiler, profile_mode, stage, summarize
+from neetify.registry import mapping
+from neetify.scenarios import ScenarioScorer, baseline_table
+from neetify.sensitivity import sweep_all, sweep_range
+from neetify.spatial import WEIGHTS_VERSION, load_or_build_weights, spatial_summary
+from neetify.tiles import TileStore
+from neetify.webmap import client_choropleth_html, publish_geometry, publish_plotly_js
 
 st.set_page_config(
     layout="wide",
@@ -10,6 +32,52 @@ st.set_page_config(
     page_icon="🇮🇩",
 )
 
+PROFILE_HISTORY = 200
+
+
+def record_profile(record):
+    runs = st.session_state.setdefault("profiling_runs", [])
+    runs.append(record)
+    del runs[:-PROFILE_HISTORY]
+
+
+def start_profiler(kind):
+    """Profiler untuk rerun ini bila diaktifkan lewat `NEETIFY_PROFILE` atau `?profile=`; selain itu `None`."""
+    unfinished = st.session_state.pop("profiling_active", None)
+    if unfinished is not None:
+        record_profile(unfinished.finish(interrupted=True))
+    profiler = Profiler.from_env(st.query_params.get("profile"), session=st.session_state.get("profiling_session"), kind=kind)
+    if profiler is not None:
+        st.session_state["profiling_session"] = profiler.session
+        st.session_state["profiling_active"] = profiler
+    return profiling.activate(profiler)
+
+
+def finish_profiler(profiler):
+    st.session_state.pop("profiling_active", None)
+    record_profile(profiler.finish())
+
+
+def profiled_fragment(name):
+    """Mengukur fragment sebagai tahap `name`; rerun fragment saja dicatat sebagai rerun tersendiri."""
+    def decorate(render):
+        @functools.wraps(render)
+        def run(*args, **kwargs):
+            if profiling.current() is not None or profile_mode(st.query_params.get("profile")) == "off":
+                with stage(name):
+                    return render(*args, **kwargs)
+            profiler = start_profiler(f"fragment:{name}")
+            try:
+                with stage(name):
+                    return render(*args, **kwargs)
+            finally:
+                finish_profiler(profiler)
+        return run
+    return decorate
+
+
+profiler = start_profiler("rerun")
+
 st.markdown(
     """
     <style>
@@ -99,73 +167,33 @@ st.markdown(
 st.markdown("<h1 class='stHeading'>📊 NEETify: Dashboard Interaktif NEET Rate Indonesia (2016–2024)</h1>", unsafe_allow_html=True)
 st.markdown("---")
 
-try:
-    @st.cache_data
-    def load_data(file_path):
-        return pd.read_csv(file_path)
+@st.cache_data
+def load_data(file_path, fingerprint):
+    return pd.read_csv(file_path)
+
+
+@st.cache_resource
+def load_columnar_cache():
+    return ColumnarCache("data/.cache")
 
-    neet = load_data("data/neet_data_34prov.csv")
-    model = load_data("data/model_params_region.csv")
+
+@st.cache_resource
+def load_normalized_data(panel_path, params_path, panel_fingerprint, params_fingerprint):
+    tables = load_columnar_cache()
+    return CompactPanel.build(load_panel(panel_path, tables)), load_model_params(params_path, tables)
+
+
+try:
+    with stage("data"):
+        neet_fingerprint = load_columnar_cache().fingerprint("data/neet_data_34prov.csv")
+        model_fingerprint = load_columnar_cache().fingerprint("data/model_params_region.csv")
+        shared_panel, model = load_normalized_data("data/neet_data_34prov.csv", "data/model_params_region.csv", neet_fingerprint, model_fingerprint)
+        neet = shared_panel.frame
 
 except FileNotFoundError:
     st.error("Error: File 'neet_data_34prov.csv' dan 'model_params_region.csv' tidak ditemukan. Pastikan file ada di folder 'data/' di direktori yang sama dengan aplikasi Anda.")
     st.stop()
 
-neet['provinsi'] = neet['provinsi'].str.upper().str.strip().str.replace(" ", "")
-
-mapping = {
-    "DI.ACEH": "ACEH",
-    "DAERAHISTIMEWAYOGYAKARTA": "YOGYAKARTA",
-    "DKIJAKARTA": "JAKARTARAYA",
-    "KEPULAUANBANGKABELITUNG": "BANGKABELITUNG"
-}
-neet['provinsi'] = neet['provinsi'].replace(mapping)
-
-model.columns = model.columns.str.strip()
-
-if "Region" in model.columns:
-    model['Wilayah'] = model['Region'].str.upper().str.strip().str.replace(" ", "_")
-    model = model.drop(columns=['Region'])
-elif "Wilayah" in model.columns:
-    model['Wilayah'] = model['Wilayah'].str.upper().str.strip().str.replace(" ", "_")
-
-
-if "provinsi" in model.columns:
-    model['provinsi'] = model['provinsi'].str.upper().str.strip().replace(" ", "")
-    model['provinsi'] = model['provinsi'].replace(mapping)
-
-region_map = {
-    "SUMATERA": [
-        "ACEH", "SUMATERAUTARA", "SUMATERABARAT", "RIAU", "KEPULAUANRIAU",
-        "JAMBI", "SUMATERASELATAN", "BENGKULU", "LAMPUNG", "BANGKABELITUNG"
-    ],
-    "JAWA": [
-        "JAKARTARAYA",
-        "JAWABARAT", "JAWATENGAH", "YOGYAKARTA", "JAWATIMUR", "BANTEN"
-    ],
-    "KALIMANTAN": [
-        "KALIMANTANBARAT", "KALIMANTANTENGAH", "KALIMANTANSELATAN",
-        "KALIMANTANTIMUR", "KALIMANTANUTARA"
-    ],
-    "SULAWESI": [
-        "SULAWESIUTARA", "GORONTALO", "SULAWESITENGAH", "SULAWESIBARAT",
-        "SULAWESISELATAN",
-        "SULAWESITENGGARA"
-    ],
-    "INDONESIA_TIMUR": [
-        "BALI", "NUSATENGGARABARAT", "NUSATENGGARATIMUR",
-        "MALUKU", "MALUKUUTARA", "PAPUA", "PAPUABARAT"
-    ]
-}
-
-def assign_region(prov):
-    for region, prov_list in region_map.items():
-        if prov in prov_list:
-            return region
-    return None
-
-neet["Wilayah"] = neet["provinsi"].apply(assign_region)
-
 
 st.sidebar.header("⚙️ Kontrol Dashboard")
 
@@ -182,90 +210,255 @@ tahun = st.sidebar.slider(
     key="tahun_slider"
 )
 
-data_now = neet[neet['tahun'] == tahun].copy()
+MAP_MODE_STANDARD = "Standar"
+MAP_MODE_CLIENT = "Ringan (geometri di-cache browser)"
+MAP_MODE_ANIMATED = "Animasi (semua tahun)"
+MAP_MODE_SPATIAL = "Spasial (klaster LISA & lag tetangga)"
+map_mode = st.sidebar.radio(
+    "Mode Peta",
+    [MAP_MODE_STANDARD, MAP_MODE_CLIENT, MAP_MODE_ANIMATED, MAP_MODE_SPATIAL],
+    key="map_mode",
+    help="Mode ringan mengirim geometri provinsi sekali ke browser; perubahan tahun hanya mengirim nilai NEET. Mode animasi memuat semua tahun sekaligus sehingga tahun dapat digeser atau diputar langsung di peta. Mode spasial menampilkan klaster hot/cold spot (LISA) dan rata-rata NEET provinsi tetangga."
+)
+
+
+@st.cache_resource
+def build_panel_cube(_neet, fingerprint):
+    return PanelCube.build(_neet)
+
+
+panel_cube = build_panel_cube(neet, neet_fingerprint)
+
+FORECAST_HORIZON = 3
+
+
+@st.cache_resource
+def build_projection(_neet, fingerprint, horizon):
+    forecaster = TrendForecaster(path="data/.cache/trend_state.pkl")
+    if forecaster.update(_neet):
+        try:
+            forecaster.save()
+        except OSError:
+            pass
+    tahun_akhir = forecaster.last_year
+    return forecaster.project(range(tahun_akhir + 1, tahun_akhir + 1 + horizon), _neet)
+
+
+proyeksi = build_projection(neet, neet_fingerprint, FORECAST_HORIZON)
 
-if data_now.empty:
+
+def basis_panel(tahun_basis):
+    """Panel sumber nilai awal simulasi: data asli, atau proyeksi untuk `tahun_basis`."""
+    if tahun_basis is None:
+        return neet
+    return proyeksi[proyeksi["tahun"] == tahun_basis]
+
+if panel_cube.year(tahun).empty:
     st.warning(f"Tidak ada data untuk tahun {tahun}. Silakan pilih tahun lain.")
 
 
-if tahun == neet['tahun'].min():
-    data_now["perubahan"] = None
-    data_now["tooltip"] = data_now.apply(
-        lambda row: f"{row['provinsi']}<br>NEET: {row['neet_rate']:.2f}%", axis=1
-    )
-    data_now.rename(columns={"neet_rate": "neet_rate_now"}, inplace=True)
-    data_merge = data_now
-else:
-    data_prev = neet[neet['tahun'] == tahun - 1].copy()
-    data_prev.rename(columns={"neet_rate": "neet_rate_prev"}, inplace=True)
-    data_now.rename(columns={"neet_rate": "neet_rate_now"}, inplace=True)
-    data_merge = pd.merge(data_now, data_prev[["provinsi", "neet_rate_prev"]], on="provinsi", how="left")
-    data_merge["perubahan"] = ((data_merge["neet_rate_now"] - data_merge["neet_rate_prev"]) / data_merge["neet_rate_prev"]) * 100
-
-    def format_arrow(val):
-        if pd.isna(val):
-            return "-"
-        return f"▲ {val:.2f}%" if val > 0 else f"▼ {abs(val):.2f}%"
-
-    data_merge["tooltip"] = data_merge.apply(
-        lambda row: f"{row['provinsi']}<br>NEET: {row['neet_rate_now']:.2f}%<br>Perubahan: {format_arrow(row['perubahan'])}",
-        axis=1
-    )
+MAP_TOLERANCE = 0.005
 
 try:
-    @st.cache_data
-    def load_geojson(file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    geojson = load_geojson("data/gadm41_IDN_1.json")
+    @st.cache_resource
+    def load_geometry_store(file_path, aliases, fingerprint):
+        return GeometryStore.from_file(file_path, aliases=aliases, precision=3)
+
+    with stage("geojson"):
+        geometry_fingerprint = load_columnar_cache().fingerprint("data/gadm41_IDN_1.json")
+        geometry_store = load_geometry_store("data/gadm41_IDN_1.json", mapping, geometry_fingerprint)
+        geojson = geometry_store.geojson(MAP_TOLERANCE)
 except FileNotFoundError:
     st.error("Error: File 'gadm41_IDN_1.json' tidak ditemukan. Pastikan file ada di folder 'data/' di direktori yang sama dengan aplikasi Anda.")
     st.stop()
 
-for feature in geojson['features']:
-    if 'NAME_1' in feature['properties']:
-        normalized_name = feature['properties']['NAME_1'].upper().strip().replace(" ", "")
-        for k, v in mapping.items():
-            if normalized_name == k:
-                normalized_name = v
-                break
-        feature['properties']['Propinsi'] = normalized_name
+VALIDATION_DIR = "data/.cache/validation"
+ADM2_DIR = "data/adm2"
+ADM2_DATA = "data/neet_data_adm2.csv"
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 
-col1, col2 = st.columns([2, 1])
 
-with col1:
+@st.cache_resource
+def publish_client_map_assets(_store, tolerance):
+    return publish_geometry(_store, STATIC_DIR, tolerance), publish_plotly_js(STATIC_DIR)
+
+
+@st.cache_resource
+def build_animated_map(_cube, _store, fingerprint, tolerance):
+    return animated_choropleth(_cube.frame, _store.geojson(tolerance), _store.featureidkey)
+
+
+@st.cache_resource
+def load_tile_store(directory, index_fingerprint):
+    return TileStore(directory)
+
+
+tile_store = None
+if os.path.exists(os.path.join(ADM2_DIR, "index.json")):
+    tile_store = load_tile_store(ADM2_DIR, file_fingerprint(os.path.join(ADM2_DIR, "index.json")))
+
+
+def select_adm2_province():
+    # klik pada peta provinsi memilih provinsi untuk peta kabupaten/kota di bawahnya
+    points = st.session_state["peta_provinsi"].selection.points
+    if points and points[0].get("location") in tile_store:
+        st.session_state["adm2_province"] = points[0]["location"]
+
+
+def render_adm2_map(tahun):
+    provinces = tile_store.provinces
+    prov = st.selectbox(
+        "Rinci ke kabupaten/kota (klik provinsi pada peta atau pilih di sini)",
+        [None] + provinces,
+        format_func=lambda p: "—" if p is None else p.replace('RAYA', ' Raya').title(),
+        key="adm2_province",
+    )
+    if prov is None:
+        return
+
+    geojson_adm2 = tile_store.geojson(prov)
+    features = [f["properties"] for f in geojson_adm2["features"]]
+    kode = [f[tile_store.key_property] for f in features]
+    nama = [f.get("NAME_2", k) for f, k in zip(features, kode)]
+    prov_display = prov.replace('RAYA', ' Raya').title()
+
+    data_adm2 = None
+    if os.path.exists(ADM2_DATA):
+        data_adm2 = load_data(ADM2_DATA, file_fingerprint(ADM2_DATA))
+        data_adm2 = data_adm2[data_adm2["tahun"] == tahun].set_index(tile_store.key_property)["neet_rate"]
+    if data_adm2 is not None and data_adm2.reindex(kode).notna().any():
+        nilai = data_adm2.reindex(kode)
+        tooltips = [f"{n}<br>NEET: {v:.2f}%" if pd.notna(v) else f"{n}<br>NEET: -" for n, v in zip(nama, nilai)]
+        value_range = (nilai.min() * 0.9, nilai.max() * 1.1)
+    else:
+        nilai_prov = panel_cube.year(tahun).set_index("provinsi")["neet_rate"].get(prov)
+        nilai = [nilai_prov] * len(kode)
+        tooltips = [f"{n}<br>NEET provinsi: {nilai_prov:.2f}%" if nilai_prov is not None else n for n in nama]
+        value_range = None
+        st.caption(f"Data NEET kabupaten/kota belum tersedia di `{ADM2_DATA}`; warna menunjukkan nilai provinsi.")
+
+    st.plotly_chart(
+        choropleth_map(geojson_adm2, tile_store.featureidkey, kode, nilai, tooltips,
+                       f"NEET Rate Kabupaten/Kota di {prov_display} - {tahun}", value_range, height=450),
+        use_container_width=True,
+    )
+
+
+@st.cache_resource
+def load_spatial_weights(_store, fingerprint):
+    return load_or_build_weights(os.path.join("data/.cache", f"adjacency-v{WEIGHTS_VERSION}-{fingerprint}.npz"),
+                                 _store.geojson(0.0), _store.key_property)
+
+
+@st.cache_data
+def compute_spatial_summary(_panel, _weights, fingerprint):
+    return spatial_summary(_panel, _weights)
+
+
+def render_spatial_map(tahun):
+    weights = load_spatial_weights(geometry_store, geometry_fingerprint)
+    moran_tahunan, klaster = compute_spatial_summary(neet, weights, (neet_fingerprint, geometry_fingerprint))
+    moran_tahun = moran_tahunan[moran_tahunan["tahun"] == tahun]
+    klaster_tahun = klaster[klaster["tahun"] == tahun]
+    if klaster_tahun.empty:
+        st.info("Pilih tahun yang memiliki data untuk menampilkan analisis spasial.")
+        return
+
+    cols_moran = st.columns(2)
+    cols_moran[0].metric("Moran's I", f"{moran_tahun['I'].iloc[0]:.3f}",
+                         help="Autokorelasi spasial global: positif berarti provinsi bertetangga cenderung memiliki NEET serupa.")
+    cols_moran[1].metric("p-value permutasi", f"{moran_tahun['p_sim'].iloc[0]:.3f}")
+
+    tampilan = st.radio("Tampilan", ["Klaster LISA", "Lag spasial (rata-rata tetangga)"], horizontal=True, key="spatial_view")
+    nama = klaster_tahun["provinsi"].str.replace('RAYA', ' Raya').str.title()
+    tooltips = (nama + "<br>NEET: " + klaster_tahun["neet_rate"].map("{:.2f}".format) + "%"
+                + "<br>Rata-rata tetangga: " + klaster_tahun["neet_rate_lag"].map("{:.2f}".format) + "%"
+                + "<br>Klaster: " + klaster_tahun["klaster"])
+    if tampilan == "Klaster LISA":
+        fig = lisa_map(geojson, geometry_store.featureidkey, klaster_tahun["provinsi"], klaster_tahun["klaster"],
+                       tooltips, f"Klaster LISA NEET Rate - {tahun}")
+    else:
+        lag = klaster_tahun["neet_rate_lag"]
+        fig = choropleth_map(geojson, geometry_store.featureidkey, klaster_tahun["provinsi"], lag, tooltips,
+                             f"Rata-rata NEET Provinsi Tetangga - {tahun}", (lag.min() * 0.9, lag.max() * 1.1))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("Tetangga ditentukan dari batas provinsi yang bersinggungan; provinsi kepulauan tanpa batas darat memakai dua provinsi terdekat. Klaster LISA signifikan pada p ≤ 0.05 (999 permutasi).")
+
+
+def embed_html(html, height):
+    if hasattr(st, "iframe"):
+        st.iframe(html, height=height)
+    else:
+        components.html(html, height=height)
+
+
+@st.fragment
+@profiled_fragment("peta")
+def render_map_section(tahun, map_mode):
     st.markdown("<h3 class='stSubheader'>🗺️ Peta NEET Rate Indonesia</h3>", unsafe_allow_html=True)
-    if data_merge.empty:
+    with stage("gabung_tahun"):
+        data_merge = panel_cube.year(tahun)
+    if map_mode == MAP_MODE_SPATIAL:
+        render_spatial_map(tahun)
+    elif map_mode == MAP_MODE_ANIMATED:
+        st.plotly_chart(build_animated_map(panel_cube, geometry_store, neet_fingerprint, MAP_TOLERANCE), use_container_width=True)
+    elif data_merge.empty:
         st.info("Pilih tahun yang memiliki data untuk menampilkan peta.")
-    else:
-        fig = px.choropleth(
-            data_merge,
-            geojson=geojson,
-            locations="provinsi",
-            featureidkey="properties.Propinsi",
-            color="neet_rate_now",
-            hover_name="provinsi",
-            hover_data={"tooltip": True, "provinsi": False, "neet_rate_now": False},
-            color_continuous_scale="YlOrRd",
-            labels={'neet_rate_now': 'NEET Rate'},
-            range_color=(data_merge['neet_rate_now'].min() * 0.9, data_merge['neet_rate_now'].max() * 1.1)
+    elif map_mode == MAP_MODE_CLIENT:
+        geometry_asset, plotly_url = publish_client_map_assets(geometry_store, MAP_TOLERANCE)
+        embed_html(
+            client_choropleth_html(
+                geometry_asset,
+                plotly_url,
+                geometry_store.featureidkey,
+                data_merge["provinsi"],
+                data_merge["neet_rate"],
+                data_merge["tooltip"],
+                (data_merge['neet_rate'].min() * 0.9, data_merge['neet_rate'].max() * 1.1),
+                f"NEET Rate per Provinsi - {tahun}",
+                px.colors.sequential.YlOrRd,
+            ),
+            610,
         )
+    else:
+        with stage("choropleth"):
+            fig = px.choropleth(
+                data_merge,
+                geojson=geojson,
+                locations="provinsi",
+                featureidkey=geometry_store.featureidkey,
+                color="neet_rate",
+                hover_name="provinsi",
+                hover_data={"tooltip": True, "provinsi": False, "neet_rate": False},
+                color_continuous_scale="YlOrRd",
+                labels={'neet_rate': 'NEET Rate'},
+                range_color=(data_merge['neet_rate'].min() * 0.9, data_merge['neet_rate'].max() * 1.1)
+            )
+
+            fig.update_traces(hovertemplate="%{customdata[0]}")
+            fig.update_geos(fitbounds="locations", visible=False, showland=True, landcolor="white")
+            fig.update_layout(
+                title=f"NEET Rate per Provinsi - {tahun}",
+                paper_bgcolor="white",
+                plot_bgcolor="white",
+                margin=dict(l=0, r=0, t=40, b=0),
+                height=600
+            )
+            if tile_store is None:
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.plotly_chart(fig, use_container_width=True, key="peta_provinsi", on_select=select_adm2_province,
+                                selection_mode="points")
 
-        fig.update_traces(hovertemplate="%{customdata[0]}")
-        fig.update_geos(fitbounds="locations", visible=False, showland=True, landcolor="white")
-        fig.update_layout(
-            title=f"NEET Rate per Provinsi - {tahun}",
-            paper_bgcolor="white",
-            plot_bgcolor="white",
-            margin=dict(l=0, r=0, t=40, b=0),
-            height=600
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    if tile_store is not None:
+        render_adm2_map(tahun)
 
-with col2:
+
+@st.fragment
+@profiled_fragment("tren")
+def render_trend_section():
     st.markdown("<h3 class='stSubheader'>📈 Tren NEET Rate per Provinsi</h3>", unsafe_allow_html=True)
-    prov_chart_options = sorted(neet["provinsi"].unique())
+    prov_chart_options = shared_panel.provinces
     if not prov_chart_options:
         st.info("Tidak ada data provinsi yang tersedia untuk menampilkan tren.")
     else:
@@ -274,7 +467,7 @@ with col2:
         prov_chart = prov_chart_display.upper().replace(' ', '') if prov_chart_display else None
 
         if prov_chart:
-            data_tren = neet[neet["provinsi"] == prov_chart]
+            data_tren = shared_panel.province(prov_chart)
             if not data_tren.empty:
                 fig_line = px.line(
                     data_tren,
@@ -285,38 +478,325 @@ with col2:
                     labels={"neet_rate": "NEET Rate", "tahun": "Tahun"},
                     height=350
                 )
+                proyeksi_prov = proyeksi[proyeksi["provinsi"] == prov_chart]
+                if st.checkbox(f"Tampilkan proyeksi tren {FORECAST_HORIZON} tahun", value=True, key="trend_show_projection") and not proyeksi_prov.empty:
+                    terakhir = data_tren.iloc[-1]
+                    tahun_proyeksi = [int(terakhir["tahun"])] + proyeksi_prov["tahun"].tolist()
+                    fig_line.add_scatter(
+                        x=tahun_proyeksi + tahun_proyeksi[::-1],
+                        y=[float(terakhir["neet_rate"])] + proyeksi_prov["neet_rate_high"].tolist()
+                        + proyeksi_prov["neet_rate_low"].tolist()[::-1] + [float(terakhir["neet_rate"])],
+                        fill="toself", fillcolor="rgba(79,139,249,0.15)", line=dict(width=0),
+                        hoverinfo="skip", name="Interval 95%", showlegend=False,
+                    )
+                    fig_line.add_scatter(
+                        x=tahun_proyeksi,
+                        y=[float(terakhir["neet_rate"])] + proyeksi_prov["neet_rate"].tolist(),
+                        mode="lines+markers", line=dict(dash="dash", color="#4f8bf9"),
+                        name="Proyeksi", hovertemplate="Proyeksi %{x}: %{y:.2f}%<extra></extra>", showlegend=False,
+                    )
                 st.plotly_chart(fig_line, use_container_width=True)
             else:
                 st.info(f"Data tren untuk provinsi '{prov_chart_display}' tidak ditemukan. Mungkin data tidak lengkap.")
 
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    render_map_section(tahun, map_mode)
+
+with col2:
+    render_trend_section()
+
 st.divider()
 
 st.markdown("<h3 class='stSubheader'>🧮 Simulasi Prediksi NEET Rate Berdasarkan Wilayah</h3>", unsafe_allow_html=True)
 
-all_potential_vars = ['PPM', 'TPT', 'GR', 'APS1', 'APS2', 'TIK', 'PDRB', 'LAJU', 'KP', 'PL']
 required_p_value_cols = [f"p_{var}" for var in all_potential_vars]
 
-var_descriptions = {
-    "PPM": "Persentase Penduduk Miskin",
-    "TPT": "Tingkat Pengangguran Terbuka",
-    "GR": "Gini Ratio (indikator ketimpangan pendapatan)",
-    "APS1": "Angka Partisipasi Sekolah (16-18 tahun)",
-    "APS2": "Angka Partisipasi Sekolah (19-23 tahun)",
-    "TIK": "Keterampilan Teknologi Informasi dan Komputer (misal: persentase pengguna internet)",
-    "PDRB": "Produk Domestik Regional Bruto (per kapita)",
-    "RLS": "Rata-Rata Lama Sekolah",
-    "KP": "Kepadatan Penduduk",
-    "PL": "Proporsi Laki-laki dan Perempuan",
-    "LAJU": "Laju Pertumbuhan Penduduk",
-}
 
 
+def apply_target_inputs(values, keys):
+    for var, value in values.items():
+        st.session_state[keys[var]] = value
+
+
+def render_target_mode(region_pilih, prov_pilih, prov_pilih_display, tahun_basis):
+    target = st.number_input("Target NEET rate (%)", min_value=0.0, max_value=100.0, value=15.0, step=0.5,
+                             format="%.2f", key="sim_target_value")
+    rencana = compute_target_plan(regional_model, basis_panel(tahun_basis), target, (model_fingerprint, neet_fingerprint, tahun_basis))
+    rencana_prov = rencana[rencana["provinsi"] == prov_pilih]
+    if rencana_prov.empty:
+        st.info("Provinsi ini tidak memiliki model wilayah untuk dioptimalkan.")
+        return
+    baris = rencana_prov.iloc[0]
+
+    cols_target = st.columns(2)
+    cols_target[0].metric("Prediksi awal", f"{baris['prediksi_awal']:.2f}%")
+    cols_target[1].metric("Prediksi setelah perubahan", f"{baris['prediksi_target']:.2f}%",
+                          delta=f"{baris['prediksi_target'] - baris['prediksi_awal']:.2f} poin", delta_color="inverse")
+    if baris["prediksi_awal"] <= target:
+        st.success(f"Prediksi {prov_pilih_display} sudah berada di bawah target {target:.2f}%.")
+    elif not baris["tercapai"]:
+        st.warning("Target tidak dapat dicapai hanya dengan variabel signifikan dalam batas input; hasil di atas adalah penurunan terbesar yang mungkin.")
+
+    perubahan = pd.DataFrame({
+        "Variabel": regional_model.variables,
+        "Nilai awal": [baris[f"{var}_awal"] for var in regional_model.variables],
+        "Nilai baru": [baris[f"{var}_baru"] for var in regional_model.variables],
+    })
+    perubahan["Perubahan"] = perubahan["Nilai baru"] - perubahan["Nilai awal"]
+    perubahan = perubahan[perubahan["Perubahan"].abs() > 1e-9]
+    if not perubahan.empty:
+        st.dataframe(perubahan.round(3), hide_index=True, use_container_width=True)
+        keys = {var: f"{var}_{region_pilih}_{prov_pilih}_{tahun_basis or 'data'}_sim" for var in perubahan["Variabel"]}
+        st.button("Terapkan ke input simulasi", key="sim_target_apply", on_click=apply_target_inputs,
+                  args=(dict(zip(perubahan["Variabel"], perubahan["Nilai baru"].astype(float))), keys))
+
+    st.markdown(f"**Semua provinsi di Wilayah {region_pilih.title().replace('_', ' ')}:**")
+    st.dataframe(
+        rencana[rencana["Wilayah"] == region_pilih][["provinsi", "prediksi_awal", "prediksi_target", "tercapai", "perubahan_ternormalisasi"]]
+        .rename(columns={"provinsi": "Provinsi", "prediksi_awal": "Prediksi Awal", "prediksi_target": "Prediksi Setelah",
+                         "tercapai": "Target Tercapai", "perubahan_ternormalisasi": "Besar Perubahan (SD)"})
+        .round(3),
+        hide_index=True,
+        use_container_width=True,
+    )
+    st.caption("Perubahan dihitung dari nilai awal simulasi (bukan posisi slider saat ini) dengan norma minimum, "
+               "diukur dalam simpangan baku antarprovinsi tiap variabel. Hanya variabel signifikan yang diubah, "
+               "dalam batas yang sama dengan input simulasi.")
+
+
+def render_comparison(inputs, default_vals, variabel_signifikan, region_pilih, prov_pilih, tahun_basis):
+    cakupan = st.radio("Cakupan perbandingan", ["Wilayah ini", "Nasional"], horizontal=True, key="sim_compare_scope")
+    perubahan = {var: inputs[var] - default_vals[var] for var in variabel_signifikan if abs(inputs[var] - default_vals[var]) > 1e-9}
+    scorer = build_scenario_scorer(regional_model, basis_panel(tahun_basis), (model_fingerprint, neet_fingerprint, tahun_basis))
+    provinsi = shared_panel.provinces_in(region_pilih) if cakupan == "Wilayah ini" else None
+    hasil = scorer.compare(perubahan, provinsi, {var: input_bounds(var, neet) for var in perubahan})
+    hasil = hasil.dropna(subset=["prediksi"])
+
+    if perubahan:
+        ringkasan = ", ".join(f"{var} {delta:+.2f}" for var, delta in perubahan.items())
+        st.markdown(f"**Perubahan yang diterapkan ke setiap provinsi:** {ringkasan}")
+    else:
+        st.info("Belum ada input yang diubah; semua provinsi ditampilkan pada nilai awalnya.")
+
+    st.plotly_chart(ranking_chart(hasil, highlight=prov_pilih), use_container_width=True)
+    st.dataframe(
+        hasil.assign(provinsi=hasil["provinsi"].str.replace("RAYA", " Raya").str.title(),
+                     Wilayah=hasil["Wilayah"].str.title().str.replace("_", " "))
+        [["provinsi", "Wilayah", "prediksi_dasar", "prediksi", "perubahan", "variabel_dikunci"]]
+        .sort_values("prediksi", ascending=False)
+        .rename(columns={"provinsi": "Provinsi", "prediksi_dasar": "Prediksi Awal", "prediksi": "Prediksi Skenario",
+                         "perubahan": "Perubahan (poin)", "variabel_dikunci": "Perubahan Diabaikan"})
+        .round(3),
+        hide_index=True,
+        use_container_width=True,
+    )
+    st.caption("Selisih input terhadap nilai awal provinsi terpilih ditambahkan ke nilai awal setiap provinsi "
+               "(dipotong pada batas input). Selisih hanya berlaku untuk variabel yang signifikan di wilayah "
+               "provinsi tersebut; kolom 'Perubahan Diabaikan' menghitung variabel yang dikunci.")
+
+
+@st.fragment
+@profiled_fragment("simulasi")
+def render_simulation_section(region_pilih, param_region, model_actual_vars, variabel_signifikan,
+                              variabel_tidak_signifikan_names, significance_threshold, prov_pilih, prov_pilih_display,
+                              tahun_basis=None):
+    st.markdown(f"**Rumus Regresi untuk Wilayah {region_pilih.title().replace('_', ' ')}:**")
+    st.latex(formula_latex(param_region, model_actual_vars))
+
+    if variabel_tidak_signifikan_names:
+        bolded_non_significant_vars = [f"**{v}** ({var_descriptions.get(v, v)})" for v in variabel_tidak_signifikan_names]
+        st.info(f"Catatan: Variabel berikut tidak signifikan ($p \\ge {significance_threshold}$) dan **inputnya tidak dapat diubah**, namun **tetap memengaruhi prediksi NEET** dengan koefisien aslinya: {', '.join(bolded_non_significant_vars)}.")
+
+    if prov_pilih is None:
+        return
+
+    default_vals = default_inputs(basis_panel(tahun_basis), prov_pilih, model_actual_vars)
+
+    inputs = {}
+    st.markdown(f"**Input Variabel untuk {prov_pilih_display}:**")
+    cols_input = st.columns(3)
+    input_idx = 0
+
+    for var in model_actual_vars:
+        col_to_use = cols_input[input_idx % 3]
+        input_idx += 1
+
+        default_val = default_vals[var]
+        input_key = f"{var}_{region_pilih}_{prov_pilih}_{tahun_basis or 'data'}_sim"
+        
+        is_disabled = var not in variabel_signifikan
+        # nilai awal lewat session state agar Mode Target dapat mengisi input ini
+        st.session_state.setdefault(input_key, float(default_val))
+
+        with col_to_use:
+            display_label = var_descriptions.get(var, var)
+            min_val, max_val = input_bounds(var, neet)
+            
+            if var in percentage_vars:
+                inputs[var] = st.slider(display_label, min_val, max_val, key=input_key, format="%.2f", disabled=is_disabled)
+            elif var == 'GR':
+                inputs[var] = st.slider(display_label, min_val, max_val, key=input_key, format="%.3f", disabled=is_disabled)
+            else:
+                inputs[var] = st.number_input(display_label, min_value=min_val, max_value=max_val, key=input_key, format="%.2f", disabled=is_disabled)
+
+
+    prediksi_neet = regional_model.predict_one(region_pilih, inputs)
+
+    st.markdown("---")
+    current_prediction_value = f"{prediksi_neet:.2f}%"
+
+    st.metric(
+        label=f"🎯 Prediksi NEET Rate untuk {prov_pilih_display} (Wilayah {region_pilih.title().replace('_', ' ')})",
+        value=current_prediction_value,
+        help=f"Prediksi berdasarkan model regresi regional. Variabel dengan p-value kurang dari {significance_threshold} dianggap signifikan dan memengaruhi hasil. Variabel yang tidak signifikan atau tidak relevan memiliki input yang dinonaktifkan tetapi tetap memengaruhi prediksi dengan koefisien aslinya."
+    )
+    st.success("Prediksi berhasil dihitung! Sesuaikan input variabel di atas untuk melihat perubahan.")
+
+    with st.expander("🎯 Mode Target: perubahan minimum untuk mencapai target NEET"):
+        render_target_mode(region_pilih, prov_pilih, prov_pilih_display, tahun_basis)
+
+    if st.checkbox("Tampilkan pita ketidakpastian (simulasi Monte Carlo)", key="sim_mc_toggle"):
+        n_draws = st.select_slider("Jumlah sampel koefisien", [1_000, 10_000, 50_000], value=10_000, key="sim_mc_draws")
+        draws = load_coefficient_draws(regional_model, region_pilih, n_draws, model_fingerprint)
+        pusat = regional_mean_inputs(neet, tuple(shared_panel.provinces_in(region_pilih)), neet_fingerprint)
+        sebaran_prediksi = regional_model.predict_draws(region_pilih, draws, inputs, center=pusat)
+        q025, q05, q50, q95, q975 = np.percentile(sebaran_prediksi, [2.5, 5, 50, 95, 97.5])
+
+        cols_mc = st.columns(3)
+        cols_mc[0].metric("Median Simulasi", f"{q50:.2f}%")
+        cols_mc[1].metric("Interval 90%", f"{q05:.2f}% – {q95:.2f}%")
+        cols_mc[2].metric("Interval 95%", f"{q025:.2f}% – {q975:.2f}%")
+        st.plotly_chart(prediction_histogram(sebaran_prediksi, prediksi_neet, (q05, q95)), use_container_width=True)
+        if regional_model.has_covariance(region_pilih):
+            st.caption("Intersep dan koefisien diambil acak dari distribusi normal multivariat dengan kovarians (XᵀWX)⁻¹ dari kolom `cov_*` pada file model. Hasil simulasi dibatasi pada 0–100%.")
+        else:
+            sumber_se = "diturunkan dari p-value karena file model tidak memuat kolom `se_*`" if regional_model.stderr_derived else "diambil dari kolom `se_*` pada file model"
+            st.caption(f"File model tidak memuat kovarians koefisien, sehingga intersep dianggap tetap dan koefisien diambil acak secara independen; galat baku {sumber_se}. Simpangan koefisien dikalikan selisih input terhadap rata-rata wilayah agar pita tidak melebar hanya karena skala variabel. Hasil simulasi dibatasi pada 0–100%. Jalankan `python -m neetify estimate --se` untuk pita yang memperhitungkan korelasi antar koefisien.")
+
+    if st.checkbox("Bandingkan skenario ini untuk semua provinsi", key="sim_compare_toggle"):
+        render_comparison(inputs, default_vals, variabel_signifikan, region_pilih, prov_pilih, tahun_basis)
+
+    with st.expander("🔍 Analisis Sensitivitas Variabel Signifikan"):
+        variabel_sweep = sorted(variabel_signifikan)
+        if not variabel_sweep:
+            st.info("Tidak ada variabel signifikan yang dapat divariasikan untuk wilayah ini.")
+        else:
+            spread_pct = st.slider("Rentang variasi (± % dari nilai tahun terakhir)", 5, 100, 20, step=5, key="sim_sweep_spread")
+            hasil_tornado, permukaan = compute_sensitivity(
+                regional_model, basis_panel(tahun_basis), region_pilih, prov_pilih, tuple(variabel_sweep), spread_pct / 100,
+                (model_fingerprint, neet_fingerprint, tahun_basis)
+            )
+            st.markdown(f"**Dampak tiap variabel terhadap prediksi NEET {prov_pilih_display}** (variabel lain tetap pada nilai tahun terakhir):")
+            st.plotly_chart(tornado_chart(hasil_tornado), use_container_width=True)
+
+            if len(variabel_sweep) >= 2:
+                pasangan = list(permukaan)
+                pasangan_pilih = st.selectbox(
+                    "Permukaan respons untuk pasangan variabel",
+                    pasangan,
+                    format_func=lambda pair: f"{pair[0]} × {pair[1]}",
+                    key="sim_sweep_pair"
+                )
+                xs, ys, z = permukaan[pasangan_pilih]
+                st.plotly_chart(response_heatmap(xs, ys, z, *pasangan_pilih), use_container_width=True)
+
+    if 'previous_inputs' not in st.session_state:
+        st.session_state['previous_inputs'] = {}
+        st.session_state['previous_prediction'] = None
+        st.session_state['initial_run'] = True
+    else:
+        st.session_state['initial_run'] = False
+
+    current_prediction_str = f"{prediksi_neet:.2f}%"
+    current_inputs = inputs.copy()
+
+    if not st.session_state['initial_run']:
+        old_prediction = st.session_state.get('previous_prediction')
+        old_inputs = st.session_state.get('previous_inputs', {})
+
+        try:
+            old_prediction_float = float(str(old_prediction).replace('%',''))
+        except (ValueError, TypeError):
+            old_prediction_float = None
+
+        changed_vars_info = []
+        if old_prediction_float is not None and not math.isnan(old_prediction_float):
+            delta_neet_rate = prediksi_neet - old_prediction_float
+
+            for var in model_actual_vars:
+                if var in variabel_signifikan:
+                    old_val = old_inputs.get(var)
+                    new_val = current_inputs.get(var)
+
+                    if old_val is not None and new_val is not None and abs(old_val - new_val) > 1e-6:
+                        change_amount = new_val - old_val
+                        change_type = "peningkatan" if change_amount > 0 else "penurunan"
+                        
+                        desc = var_descriptions.get(var, var)
+                        changed_vars_info.append(
+                            f"<strong>{var}</strong> ({desc}) dari {old_val:.2f} menjadi {new_val:.2f} (terjadi {change_type} {abs(change_amount):.2f} unit)."
+                        )
+            
+            if changed_vars_info:
+                st.markdown("<div class='dynamic-conclusion-box'>", unsafe_allow_html=True)
+                st.markdown("<h5>✨ Dampak Perubahan Input Anda:</h5>", unsafe_allow_html=True)
+                st.markdown(f"<p>Anda telah melakukan perubahan pada:<br><ul>{''.join([f'<li>{info}</li>' for info in changed_vars_info])}</ul></p>", unsafe_allow_html=True)
+                
+                overall_dampak_word = "meningkat" if delta_neet_rate > 0 else "menurun"
+                if abs(delta_neet_rate) < 0.01:
+                    st.markdown(f"<p>Prediksi NEET rate <strong>tetap tidak berubah secara signifikan</strong>.</p>", unsafe_allow_html=True)
+                else:
+                    st.markdown(f"<p>Secara keseluruhan, prediksi NEET rate <strong>{overall_dampak_word}</strong> sebesar <strong>{abs(delta_neet_rate):.2f}%</strong> dari {old_prediction_float:.2f}% menjadi {prediksi_neet:.2f}%.</p>", unsafe_allow_html=True)
+                
+                st.markdown("</div>", unsafe_allow_html=True)
+            elif not st.session_state['initial_run'] and (old_prediction_float is None or math.isnan(old_prediction_float)):
+                st.info("Prediksi sebelumnya tidak valid untuk perbandingan perubahan. Silakan interaksi lebih lanjut.")
+            elif not st.session_state['initial_run']:
+                st.info("Tidak ada perubahan yang signifikan pada input yang dapat diubah saat ini.")
+
+    st.session_state['previous_inputs'] = current_inputs
+    st.session_state['previous_prediction'] = current_prediction_str
+
+
+region_pilih = None
+model_region = None
 missing_model_cols = [col for col in ["Wilayah", "intercept"] + all_potential_vars + required_p_value_cols if col not in model.columns]
 
 if missing_model_cols:
     st.error("❗ File 'model_params_region.csv' tidak memiliki semua kolom yang diperlukan untuk simulasi.")
     st.info(f"Kolom yang hilang: {', '.join(missing_model_cols)}. Pastikan file model Anda berisi kolom 'Wilayah', 'intercept', semua nama variabel, dan p-value yang sesuai (e.g., p_PPM, p_TPT, dll).")
 else:
+    @st.cache_resource
+    def build_regional_model(_model, fingerprint):
+        return RegionalModel.from_frame(_model)
+
+    @st.cache_resource
+    def load_coefficient_draws(_regional_model, region, n_draws, fingerprint):
+        return _regional_model.coefficient_draws(region, n_draws)
+
+    @st.cache_data
+    def regional_mean_inputs(_neet, provinces, fingerprint):
+        rows = _neet[_neet["provinsi"].isin(provinces)]
+        return {var: float(rows[var].mean()) if var in rows else 0.0 for var in all_potential_vars}
+
+    @st.cache_data
+    def compute_sensitivity(_regional_model, _neet, region, prov, variables, spread, fingerprint):
+        baseline = default_inputs(_neet, prov, _regional_model.variables)
+        ranges = {var: sweep_range(baseline[var], input_bounds(var, _neet), spread) for var in variables}
+        return sweep_all(_regional_model, region, baseline, variables, ranges)
+
+    @st.cache_data
+    def compute_target_plan(_regional_model, _basis, target, fingerprint):
+        return target_plan(_regional_model, neet, target, baseline=baseline_table(_basis, _regional_model.variables))
+
+    @st.cache_resource
+    def build_scenario_scorer(_regional_model, _basis, fingerprint):
+        return ScenarioScorer(_regional_model, _basis)
+
+    regional_model = build_regional_model(model, model_fingerprint)
     region_options = sorted(model["Wilayah"].dropna().unique())
     if not region_options:
         st.info("Tidak ada data wilayah yang tersedia dalam model untuk simulasi.")
@@ -334,41 +814,20 @@ else:
             else:
                 param_region = model_region.iloc[0]
 
-                model_actual_vars = []
-                for var in all_potential_vars:
-                    if pd.notna(param_region.get(var)):
-                        model_actual_vars.append(var)
-
-                variabel_signifikan = set()
-                variabel_tidak_signifikan_names = []
-                significance_threshold = 0.1
-                
-                for var in model_actual_vars:
-                    p_value_col = f"p_{var}"
-                    if pd.notna(param_region.get(p_value_col)) and param_region[p_value_col] < significance_threshold:
-                        variabel_signifikan.add(var)
-                    else:
-                        variabel_tidak_signifikan_names.append(var)
-
-                st.markdown(f"**Rumus Regresi untuk Wilayah {region_pilih.title().replace('_', ' ')}:**")
-                rumus = f"\\text{{NEET}} = {param_region['intercept']:.2f}"
-                for var in model_actual_vars:
-                    coef = param_region.get(var)
-                    rumus += f" + ({coef:.4f} \\times \\text{{{var}}})"
-                st.latex(rumus)
-
-                if variabel_tidak_signifikan_names:
-                    bolded_non_significant_vars = [f"**{v}** ({var_descriptions.get(v, v)})" for v in variabel_tidak_signifikan_names]
-                    st.info(f"Catatan: Variabel berikut tidak signifikan ($p \\ge {significance_threshold}$) dan **inputnya tidak dapat diubah**, namun **tetap memengaruhi prediksi NEET** dengan koefisien aslinya: {', '.join(bolded_non_significant_vars)}.")
+                klasifikasi = classify_variables(param_region, significance_threshold)
+                model_actual_vars = klasifikasi["used"]
+                variabel_signifikan = set(klasifikasi["significant"])
+                variabel_tidak_signifikan_names = klasifikasi["non_significant"]
 
                 st.sidebar.markdown("---")
                 st.sidebar.subheader(f"Variabel Input untuk {region_pilih.title().replace('_', ' ')}:")
 
-                provinsi_opsi = sorted(neet[neet["Wilayah"] == region_pilih]["provinsi"].unique())
+                provinsi_opsi = shared_panel.provinces_in(region_pilih)
 
                 if not provinsi_opsi:
                     st.warning(f"Tidak ada provinsi yang ditemukan dalam data untuk wilayah '{region_pilih}' untuk simulasi. Pastikan pemetaan wilayah sudah benar.")
                     prov_pilih = None
+                    prov_pilih_display = None
                 else:
                     display_prov_options = [p.replace('RAYA', ' Raya').title() for p in provinsi_opsi]
                     
@@ -394,198 +853,122 @@ else:
 
                 if prov_pilih is None:
                     st.sidebar.info("Pilih Provinsi di sidebar terlebih dahulu.")
-                else:
-                    data_input = neet[(neet["provinsi"] == prov_pilih) & (neet["tahun"] == neet["tahun"].max())]
-                    default_vals = data_input.iloc[0] if not data_input.empty else {}
-
-                    inputs = {}
-                    st.markdown(f"**Input Variabel untuk {prov_pilih_display}:**")
-                    cols_input = st.columns(3)
-                    input_idx = 0
-
-                    for var in model_actual_vars:
-                        col_to_use = cols_input[input_idx % 3]
-                        input_idx += 1
-
-                        default_val = default_vals.get(var)
-                        if pd.isna(default_val):
-                            if var in ['PPM', 'TPT', 'APS1', 'APS2', 'TIK', 'LAJU']:
-                                default_val = 50.0
-                            elif var == 'GR':
-                                default_val = 0.4
-                            elif var == 'PDRB':
-                                default_val = 100000.0
-                            elif var in ['KP', 'PL']:
-                                default_val = 100.0
-                            else:
-                                default_val = 10.0
-
-                        input_key = f"{var}_{region_pilih}_{prov_pilih}_sim"
-                        
-                        is_disabled = var not in variabel_signifikan
-
-                        with col_to_use:
-                            display_label = var_descriptions.get(var, var)
-                            
-                            if var in ['PPM', 'TPT', 'APS1', 'APS2', 'TIK', 'LAJU']:
-                                inputs[var] = st.slider(display_label, 0.0, 100.0, float(default_val), key=input_key, format="%.2f", disabled=is_disabled)
-                            elif var == 'GR':
-                                inputs[var] = st.slider(display_label, 0.0, 1.0, float(default_val), key=input_key, format="%.3f", disabled=is_disabled)
-                            elif var == 'PDRB':
-                                inputs[var] = st.number_input(display_label, min_value=0.0, max_value=1_000_000_000_000.0, value=float(default_val), key=input_key, format="%.2f", disabled=is_disabled)
-                            elif var == 'KP':
-                                min_kp = neet['KP'].min() if not neet.empty else 0
-                                max_kp = neet['KP'].max() if not neet.empty else 120
-                                inputs[var] = st.number_input(display_label, min_value=float(min_kp), max_value=float(max_kp), value=float(default_val), key=input_key, format="%.2f", disabled=is_disabled)
-                            elif var == 'PL':
-                                min_pl = neet['PL'].min() if not neet.empty else 0.0
-                                max_pl = neet['PL'].max() if not neet.empty else 150.0
-                                inputs[var] = st.number_input(display_label, min_value=float(min_pl), max_value=float(max_pl), value=float(default_val), key=input_key, format="%.2f", disabled=is_disabled)
-                            else:
-                                inputs[var] = st.number_input(display_label, value=float(default_val), key=input_key, format="%.2f", disabled=is_disabled)
-
-
-                    prediksi_neet = param_region['intercept']
-                    for var in model_actual_vars:
-                        coef_to_use = param_region.get(var)
-                        if pd.isna(coef_to_use):
-                            coef_to_use = 0.0
-
-                        input_value = inputs.get(var, 0.0)
-                        if pd.isna(input_value):
-                            input_value = 0.0
-
-                        prediksi_neet += coef_to_use * input_value
-
-                    st.markdown("---")
-                    current_prediction_value = f"{prediksi_neet:.2f}%"
-
-                    st.metric(
-                        label=f"🎯 Prediksi NEET Rate untuk {prov_pilih_display} (Wilayah {region_pilih.title().replace('_', ' ')})",
-                        value=current_prediction_value,
-                        help=f"Prediksi berdasarkan model regresi regional. Variabel dengan p-value kurang dari {significance_threshold} dianggap signifikan dan memengaruhi hasil. Variabel yang tidak signifikan atau tidak relevan memiliki input yang dinonaktifkan tetapi tetap memengaruhi prediksi dengan koefisien aslinya."
-                    )
-                    st.success("Prediksi berhasil dihitung! Sesuaikan input variabel di atas untuk melihat perubahan.")
-
-                    if 'previous_inputs' not in st.session_state:
-                        st.session_state['previous_inputs'] = {}
-                        st.session_state['previous_prediction'] = None
-                        st.session_state['initial_run'] = True
-                    else:
-                        st.session_state['initial_run'] = False
-
-                    current_prediction_str = f"{prediksi_neet:.2f}%"
-                    current_inputs = inputs.copy()
-
-                    if not st.session_state['initial_run']:
-                        old_prediction = st.session_state.get('previous_prediction')
-                        old_inputs = st.session_state.get('previous_inputs', {})
-
-                        try:
-                            old_prediction_float = float(str(old_prediction).replace('%',''))
-                        except (ValueError, TypeError):
-                            old_prediction_float = None
-
-                        changed_vars_info = []
-                        if old_prediction_float is not None and not math.isnan(old_prediction_float):
-                            delta_neet_rate = prediksi_neet - old_prediction_float
-
-                            for var in model_actual_vars:
-                                if var in variabel_signifikan:
-                                    old_val = old_inputs.get(var)
-                                    new_val = current_inputs.get(var)
-
-                                    if old_val is not None and new_val is not None and abs(old_val - new_val) > 1e-6:
-                                        change_amount = new_val - old_val
-                                        change_type = "peningkatan" if change_amount > 0 else "penurunan"
-                                        
-                                        desc = var_descriptions.get(var, var)
-                                        changed_vars_info.append(
-                                            f"<strong>{var}</strong> ({desc}) dari {old_val:.2f} menjadi {new_val:.2f} (terjadi {change_type} {abs(change_amount):.2f} unit)."
-                                        )
-                            
-                            if changed_vars_info:
-                                st.markdown("<div class='dynamic-conclusion-box'>", unsafe_allow_html=True)
-                                st.markdown("<h5>✨ Dampak Perubahan Input Anda:</h5>", unsafe_allow_html=True)
-                                st.markdown(f"<p>Anda telah melakukan perubahan pada:<br><ul>{''.join([f'<li>{info}</li>' for info in changed_vars_info])}</ul></p>", unsafe_allow_html=True)
-                                
-                                overall_dampak_word = "meningkat" if delta_neet_rate > 0 else "menurun"
-                                if abs(delta_neet_rate) < 0.01:
-                                    st.markdown(f"<p>Prediksi NEET rate <strong>tetap tidak berubah secara signifikan</strong>.</p>", unsafe_allow_html=True)
-                                else:
-                                    st.markdown(f"<p>Secara keseluruhan, prediksi NEET rate <strong>{overall_dampak_word}</strong> sebesar <strong>{abs(delta_neet_rate):.2f}%</strong> dari {old_prediction_float:.2f}% menjadi {prediksi_neet:.2f}%.</p>", unsafe_allow_html=True)
-                                
-                                st.markdown("</div>", unsafe_allow_html=True)
-                            elif not st.session_state['initial_run'] and (old_prediction_float is None or math.isnan(old_prediction_float)):
-                                st.info("Prediksi sebelumnya tidak valid untuk perbandingan perubahan. Silakan interaksi lebih lanjut.")
-                            elif not st.session_state['initial_run']:
-                                st.info("Tidak ada perubahan yang signifikan pada input yang dapat diubah saat ini.")
-
-                    st.session_state['previous_inputs'] = current_inputs
-                    st.session_state['previous_prediction'] = current_prediction_str
-
 
-st.divider()
-st.markdown("<h3 class='stSubheader'>📝 Kesimpulan Model Wilayah</h3>", unsafe_allow_html=True)
-
-with st.expander("Klik untuk melihat Ringkasan Model Regresi", expanded=True):
-    if 'region_pilih' not in locals() or region_pilih is None:
-        st.info("Pilih Wilayah di sidebar untuk melihat kesimpulan modelnya.")
-    elif model_region.empty:
-        st.info(f"Model untuk wilayah '{region_pilih.title().replace('_', ' ')}' belum tersedia, sehingga kesimpulan tidak dapat dibuat.")
-    else:
-        param_region_conclusion = model_region.iloc[0]
-        
-        signifikan_conclusion = []
-        tidak_signifikan_dihitung_conclusion = []
-        tidak_relevan_diabaikan_conclusion = []
+                tahun_data_terakhir = int(neet["tahun"].max())
+                tahun_basis = st.sidebar.selectbox(
+                    "Nilai awal input simulasi",
+                    [None] + sorted(proyeksi["tahun"].unique().tolist()),
+                    format_func=lambda t: f"Data {tahun_data_terakhir}" if t is None else f"Proyeksi tren {t}",
+                    key="sim_basis_year",
+                    help="Proyeksi memakai tren linear per provinsi dari seluruh tahun data untuk setiap indikator."
+                )
 
-        significance_threshold_conclusion = 0.1
+                render_simulation_section(
+                    region_pilih, param_region, model_actual_vars, variabel_signifikan,
+                    variabel_tidak_signifikan_names, significance_threshold, prov_pilih, prov_pilih_display,
+                    tahun_basis
+                )
 
-        for var in all_potential_vars:
-            coef_val = param_region_conclusion.get(var)
-            p_val = param_region_conclusion.get(f"p_{var}")
 
-            if pd.isna(coef_val):
-                tidak_relevan_diabaikan_conclusion.append(var)
-            elif pd.notna(p_val) and p_val < significance_threshold_conclusion:
-                signifikan_conclusion.append(var)
-            else:
-                tidak_signifikan_dihitung_conclusion.append(var)
-        
-        region_nama_bersih = region_pilih.title().replace('_', ' ')
-        kesimpulan_text = f"<p>Analisis ini didasarkan pada model regresi linear spesifik untuk <strong>Wilayah {region_nama_bersih}</strong>.</p>"
-
-        intercept_val = param_region_conclusion['intercept']
-        kesimpulan_text += f"<p>Intersep model sebesar <strong>{intercept_val:.2f}%</strong>, menunjukkan bahwa tingkat NEET dasar di wilayah ini adalah sekitar {intercept_val:.2f}% ketika seluruh variabel prediktor bernilai nol (atau pada tingkat rata-rata data).</p>"
-
-        if signifikan_conclusion:
-            kesimpulan_text += "<p><u>Variabel signifikan (p &lt; 0.1):</u></p><ul>"
-            for var in sorted(signifikan_conclusion):
-                coef = param_region_conclusion.get(var)
-                p_value = param_region_conclusion.get(f"p_{var}")
-                dampak_word = "menurunkan" if coef < 0 else "meningkatkan"
-                desc = var_descriptions.get(var, var)
-                kesimpulan_text += f"<li><strong>{var}</strong> ({desc}): Koefisien {coef:.4f}, p-value {p_value:.4f}. Ini berarti peningkatan satu unit pada {var} cenderung {dampak_word} NEET rate sebesar {abs(coef):.4f}%. Variabel ini menunjukkan hubungan yang kuat dan konsisten secara statistik.</li>"
-            kesimpulan_text += "</ul>"
+@st.fragment
+@profiled_fragment("kesimpulan")
+def render_conclusion_section(region_pilih, model_region):
+    with st.expander("Klik untuk melihat Ringkasan Model Regresi", expanded=True):
+        if region_pilih is None:
+            st.info("Pilih Wilayah di sidebar untuk melihat kesimpulan modelnya.")
+        elif model_region is None or model_region.empty:
+            st.info(f"Model untuk wilayah '{region_pilih.title().replace('_', ' ')}' belum tersedia, sehingga kesimpulan tidak dapat dibuat.")
         else:
-            kesimpulan_text += "<p>Tidak ada variabel yang secara statistik signifikan ($p < 0.1$) ditemukan memengaruhi NEET rate di wilayah ini berdasarkan model yang digunakan. Ini berarti hubungan yang teramati tidak cukup kuat untuk dianggap bukan kebetulan.</p>"
-
-        if tidak_signifikan_dihitung_conclusion:
-            kesimpulan_text += "<p><u>Variabel tidak signifikan tetapi tetap dihitung dalam model:</u></p><ul>"
-            for var in sorted(tidak_signifikan_dihitung_conclusion):
-                coef = param_region_conclusion.get(var)
-                p_value = param_region_conclusion.get(f"p_{var}")
-                p_info = f"p-value: {p_value:.4f}" if pd.notna(p_value) else "p-value tidak tersedia"
-                desc = var_descriptions.get(var, var)
-                kesimpulan_text += f"<li><strong>{var}</strong> ({desc}): Koefisien {coef:.4f}, {p_info}. Hubungan antara {var} dengan NEET rate tidak menunjukkan bukti statistik yang kuat untuk dianggap signifikan.</li>"
-            kesimpulan_text += "</ul>Variabel-variabel ini mungkin memiliki pengaruh, namun belum dapat dikonfirmasi secara konsisten oleh model.<br>"
-
-        if tidak_relevan_diabaikan_conclusion:
-            bolded_irrelevant_vars = [f"<strong>{v}</strong> ({var_descriptions.get(v, v)})" for v in sorted(tidak_relevan_diabaikan_conclusion)]
-            kesimpulan_text += f"<p><u>Variabel yang tidak digunakan dalam model ini:</u> {', '.join(bolded_irrelevant_vars)}.<br>Koefisien tidak tersedia, sehingga variabel ini tidak memengaruhi prediksi NEET rate untuk wilayah ini.</p>"
+            param_region_conclusion = model_region.iloc[0]
         
-        st.markdown(f"<div class='conclusion-box'>{kesimpulan_text}</div>", unsafe_allow_html=True)
+            klasifikasi_conclusion = classify_variables(param_region_conclusion, significance_threshold)
+            signifikan_conclusion = klasifikasi_conclusion["significant"]
+            tidak_signifikan_dihitung_conclusion = klasifikasi_conclusion["non_significant"]
+            tidak_relevan_diabaikan_conclusion = klasifikasi_conclusion["irrelevant"]
+        
+            region_nama_bersih = region_pilih.title().replace('_', ' ')
+            kesimpulan_text = f"<p>Analisis ini didasarkan pada model regresi linear spesifik untuk <strong>Wilayah {region_nama_bersih}</strong>.</p>"
+
+            intercept_val = param_region_conclusion['intercept']
+            kesimpulan_text += f"<p>Intersep model sebesar <strong>{intercept_val:.2f}%</strong>, menunjukkan bahwa tingkat NEET dasar di wilayah ini adalah sekitar {intercept_val:.2f}% ketika seluruh variabel prediktor bernilai nol (atau pada tingkat rata-rata data).</p>"
+
+            if signifikan_conclusion:
+                kesimpulan_text += "<p><u>Variabel signifikan (p &lt; 0.1):</u></p><ul>"
+                for var in sorted(signifikan_conclusion):
+                    coef = param_region_conclusion.get(var)
+                    p_value = param_region_conclusion.get(f"p_{var}")
+                    dampak_word = "menurunkan" if coef < 0 else "meningkatkan"
+                    desc = var_descriptions.get(var, var)
+                    kesimpulan_text += f"<li><strong>{var}</strong> ({desc}): Koefisien {coef:.4f}, p-value {p_value:.4f}. Ini berarti peningkatan satu unit pada {var} cenderung {dampak_word} NEET rate sebesar {abs(coef):.4f}%. Variabel ini menunjukkan hubungan yang kuat dan konsisten secara statistik.</li>"
+                kesimpulan_text += "</ul>"
+            else:
+                kesimpulan_text += "<p>Tidak ada variabel yang secara statistik signifikan ($p < 0.1$) ditemukan memengaruhi NEET rate di wilayah ini berdasarkan model yang digunakan. Ini berarti hubungan yang teramati tidak cukup kuat untuk dianggap bukan kebetulan.</p>"
+
+            if tidak_signifikan_dihitung_conclusion:
+                kesimpulan_text += "<p><u>Variabel tidak signifikan tetapi tetap dihitung dalam model:</u></p><ul>"
+                for var in sorted(tidak_signifikan_dihitung_conclusion):
+                    coef = param_region_conclusion.get(var)
+                    p_value = param_region_conclusion.get(f"p_{var}")
+                    p_info = f"p-value: {p_value:.4f}" if pd.notna(p_value) else "p-value tidak tersedia"
+                    desc = var_descriptions.get(var, var)
+                    kesimpulan_text += f"<li><strong>{var}</strong> ({desc}): Koefisien {coef:.4f}, {p_info}. Hubungan antara {var} dengan NEET rate tidak menunjukkan bukti statistik yang kuat untuk dianggap signifikan.</li>"
+                kesimpulan_text += "</ul>Variabel-variabel ini mungkin memiliki pengaruh, namun belum dapat dikonfirmasi secara konsisten oleh model.<br>"
+
+            if tidak_relevan_diabaikan_conclusion:
+                bolded_irrelevant_vars = [f"<strong>{v}</strong> ({var_descriptions.get(v, v)})" for v in sorted(tidak_relevan_diabaikan_conclusion)]
+                kesimpulan_text += f"<p><u>Variabel yang tidak digunakan dalam model ini:</u> {', '.join(bolded_irrelevant_vars)}.<br>Koefisien tidak tersedia, sehingga variabel ini tidak memengaruhi prediksi NEET rate untuk wilayah ini.</p>"
+        
+            st.markdown(f"<div class='conclusion-box'>{kesimpulan_text}</div>", unsafe_allow_html=True)
+
+            bootstrap_path = os.path.join(VALIDATION_DIR, "bootstrap_summary.csv")
+            cv_path = os.path.join(VALIDATION_DIR, "cv_summary.csv")
+            if os.path.exists(bootstrap_path) and os.path.exists(cv_path):
+                bootstrap_summary = load_data(bootstrap_path, file_fingerprint(bootstrap_path))
+                cv_summary = load_data(cv_path, file_fingerprint(cv_path))
+                bootstrap_region = bootstrap_summary[bootstrap_summary["Wilayah"] == region_pilih]
+                cv_region = cv_summary[cv_summary["Wilayah"] == region_pilih].set_index("skema")
+
+                if not bootstrap_region.empty:
+                    st.markdown("**Validasi Model (estimasi ulang GLS dengan variabel yang sama):**")
+                    cols_cv = st.columns(2)
+                    if "LOPO" in cv_region.index:
+                        cols_cv[0].metric("RMSE leave-one-province-out", f"{cv_region.loc['LOPO', 'rmse']:.2f} poin")
+                    if "LOYO" in cv_region.index:
+                        cols_cv[1].metric("RMSE leave-one-year-out", f"{cv_region.loc['LOYO', 'rmse']:.2f} poin")
+                    st.dataframe(
+                        bootstrap_region.drop(columns="Wilayah").rename(columns={
+                            "variabel": "Variabel",
+                            "boot_mean": "Rata-rata Bootstrap",
+                            "boot_se": "Galat Baku Bootstrap",
+                            "ci_low": "Batas Bawah 95%",
+                            "ci_high": "Batas Atas 95%",
+                        }),
+                        hide_index=True,
+                        use_container_width=True,
+                    )
+            else:
+                st.caption("Jalankan `python -m neetify validate` untuk menampilkan interval kepercayaan bootstrap dan galat validasi silang model ini.")
+
+
+st.divider()
+st.markdown("<h3 class='stSubheader'>📝 Kesimpulan Model Wilayah</h3>", unsafe_allow_html=True)
+render_conclusion_section(region_pilih, model_region)
 
 
 st.info("✨ Dashboard ini dibuat dengan Streamlit dan data publik.")
+
+if profiler is not None:
+    finish_profiler(profiler)
+    with st.sidebar.expander("🛠️ Profiling", expanded=True):
+        runs = st.session_state["profiling_runs"]
+        terakhir = runs[-1]
+        st.markdown(f"**Rerun terakhir:** {terakhir['total_seconds'] * 1000:.0f} ms")
+        st.dataframe(
+            pd.DataFrame(terakhir["stages"]).assign(ms=lambda d: d["seconds"] * 1000).drop(columns="seconds").round(1),
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.markdown(f"**Sesi ini ({len(runs)} rerun):**")
+        st.dataframe(pd.DataFrame(summarize(runs)).round(4), hide_index=True, use_container_width=True)
+        st.caption(f"Setiap rerun juga ditulis sebagai JSON ke logger `neetify.profiling` dan ke `{profiler.metrics_path}`. "
+                   "Rerun fragment (peta, tren, simulasi, kesimpulan) dicatat terpisah dan tampil di ringkasan sesi.")
@@ -0,0 +1,49 @@
+"""Komponen inti NEETify yang dapat dipakai ulang di luar dashboard.
+
+Inti paket (data, registri wilayah, model dan prediksi) tidak bergantung pada
+Streamlit maupun Plotly. Nama di bawah dimuat saat pertama kali diakses
+sehingga `import neetify` tetap ringan untuk cron job dan notebook::
+
+    import neetify
+    model = neetify.RegionalModel.from_csv("data/model_params_region.csv")
+    panel = neetify.load_panel("data/neet_data_34prov.csv")
+    panel["prediksi"] = model.predict(panel)
+"""
+
+import importlib
+
+_exports = {
+    "ColumnarCache": "neetify.data",
+    "file_fingerprint": "neetify.data",
+    "load_model_params": "neetify.data",
+    "load_panel": "neetify.data",
+    "default_inputs": "neetify.inputs",
+    "input_bounds": "neetify.inputs",
+    "percentage_vars": "neetify.inputs",
+    "RegionalModel": "neetify.model",
+    "all_potential_vars": "neetify.model",
+    "classify_variables": "neetify.model",
+    "formula_latex": "neetify.model",
+    "normalize_model_params": "neetify.model",
+    "significance_threshold": "neetify.model",
+    "var_descriptions": "neetify.model",
+    "assign_region": "neetify.registry",
+    "assign_regions": "neetify.registry",
+    "mapping": "neetify.registry",
+    "normalize_provinces": "neetify.registry",
+    "region_map": "neetify.registry",
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module 'neetify' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,246 @@
+import argparse
+import sys
+
+DEFAULT_PANEL = "data/neet_data_34prov.csv"
+DEFAULT_PARAMS = "data/model_params_region.csv"
+DEFAULT_ESTIMATED = "data/model_params_estimated.csv"
+DEFAULT_CACHE_DIR = "data/.cache"  # sama dengan neetify.data.DEFAULT_CACHE_DIR
+DEFAULT_VALIDATION_DIR = "data/.cache/validation"
+DEFAULT_ADM2_DIR = "data/adm2"
+DEFAULT_CHANGELOG = "data/changelog.jsonl"  # sama dengan neetify.ingest.DEFAULT_CHANGELOG
+
+
+def _parse_spec(values):
+    spec = {}
+    for value in values or []:
+        region, _, variables = value.partition("=")
+        spec[region.upper().strip().replace(" ", "_")] = [v.strip().upper() for v in variables.split(",") if v.strip()]
+    return spec
+
+
+def _mark_built(cache_dir, artifact, panel):
+    from neetify.ingest import ArtifactManifest, slice_fingerprints
+
+    ArtifactManifest(cache_dir).mark_built(artifact, slice_fingerprints(panel))
+
+
+def cmd_estimate(args):
+    import os
+
+    from neetify.data import ColumnarCache, load_model_params, load_panel
+    from neetify.estimation import StatisticsCache, fit_regions, params_frame, spec_from_params
+
+    if args.out != "-" and os.path.abspath(args.out) == os.path.abspath(args.params) and not args.replace_params:
+        print(f"{args.out} adalah parameter terpublikasi; hasil estimasi ulang tidak sama persis dengannya. "
+              "Tambahkan --replace-params untuk tetap menimpanya.", file=sys.stderr)
+        return 1
+
+    tables = ColumnarCache(args.cache_dir)
+    panel = load_panel(args.data, tables)
+    spec = spec_from_params(load_model_params(args.params, tables))
+    spec.update(_parse_spec(args.spec))
+    cache = StatisticsCache(os.path.join(args.cache_dir, "gls_statistics.pkl"))
+    results = fit_regions(panel, spec, cache=cache, workers=args.workers, iterations=args.iterations)
+    cache.save()
+
+    params = params_frame(results, include_se=args.se)
+    if args.out == "-":
+        params.to_csv(sys.stdout, index=False)
+    else:
+        params.to_csv(args.out, index=False)
+        print(f"Parameter {len(params)} wilayah ditulis ke {args.out}", file=sys.stderr)
+        _mark_built(args.cache_dir, "parameter_model", panel)
+
+
+def cmd_validate(args):
+    import os
+
+    from neetify.data import ColumnarCache, load_model_params, load_panel
+    from neetify.estimation import StatisticsCache, spec_from_params
+    from neetify.validation import ValidationRun
+
+    tables = ColumnarCache(args.cache_dir)
+    panel = load_panel(args.data, tables)
+    spec = spec_from_params(load_model_params(args.params, tables))
+    spec.update(_parse_spec(args.spec))
+    cache = StatisticsCache(os.path.join(args.cache_dir, "gls_statistics.pkl"))
+    run = ValidationRun(args.out_dir, n_draws=args.draws, chunk_size=args.chunk_size, seed=args.seed,
+                        workers=args.workers, iterations=args.iterations)
+    run.run(panel, spec, cache=cache)
+    cache.save()
+    if os.path.abspath(args.out_dir) == os.path.abspath(DEFAULT_VALIDATION_DIR):
+        _mark_built(args.cache_dir, "validasi_bootstrap", panel)
+
+
+def cmd_score(args):
+    from neetify.data import ColumnarCache, load_model_params, load_panel
+    from neetify.model import RegionalModel
+    from neetify.scenarios import ScenarioScorer, ScoringRun
+
+    tables = ColumnarCache(args.cache_dir)
+    model = RegionalModel.from_frame(load_model_params(args.params, tables))
+    scorer = ScenarioScorer(model, load_panel(args.data, tables),
+                            threshold=args.threshold, baseline_year=args.baseline_year)
+    run = ScoringRun(args.out, chunk_size=args.chunk_size, workers=args.workers, max_pending=args.max_pending)
+    run.run(scorer, args.input)
+
+
+def cmd_cache(args):
+    from neetify.data import ColumnarCache, load_model_params, load_panel
+
+    tables = ColumnarCache(args.cache_dir)
+    for name, source, loader in (("panel", args.data, load_panel), ("model_params", args.params, load_model_params)):
+        frame = loader(source, tables)
+        print(f"{source}: {len(frame)} baris -> {tables.path(name, [source])}", file=sys.stderr)
+
+
+def cmd_forecast(args):
+    import os
+
+    from neetify.data import ColumnarCache, load_panel
+    from neetify.forecast import TrendForecaster
+
+    panel = load_panel(args.data, ColumnarCache(args.cache_dir))
+    forecaster = TrendForecaster(path=os.path.join(args.cache_dir, "trend_state.pkl"))
+    changed = forecaster.update(panel)
+    forecaster.save()
+    start = forecaster.last_year + 1
+    projection = forecaster.project(range(start, start + args.horizon), panel)
+    if args.out == "-":
+        projection.to_csv(sys.stdout, index=False)
+    else:
+        projection.to_csv(args.out, index=False)
+        print(f"Proyeksi {start}-{start + args.horizon - 1} untuk {projection['provinsi'].nunique()} provinsi "
+              f"ditulis ke {args.out} ({changed} baris data diperbarui)", file=sys.stderr)
+
+
+def cmd_split_adm2(args):
+    import json
+
+    from neetify.registry import mapping
+    from neetify.tiles import split_adm2
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        geojson = json.load(f)
+    index = split_adm2(geojson, args.out_dir, aliases=mapping, tolerances=[float(t) for t in args.tolerances.split(",")],
+                       precision=args.precision, key_property=args.key)
+    n_features = sum(tile["features"] for tile in index["tiles"].values())
+    print(f"{n_features} kabupaten/kota dalam {len(index['tiles'])} file provinsi ditulis ke {args.out_dir}", file=sys.stderr)
+
+
+def cmd_ingest(args):
+    import json
+
+    from neetify.ingest import ingest
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    try:
+        entry = ingest(args.release, args.data, cache_dir=args.cache_dir, changelog=args.changelog,
+                       dry_run=args.dry_run, log=log)
+    except ValueError as error:
+        log(str(error))
+        return 1
+
+    years = ", ".join(map(str, entry["years_added"])) or "-"
+    log(f"{entry['source']}: {entry['rows_added']} baris baru (tahun baru: {years}), "
+        f"{len(entry['columns_added'])} kolom baru, {len(entry['cells_changed'])} sel diperbarui")
+    for col, changed in entry["slices_changed"].items():
+        log(f"  irisan berubah {col}: {', '.join(map(str, changed))}")
+    if not entry["slices_changed"]:
+        log("Tidak ada perubahan; panel dan artefak tidak disentuh.")
+    elif args.dry_run:
+        log("Uji coba (--dry-run): panel, changelog dan artefak tidak ditulis.")
+    else:
+        log(f"Selesai dalam {entry['seconds']:.1f} dtk; perubahan dicatat di {args.changelog}")
+    if args.json:
+        print(json.dumps(entry, indent=2, ensure_ascii=False))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m neetify", description="Alat baris perintah NEETify.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    estimate = subparsers.add_parser("estimate", help="Estimasi ulang model GLS regional dari data panel.")
+    estimate.add_argument("--data", default=DEFAULT_PANEL, help="File panel NEET (CSV).")
+    estimate.add_argument("--params", default=DEFAULT_PARAMS,
+                          help="File parameter yang ada; dipakai untuk menentukan variabel tiap wilayah.")
+    estimate.add_argument("--spec", action="append", metavar="WILAYAH=VAR1,VAR2",
+                          help="Mengganti daftar variabel suatu wilayah (boleh diulang).")
+    estimate.add_argument("--out", default=DEFAULT_ESTIMATED,
+                          help="File keluaran dengan tata letak model_params_region.csv ('-' untuk stdout).")
+    estimate.add_argument("--replace-params", action="store_true",
+                          help="Izinkan --out menimpa file --params (parameter terpublikasi yang dibaca dashboard).")
+    estimate.add_argument("--se", action="store_true", help="Sertakan kolom galat baku se_* dan kovarians cov_*_* (dipakai simulasi Monte Carlo).")
+    estimate.add_argument("--workers", type=int, default=None, help="Jumlah proses paralel (bawaan: jumlah CPU).")
+    estimate.add_argument("--iterations", type=int, default=1, help="Jumlah iterasi pembobotan FGLS.")
+    estimate.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Folder cache tabel, statistik cukup dan faktorisasi.")
+    estimate.set_defaults(func=cmd_estimate)
+
+    validate = subparsers.add_parser("validate", help="Bootstrap dan validasi silang model regional.")
+    validate.add_argument("--data", default=DEFAULT_PANEL, help="File panel NEET (CSV).")
+    validate.add_argument("--params", default=DEFAULT_PARAMS, help="File parameter; menentukan variabel tiap wilayah.")
+    validate.add_argument("--spec", action="append", metavar="WILAYAH=VAR1,VAR2",
+                          help="Mengganti daftar variabel suatu wilayah (boleh diulang).")
+    validate.add_argument("--draws", type=int, default=2000, help="Jumlah sampel bootstrap per wilayah.")
+    validate.add_argument("--chunk-size", type=int, default=250, help="Jumlah sampel per tugas di process pool.")
+    validate.add_argument("--seed", type=int, default=0, help="Seed induk (hasil identik untuk seed yang sama).")
+    validate.add_argument("--workers", type=int, default=None, help="Jumlah proses paralel (bawaan: jumlah CPU).")
+    validate.add_argument("--iterations", type=int, default=1, help="Jumlah iterasi pembobotan FGLS.")
+    validate.add_argument("--out-dir", default=DEFAULT_VALIDATION_DIR, help="Folder hasil yang dibaca dashboard.")
+    validate.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Folder cache statistik cukup.")
+    validate.set_defaults(func=cmd_validate)
+
+    score = subparsers.add_parser("score", help="Menilai file skenario besar (CSV/Parquet) per potongan ke Parquet.")
+    score.add_argument("input", help="File skenario: kolom provinsi (opsional Wilayah) dan nilai variabel.")
+    score.add_argument("--out", required=True, help="File Parquet keluaran.")
+    score.add_argument("--data", default=DEFAULT_PANEL, help="File panel NEET; sumber nilai dasar tiap provinsi.")
+    score.add_argument("--params", default=DEFAULT_PARAMS, help="File parameter model regional.")
+    score.add_argument("--baseline-year", type=int, default=None, help="Tahun nilai dasar (bawaan: tahun terakhir).")
+    score.add_argument("--threshold", type=float, default=0.1,
+                       help="Batas p-value; variabel tidak signifikan dikunci pada nilai dasar.")
+    score.add_argument("--chunk-size", type=int, default=100_000, help="Jumlah baris per potongan.")
+    score.add_argument("--workers", type=int, default=None, help="Jumlah proses paralel (bawaan: jumlah CPU).")
+    score.add_argument("--max-pending", type=int, default=None,
+                       help="Batas potongan yang diproses bersamaan (bawaan: 2 x workers).")
+    score.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Folder cache tabel ternormalisasi.")
+    score.set_defaults(func=cmd_score)
+
+    cache = subparsers.add_parser("cache", help="Membangun tabel Arrow ternormalisasi untuk panel dan parameter model.")
+    cache.add_argument("--data", default=DEFAULT_PANEL, help="File panel NEET (CSV).")
+    cache.add_argument("--params", default=DEFAULT_PARAMS, help="File parameter model regional.")
+    cache.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Folder cache tabel ternormalisasi.")
+    cache.set_defaults(func=cmd_cache)
+
+    forecast = subparsers.add_parser("forecast", help="Proyeksi tren NEET dan indikator semua provinsi.")
+    forecast.add_argument("--data", default=DEFAULT_PANEL, help="File panel NEET (CSV).")
+    forecast.add_argument("--horizon", type=int, default=3, help="Jumlah tahun setelah data terakhir.")
+    forecast.add_argument("--out", default="-", help="File CSV keluaran ('-' untuk stdout).")
+    forecast.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Folder cache jumlah cukup tren.")
+    forecast.set_defaults(func=cmd_forecast)
+
+    ingest = subparsers.add_parser("ingest", help="Menambahkan rilis BPS (tahun atau indikator baru) ke panel dan "
+                                                  "menyegarkan artefak yang terdampak.")
+    ingest.add_argument("release", help="File rilis (CSV/Parquet): kolom provinsi, tahun dan indikator.")
+    ingest.add_argument("--data", default=DEFAULT_PANEL, help="File panel NEET yang diperbarui.")
+    ingest.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Folder cache artefak turunan dan manifesnya.")
+    ingest.add_argument("--changelog", default=DEFAULT_CHANGELOG, help="File JSONL catatan perubahan tiap rilis.")
+    ingest.add_argument("--dry-run", action="store_true", help="Hanya validasi dan laporkan perubahan, tanpa menulis.")
+    ingest.add_argument("--json", action="store_true", help="Cetak catatan perubahan lengkap sebagai JSON ke stdout.")
+    ingest.set_defaults(func=cmd_ingest)
+
+    split = subparsers.add_parser("split-adm2", help="Memecah GeoJSON kabupaten/kota (mis. gadm41_IDN_2.json) per provinsi.")
+    split.add_argument("source", help="GeoJSON ADM2 nasional dengan properti NAME_1 dan kode kabupaten/kota.")
+    split.add_argument("--out-dir", default=DEFAULT_ADM2_DIR, help="Folder file per provinsi dan index.json.")
+    split.add_argument("--key", default="GID_2", help="Properti kode kabupaten/kota untuk menggabungkan data.")
+    split.add_argument("--tolerances", default="0,0.001,0.005,0.02",
+                       help="Level penyederhanaan (derajat), dipilih sesuai luas tampilan provinsi.")
+    split.add_argument("--precision", type=int, default=4, help="Jumlah desimal koordinat yang disimpan.")
+    split.set_defaults(func=cmd_split_adm2)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from neetify.model import normalize_model_params
+from neetify.profiling import stage
+from neetify.registry import assign_regions, normalize_provinces
+
+DEFAULT_CACHE_DIR = "data/.cache"
+
+# dinaikkan bila normalisasi berubah agar tabel lama di cache tidak dipakai lagi
+CACHE_VERSION = 1
+
+
+def file_fingerprint(file_path, length=16):
+    """Hash isi file; dipakai sebagai kunci cache agar artefak turunan dibangun ulang saat sumber berubah."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+def read_panel(file_path):
+    """Membaca panel NEET dengan nama provinsi yang dinormalisasi dan kolom `Wilayah` dari `region_map`."""
+    with stage("muat_csv"):
+        panel = pd.read_csv(file_path)
+    with stage("normalisasi_provinsi"):
+        panel["provinsi"] = normalize_provinces(panel["provinsi"])
+    with stage("assign_region"):
+        panel["Wilayah"] = assign_regions(panel["provinsi"])
+    return panel
+
+
+def read_model_params(file_path):
+    model = normalize_model_params(pd.read_csv(file_path))
+    if "provinsi" in model.columns:
+        model["provinsi"] = normalize_provinces(model["provinsi"])
+    return model
+
+
+class ColumnarCache:
+    """Tabel ternormalisasi dalam format Arrow IPC di `cache_dir`, dibaca lewat memory map.
+
+    Kolom numerik tanpa nilai kosong dikembalikan sebagai view baca-saja atas
+    file yang dipetakan (tanpa salinan, halaman dibaca sesuai kebutuhan);
+    kolom teks dan kolom bernilai kosong tetap disalin ke memori pandas.
+
+    Nama file memuat hash isi sumber sehingga tabel hanya dibangun ulang bila
+    CSV sumber berubah. Agar file besar tidak di-hash setiap kali dibuka,
+    `manifest.json` menyimpan ukuran dan waktu modifikasi tiap sumber; hash
+    dihitung ulang hanya bila keduanya berubah. Bila folder cache tidak dapat
+    ditulis, tabel dibangun di memori seperti biasa.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self._manifest = json.load(f)
+        except (OSError, ValueError):
+            self._manifest = {}
+
+    def _save_manifest(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.manifest_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self._manifest, f, indent=1, sort_keys=True)
+            os.replace(self.manifest_path + ".tmp", self.manifest_path)
+        except OSError:
+            pass
+
+    def fingerprint(self, file_path):
+        """`file_fingerprint` dengan pemeriksaan cepat ukuran dan mtime dari manifest."""
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        entry = self._manifest.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        digest = file_fingerprint(file_path)
+        self._manifest[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        self._save_manifest()
+        return digest
+
+    def path(self, name, sources):
+        parts = [name, str(CACHE_VERSION)] + [self.fingerprint(source) for source in sources]
+        key = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{name}-{key}.arrow")
+
+    def table(self, name, sources, build):
+        """Tabel `name` dari cache, atau hasil `build()` yang lalu disimpan; versi lama dihapus.
+
+        Kolom numerik hasil baca cache tidak dapat ditulis; salin dulu sebelum mengubah di tempat.
+        """
+        import pyarrow as pa
+        from pyarrow import feather
+
+        path = self.path(name, sources)
+        if not os.path.exists(path):
+            frame = build()
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                feather.write_feather(frame, path + ".tmp", compression="uncompressed")
+                os.replace(path + ".tmp", path)
+            except OSError:
+                return frame
+            for entry in os.listdir(self.cache_dir):
+                if entry.startswith(f"{name}-") and entry.endswith(".arrow") and entry != os.path.basename(path):
+                    os.remove(os.path.join(self.cache_dir, entry))
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+
+
+def load_panel(file_path, cache=None):
+    """Panel ternormalisasi (lihat `read_panel`); dengan `cache`, dibaca dari tabel Arrow bila sumber tidak berubah."""
+    if cache is None:
+        return read_panel(file_path)
+    return cache.table("panel", [file_path], lambda: read_panel(file_path))
+
+
+def load_model_params(file_path, cache=None):
+    if cache is None:
+        return read_model_params(file_path)
+    return cache.table("model_params", [file_path], lambda: read_model_params(file_path))
@@ -0,0 +1,228 @@
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from neetify.model import all_potential_vars, covariance_columns
+from neetify.registry import assign_regions
+from neetify.stats import t_pvalue
+
+# Naikkan bila isi hasil `fgls` berubah agar hasil estimasi lama di cache tidak dipakai.
+FIT_FORMAT = 2
+
+class StatisticsCache:
+    """Statistik cukup (X'X, X'y, y'y, n) per provinsi-tahun untuk seluruh variabel kandidat.
+
+    Setiap kelompok provinsi-tahun diberi sidik (hash baris) sehingga hanya
+    kelompok baru atau berubah yang dihitung ulang. Karena statistik disimpan
+    untuk semua variabel kandidat, mengganti himpunan variabel cukup memilih
+    sub-matriks. Hasil estimasi per (wilayah, variabel, data) juga disimpan.
+    """
+
+    def __init__(self, path=None, variables=all_potential_vars, target="neet_rate"):
+        self.path = path
+        self.variables = list(variables)
+        self.target = target
+        self.groups = {}
+        self.fits = {}
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+            if saved.get("variables") == self.variables and saved.get("target") == self.target:
+                self.groups = saved["groups"]
+                if saved.get("fit_format") == FIT_FORMAT:
+                    self.fits = saved["fits"]
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "wb") as f:
+            pickle.dump({"variables": self.variables, "target": self.target,
+                         "groups": self.groups, "fits": self.fits, "fit_format": FIT_FORMAT}, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def update(self, panel):
+        """Menyinkronkan cache dengan `panel`; mengembalikan jumlah kelompok yang dihitung ulang."""
+        columns = [self.target, *self.variables]
+        data = panel.dropna(subset=columns)
+        row_hash = pd.util.hash_pandas_object(data[["provinsi", "tahun", *columns]], index=False)
+        keys = list(zip(data["provinsi"], data["tahun"].astype(int)))
+        digests = row_hash.groupby([data["provinsi"], data["tahun"].astype(int)]).sum()
+
+        current = {(prov, int(tahun)): int(digest) for (prov, tahun), digest in digests.items()}
+        stale = [key for key, digest in current.items() if self.groups.get(key, (None,))[0] != digest]
+        for key in set(self.groups) - set(current):
+            del self.groups[key]
+
+        if stale:
+            stale_set = set(stale)
+            mask = np.fromiter((key in stale_set for key in keys), dtype=bool, count=len(keys))
+            subset = data[mask]
+            x = np.column_stack([np.ones(len(subset)), subset[self.variables].to_numpy(dtype=float)])
+            y = subset[self.target].to_numpy(dtype=float)
+            group_keys = list(zip(subset["provinsi"], subset["tahun"].astype(int)))
+            index = {key: i for i, key in enumerate(stale)}
+            codes = np.array([index[key] for key in group_keys])
+            gram = np.zeros((len(stale), x.shape[1], x.shape[1]))
+            np.add.at(gram, codes, np.einsum("ni,nj->nij", x, x))
+            cross = np.zeros((len(stale), x.shape[1]))
+            np.add.at(cross, codes, x * y[:, None])
+            yy = np.bincount(codes, weights=y * y, minlength=len(stale))
+            count = np.bincount(codes, minlength=len(stale))
+            for key, i in index.items():
+                self.groups[key] = (current[key], gram[i], cross[i], yy[i], int(count[i]))
+        return len(stale)
+
+    def province_statistics(self, provinces, variables):
+        """Statistik per provinsi untuk `variables` (dengan intersep di kolom pertama)."""
+        cols = [0] + [1 + self.variables.index(var) for var in variables]
+        per_province = {}
+        for (prov, _), (_, gram, cross, yy, n) in self.groups.items():
+            if prov not in provinces:
+                continue
+            g, c, d, m = per_province.get(prov, (0.0, 0.0, 0.0, 0))
+            per_province[prov] = (g + gram[np.ix_(cols, cols)], c + cross[cols], d + yy, m + n)
+        return per_province
+
+    def data_digest(self, provinces):
+        entries = sorted((key, value[0]) for key, value in self.groups.items() if key[0] in provinces)
+        return hashlib.sha256(repr(entries).encode("utf-8")).hexdigest()[:16]
+
+
+def _rss(beta, grams, crosses, yys):
+    """RSS per (batch, provinsi) untuk koefisien `beta` (batch x k) dari statistik cukup."""
+    return (yys - 2 * np.einsum("bk,bpk->bp", beta, crosses)
+            + np.einsum("bi,bpij,bj->bp", beta, grams, beta))
+
+
+def _solve(a, b):
+    try:
+        return np.linalg.solve(a, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum("bij,bj->bi", np.linalg.pinv(a), b)
+
+
+def fgls_batch(grams, crosses, yys, counts, iterations=1, min_variance=1e-8):
+    """FGLS untuk banyak set data sekaligus (dimensi pertama = batch, kedua = provinsi).
+
+    Dipakai untuk bootstrap dan validasi silang: tiap batch adalah salinan
+    statistik provinsi yang sudah diberi bobot/dihapus. Provinsi dengan n = 0
+    tidak ikut dihitung.
+    """
+    present = counts > 0
+    beta = _solve(grams.sum(axis=1), crosses.sum(axis=1))
+    weights = present.astype(float)
+    for _ in range(iterations):
+        rss = _rss(beta, grams, crosses, yys)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(present, 1.0 / np.maximum(rss / np.where(present, counts, 1), min_variance), 0.0)
+        beta = _solve(np.einsum("bp,bpij->bij", weights, grams), np.einsum("bp,bpi->bi", weights, crosses))
+    return beta, weights
+
+
+def stack_statistics(stats):
+    """Statistik per provinsi (dict) menjadi array (provinsi x ...) untuk `fgls_batch`."""
+    grams = np.array([s[0] for s in stats.values()])
+    crosses = np.array([s[1] for s in stats.values()])
+    yys = np.array([s[2] for s in stats.values()], dtype=float)
+    counts = np.array([s[3] for s in stats.values()], dtype=float)
+    return grams, crosses, yys, counts
+
+
+def fgls(stats, iterations=1, min_variance=1e-8):
+    """GLS layak dengan varians galat berbeda per provinsi, dihitung langsung dari statistik cukup.
+
+    Tahap pertama OLS gabungan; varians tiap provinsi diestimasi dari RSS-nya,
+    lalu model diestimasi ulang dengan bobot 1/varians (diulang `iterations` kali).
+    Mengembalikan koefisien, galat baku, kovarians koefisien, p-value dan derajat bebas.
+    """
+    grams, crosses, yys, counts = (a[None] for a in stack_statistics(stats))
+    beta, weights = fgls_batch(grams, crosses, yys, counts, iterations, min_variance)
+    factor = np.linalg.cholesky(np.einsum("bp,bpij->ij", weights, grams))
+
+    df_resid = int(counts.sum()) - beta.shape[1]
+    scale = float((weights * _rss(beta, grams, crosses, yys)).sum()) / df_resid
+    # (XᵀWX)⁻¹ = L⁻ᵀL⁻¹: L⁻¹ dibentuk eksplisit dari L · L⁻¹ = I (matriks kecil, 1 + jumlah variabel)
+    whitened = np.linalg.solve(factor, np.eye(len(factor)))
+    stderr = np.sqrt(scale * (whitened ** 2).sum(axis=0))
+    return {
+        "beta": beta[0],
+        "stderr": stderr,
+        "covariance": scale * whitened.T @ whitened,
+        "pvalues": t_pvalue(beta[0] / stderr, df_resid),
+        "df_resid": df_resid,
+    }
+
+
+def spec_from_params(model):
+    """Variabel yang dipakai tiap wilayah menurut file parameter yang ada (koefisien tidak NaN)."""
+    return {
+        row["Wilayah"]: [var for var in all_potential_vars if pd.notna(row.get(var))]
+        for _, row in model.iterrows()
+    }
+
+
+def _fit_region(args):
+    region, variables, stats, iterations = args
+    return region, variables, fgls(stats, iterations)
+
+
+def fit_regions(panel, spec, cache=None, workers=None, iterations=1):
+    """Mengestimasi model GLS setiap wilayah secara paralel antar proses.
+
+    `spec` memetakan wilayah ke daftar variabel. Wilayah yang data dan
+    variabelnya tidak berubah sejak estimasi sebelumnya diambil dari cache.
+    """
+    cache = cache or StatisticsCache()
+    panel = panel.assign(Wilayah=assign_regions(panel["provinsi"]))
+    cache.update(panel)
+
+    results, jobs = {}, []
+    for region, variables in spec.items():
+        provinces = set(panel.loc[panel["Wilayah"] == region, "provinsi"])
+        key = (region, tuple(variables), iterations, cache.data_digest(provinces))
+        if key in cache.fits:
+            results[region] = cache.fits[key]
+        else:
+            jobs.append((key, (region, list(variables), cache.province_statistics(provinces, variables), iterations)))
+
+    if jobs:
+        if workers == 1 or len(jobs) == 1:
+            fitted = map(_fit_region, [job for _, job in jobs])
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fitted = list(pool.map(_fit_region, [job for _, job in jobs]))
+        for (key, _), (region, variables, fit) in zip(jobs, fitted):
+            fit["variables"] = variables
+            cache.fits[key] = fit
+            results[region] = fit
+    return results
+
+
+def params_frame(results, include_se=False):
+    """Tabel dengan tata letak `model_params_region.csv`: Region, intercept, koefisien, p_*.
+
+    Dengan `include_se`, ditambah galat baku `se_*` dan kovarians `cov_*_*`
+    dari (XᵀWX)⁻¹ yang dipakai simulasi Monte Carlo.
+    """
+    rows = []
+    for region, fit in results.items():
+        row = {"Region": region.title(), "intercept": fit["beta"][0]}
+        coef = dict(zip(fit["variables"], fit["beta"][1:]))
+        pvalues = dict(zip(fit["variables"], fit["pvalues"][1:]))
+        stderr = dict(zip(fit["variables"], fit["stderr"][1:]))
+        row.update({var: coef.get(var, np.nan) for var in all_potential_vars})
+        row.update({f"p_{var}": pvalues.get(var, np.nan) for var in all_potential_vars})
+        if include_se:
+            row.update({f"se_{var}": stderr.get(var, np.nan) for var in all_potential_vars})
+            position = {term: k for k, term in enumerate(["intercept", *fit["variables"]])}
+            terms = ["intercept", *all_potential_vars]
+            for i, j, name in covariance_columns():
+                a, b = position.get(terms[i]), position.get(terms[j])
+                row[name] = np.nan if a is None or b is None else fit["covariance"][a, b]
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,244 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+def animated_choropleth(panel, geojson, featureidkey, value="neet_rate", colors=px.colors.sequential.YlOrRd,
+                        height=600):
+    """Satu figure dengan frame per tahun; geometri hanya disimpan di trace dasar, frame membawa nilai saja."""
+    years = sorted(panel["tahun"].unique())
+    by_year = {year: panel[panel["tahun"] == year] for year in years}
+    zmin = panel[value].min() * 0.9
+    zmax = panel[value].max() * 1.1
+    colorscale = [[i / (len(colors) - 1), c] for i, c in enumerate(colors)]
+
+    def frame_trace(data):
+        return go.Choropleth(
+            locations=data["provinsi"].tolist(),
+            z=data[value].tolist(),
+            customdata=data["tooltip"].tolist(),
+        )
+
+    first = by_year[years[-1]]
+    base = go.Choropleth(
+        geojson=geojson,
+        featureidkey=featureidkey,
+        locations=first["provinsi"].tolist(),
+        z=first[value].tolist(),
+        customdata=first["tooltip"].tolist(),
+        hovertemplate="%{customdata}<extra></extra>",
+        colorscale=colorscale,
+        zmin=zmin,
+        zmax=zmax,
+        colorbar=dict(title=dict(text="NEET Rate")),
+    )
+    frames = [
+        go.Frame(name=str(year), data=[frame_trace(by_year[year])],
+                 layout=dict(title=dict(text=f"NEET Rate per Provinsi - {year}")))
+        for year in years
+    ]
+    animation = dict(frame=dict(duration=800, redraw=True), transition=dict(duration=0), fromcurrent=True)
+
+    fig = go.Figure(data=[base], frames=frames)
+    fig.update_geos(fitbounds="locations", visible=False, showland=True, landcolor="white")
+    fig.update_layout(
+        title=f"NEET Rate per Provinsi - {years[-1]}",
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        margin=dict(l=0, r=0, t=40, b=0),
+        height=height,
+        updatemenus=[dict(
+            type="buttons",
+            direction="left",
+            x=0.0, y=0.0, xanchor="left", yanchor="top",
+            buttons=[
+                dict(label="▶", method="animate", args=[None, animation]),
+                dict(label="❚❚", method="animate",
+                     args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")]),
+            ],
+        )],
+        sliders=[dict(
+            active=len(years) - 1,
+            x=0.1, y=0.0, len=0.9,
+            currentvalue=dict(prefix="Tahun: "),
+            steps=[
+                dict(label=str(year), method="animate",
+                     args=[[str(year)], dict(frame=dict(duration=0, redraw=True), mode="immediate")])
+                for year in years
+            ],
+        )],
+    )
+    return fig
+
+
+def choropleth_map(geojson, featureidkey, locations, values, tooltips, title, value_range=None,
+                   colors=px.colors.sequential.YlOrRd, height=600):
+    """Peta choropleth untuk tingkat wilayah mana pun; `featureidkey` menentukan properti penggabung (Propinsi, GID_2, ...)."""
+    colorscale = [[i / (len(colors) - 1), c] for i, c in enumerate(colors)]
+    fig = go.Figure(go.Choropleth(
+        geojson=geojson,
+        featureidkey=featureidkey,
+        locations=list(locations),
+        z=list(values),
+        customdata=list(tooltips),
+        hovertemplate="%{customdata}<extra></extra>",
+        colorscale=colorscale,
+        zmin=value_range[0] if value_range else None,
+        zmax=value_range[1] if value_range else None,
+        colorbar=dict(title=dict(text="NEET Rate")),
+    ))
+    fig.update_geos(fitbounds="locations", visible=False, showland=True, landcolor="white")
+    fig.update_layout(
+        title=title,
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        margin=dict(l=0, r=0, t=40, b=0),
+        height=height,
+    )
+    return fig
+
+
+LISA_COLORS = {
+    "Tinggi-Tinggi": "#d7191c",
+    "Rendah-Rendah": "#2c7bb6",
+    "Tinggi-Rendah": "#fdae61",
+    "Rendah-Tinggi": "#abd9e9",
+    "Tidak signifikan": "#eeeeee",
+}
+
+
+def lisa_map(geojson, featureidkey, locations, clusters, tooltips, title, height=600):
+    """Peta klaster LISA: satu trace per kategori dengan warna tetap agar legenda dapat diklik."""
+    locations, clusters, tooltips = list(locations), list(clusters), list(tooltips)
+    fig = go.Figure()
+    for label, color in LISA_COLORS.items():
+        idx = [i for i, c in enumerate(clusters) if c == label]
+        if not idx:
+            continue
+        fig.add_trace(go.Choropleth(
+            geojson=geojson,
+            featureidkey=featureidkey,
+            locations=[locations[i] for i in idx],
+            z=[1] * len(idx),
+            customdata=[tooltips[i] for i in idx],
+            hovertemplate="%{customdata}<extra></extra>",
+            colorscale=[[0, color], [1, color]],
+            showscale=False,
+            name=label,
+            showlegend=True,
+            marker_line_color="#999999",
+        ))
+    fig.update_geos(fitbounds="locations", visible=False, showland=True, landcolor="white")
+    fig.update_layout(
+        title=title,
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        margin=dict(l=0, r=0, t=40, b=0),
+        height=height,
+        legend=dict(orientation="h", y=-0.02),
+    )
+    return fig
+
+
+def prediction_histogram(samples, point, interval, bins=50, height=300):
+    """Histogram sebaran prediksi Monte Carlo; hanya jumlah per bin yang dikirim ke browser."""
+    counts, edges = np.histogram(samples, bins=bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    fig = go.Figure(go.Bar(
+        x=centers, y=counts, width=np.diff(edges),
+        marker_color="#4f8bf9",
+        hovertemplate="NEET %{x:.2f}%<br>%{y} sampel<extra></extra>",
+    ))
+    fig.add_vline(x=point, line_color="#d62728", annotation_text="Prediksi")
+    for bound in interval:
+        fig.add_vline(x=bound, line_dash="dash", line_color="#555555")
+    fig.update_layout(
+        xaxis_title="Prediksi NEET Rate (%)",
+        yaxis_title="Jumlah sampel",
+        bargap=0,
+        margin=dict(l=0, r=0, t=30, b=0),
+        height=height,
+    )
+    return fig
+
+
+def tornado_chart(result, variable_labels=None, height=None):
+    """Diagram tornado dari hasil `sensitivity.tornado` (batang dari prediksi dasar ke prediksi rendah/tinggi)."""
+    base = result.attrs["prediksi_dasar"]
+    labels = [variable_labels.get(v, v) if variable_labels else v for v in result["variabel"]]
+    fig = go.Figure()
+    for column, value_column, name, color in [
+        ("prediksi_rendah", "nilai_rendah", "Nilai rendah", "#2ca02c"),
+        ("prediksi_tinggi", "nilai_tinggi", "Nilai tinggi", "#d62728"),
+    ]:
+        fig.add_trace(go.Bar(
+            y=labels,
+            x=result[column] - base,
+            base=base,
+            orientation="h",
+            name=name,
+            marker_color=color,
+            customdata=np.column_stack([result[value_column], result[column]]),
+            hovertemplate="Input %{customdata[0]:.3f}<br>Prediksi %{customdata[1]:.2f}%<extra></extra>",
+        ))
+    fig.add_vline(x=base, line_color="#333333")
+    fig.update_layout(
+        barmode="overlay",
+        xaxis_title="Prediksi NEET Rate (%)",
+        margin=dict(l=0, r=0, t=30, b=0),
+        height=height or 120 + 40 * len(result),
+        legend=dict(orientation="h", y=1.1),
+    )
+    return fig
+
+
+def ranking_chart(result, highlight=None, height=None):
+    """Batang horizontal prediksi skenario per provinsi, terurut, dengan penanda prediksi dasar.
+
+    `result` berkolom `provinsi`, `prediksi` dan `prediksi_dasar` (mis. dari
+    `ScenarioScorer.compare`); provinsi `highlight` diberi warna berbeda.
+    """
+    result = result.sort_values("prediksi")
+    labels = result["provinsi"].str.replace("RAYA", " Raya").str.title()
+    colors = np.where(result["provinsi"] == highlight, "#d62728", "#4f8bf9")
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=labels,
+        x=result["prediksi"],
+        orientation="h",
+        name="Skenario",
+        marker_color=colors,
+        customdata=np.column_stack([result["prediksi_dasar"], result["prediksi"] - result["prediksi_dasar"]]),
+        hovertemplate="%{y}<br>Skenario %{x:.2f}%<br>Dasar %{customdata[0]:.2f}% (%{customdata[1]:+.2f} poin)<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        y=labels,
+        x=result["prediksi_dasar"],
+        mode="markers",
+        name="Dasar",
+        marker=dict(symbol="line-ns-open", size=14, color="#333333"),
+        hoverinfo="skip",
+    ))
+    fig.update_layout(
+        xaxis_title="Prediksi NEET Rate (%)",
+        margin=dict(l=0, r=0, t=30, b=0),
+        height=height or 120 + 22 * len(result),
+        legend=dict(orientation="h", y=1.05),
+    )
+    return fig
+
+
+def response_heatmap(xs, ys, z, var_x, var_y, height=400):
+    fig = go.Figure(go.Heatmap(
+        x=xs, y=ys, z=z,
+        colorscale="YlOrRd",
+        colorbar=dict(title=dict(text="NEET (%)")),
+        hovertemplate=f"{var_x} %{{x:.3f}}<br>{var_y} %{{y:.3f}}<br>Prediksi %{{z:.2f}}%<extra></extra>",
+    ))
+    fig.update_layout(
+        xaxis_title=var_x,
+        yaxis_title=var_y,
+        margin=dict(l=0, r=0, t=30, b=0),
+        height=height,
+    )
+    return fig
@@ -0,0 +1,130 @@
+import os
+import pickle
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from neetify.inputs import input_bounds
+from neetify.model import all_potential_vars
+from neetify.registry import assign_regions
+
+_SUMS = ("n", "t", "tt", "y", "ty", "yy")
+
+
+class TrendForecaster:
+    """Tren linear per provinsi untuk NEET dan indikator prediktor, dari jumlah cukup.
+
+    Untuk setiap provinsi disimpan n, Σt, Σt², Σy, Σty dan Σy² per indikator
+    (t = tahun - `origin`). Menambah tahun baru atau mengoreksi satu baris
+    cukup menambahkan selisih kontribusi baris tersebut, lalu semua provinsi
+    dan indikator diproyeksikan sekaligus dengan operasi array.
+    """
+
+    def __init__(self, indicators=("neet_rate", *all_potential_vars), path=None, origin=2020):
+        self.indicators = list(indicators)
+        self.path = path
+        self.origin = origin
+        self.rows = {}
+        self.sums = {}
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+            if saved.get("indicators") == self.indicators and saved.get("origin") == origin:
+                self.rows = saved["rows"]
+                self.sums = saved["sums"]
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "wb") as f:
+            pickle.dump({"indicators": self.indicators, "origin": self.origin,
+                         "rows": self.rows, "sums": self.sums}, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def _contribution(self, tahun, values):
+        t = float(tahun - self.origin)
+        present = ~np.isnan(values)
+        y = np.where(present, values, 0.0)
+        m = present.astype(float)
+        return np.stack([m, m * t, m * t * t, y, t * y, y * y])
+
+    def update(self, panel):
+        """Menyinkronkan jumlah cukup dengan `panel`; mengembalikan jumlah baris provinsi-tahun yang berubah."""
+        # disalin agar baris yang disimpan tidak ikut berubah bila `panel` kemudian diubah di tempat
+        values = panel.reindex(columns=self.indicators).to_numpy(dtype=float, copy=True)
+        current = {
+            (str(prov), int(tahun)): row
+            for prov, tahun, row in zip(panel["provinsi"], panel["tahun"], values)
+        }
+        changed = 0
+        for key in set(self.rows) - set(current):
+            prov, tahun = key
+            self.sums[prov] -= self._contribution(tahun, self.rows.pop(key))
+            changed += 1
+        for key, row in current.items():
+            old = self.rows.get(key)
+            if old is not None and np.array_equal(old, row, equal_nan=True):
+                continue
+            prov, tahun = key
+            delta = self._contribution(tahun, row)
+            if old is not None:
+                delta = delta - self._contribution(tahun, old)
+            self.sums[prov] = self.sums.get(prov, 0.0) + delta
+            self.rows[key] = row
+            changed += 1
+        return changed
+
+    @property
+    def last_year(self):
+        return max(tahun for _, tahun in self.rows)
+
+    def fit(self):
+        """Koefisien tren semua provinsi: array (provinsi x indikator) untuk intersep, slope dan galat baku."""
+        provinces = sorted(self.sums)
+        n, st, stt, sy, sty, syy = np.stack([self.sums[prov] for prov in provinces], axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_mean = st / n
+            sxx = stt - st * t_mean
+            sxy = sty - st * sy / n
+            slope = np.where(sxx > 0, sxy / sxx, 0.0)
+            intercept = sy / n - slope * t_mean
+            sse = np.maximum(syy - sy * sy / n - slope * sxy, 0.0)
+            sigma = np.where(n > 2, np.sqrt(sse / (n - 2)), np.nan)
+        return {"provinces": provinces, "intercept": intercept, "slope": slope, "sigma": sigma,
+                "n": n, "t_mean": t_mean, "sxx": sxx}
+
+    def project(self, years, panel=None, level=0.95):
+        """Proyeksi (provinsi x tahun) berbentuk seperti panel, dengan kolom `neet_rate_low`/`neet_rate_high`.
+
+        Nilai dipotong pada batas input simulasi (mis. persentase 0-100);
+        `panel` dipakai untuk batas KP dan PL.
+        """
+        fit = self.fit()
+        years = np.asarray(list(years), dtype=int)
+        t = (years - self.origin).astype(float)
+        mean = fit["intercept"][..., None] + fit["slope"][..., None] * t
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread = fit["sigma"][..., None] * np.sqrt(
+                1 + 1 / fit["n"][..., None] + (t - fit["t_mean"][..., None]) ** 2 / fit["sxx"][..., None]
+            )
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+
+        for k, var in enumerate(self.indicators):
+            lower, upper = (0.0, 100.0) if var == "neet_rate" else input_bounds(var, panel if panel is not None else pd.DataFrame())
+            mean[:, k] = np.clip(mean[:, k], lower, upper)
+
+        n_prov, n_years = len(fit["provinces"]), len(years)
+        frame = pd.DataFrame({
+            "provinsi": np.repeat(fit["provinces"], n_years),
+            "tahun": np.tile(years, n_prov),
+        })
+        for k, var in enumerate(self.indicators):
+            frame[var] = mean[:, k].ravel()
+        if "neet_rate" in self.indicators:
+            k = self.indicators.index("neet_rate")
+            frame["neet_rate_low"] = np.clip(mean[:, k] - z * spread[:, k], 0.0, 100.0).ravel()
+            frame["neet_rate_high"] = np.clip(mean[:, k] + z * spread[:, k], 0.0, 100.0).ravel()
+        frame["Wilayah"] = assign_regions(frame["provinsi"])
+        return frame
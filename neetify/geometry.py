@@ -0,0 +1,232 @@
+import json
+
+import numpy as np
+
+from neetify.profiling import stage
+
+DEFAULT_TOLERANCES = (0.0, 0.005, 0.02, 0.05)
+
+
+def normalize_name(name, aliases=None):
+    normalized = str(name).upper().strip().replace(" ", "")
+    if aliases:
+        normalized = aliases.get(normalized, normalized)
+    return normalized
+
+
+def _perpendicular_distance(points, start, end):
+    segment = end - start
+    length = np.hypot(segment[0], segment[1])
+    if length == 0:
+        return np.hypot(points[:, 0] - start[0], points[:, 1] - start[1])
+    return np.abs(segment[0] * (points[:, 1] - start[1]) - segment[1] * (points[:, 0] - start[0])) / length
+
+
+def simplify_ring(ring, tolerance):
+    """Douglas-Peucker untuk satu ring tertutup; mengembalikan None bila ring runtuh."""
+    ring = np.asarray(ring, dtype=float)
+    if tolerance <= 0 or len(ring) <= 4:
+        return ring
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[0] = keep[-1] = True
+    # Ring tertutup: titik terjauh dari titik awal dipakai sebagai jangkar kedua
+    # agar ruas pertama tidak berupa segmen nol.
+    far = int(np.argmax(np.hypot(ring[:, 0] - ring[0, 0], ring[:, 1] - ring[0, 1])))
+    keep[far] = True
+    stack = [(0, far), (far, len(ring) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        dist = _perpendicular_distance(ring[first + 1:last], ring[first], ring[last])
+        idx = int(np.argmax(dist))
+        if dist[idx] > tolerance:
+            split = first + 1 + idx
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    simplified = ring[keep]
+    if len(simplified) < 4:
+        return None
+    return simplified
+
+
+def _ring_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1])))
+
+
+def quantize_ring(ring, precision):
+    """Membulatkan ring ke `precision` desimal; None bila ring runtuh (kurang dari 4 titik atau luas nol)."""
+    ring = np.round(np.asarray(ring, dtype=float), precision)
+    changed = np.any(np.diff(ring, axis=0) != 0, axis=1)
+    ring = ring[np.concatenate(([True], changed))]
+    if not np.array_equal(ring[0], ring[-1]):
+        ring = np.vstack([ring, ring[:1]])
+    if len(ring) < 4 or _ring_area(ring) == 0:
+        return None
+    return ring
+
+
+def _ring_extent(ring):
+    return max(np.ptp(ring[:, 0]), np.ptp(ring[:, 1]))
+
+
+def _as_polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    raise ValueError(f"Tipe geometri tidak didukung: {geometry['type']}")
+
+
+def simplify_polygons(polygons, tolerance, precision=None):
+    """Menyederhanakan daftar polygon satu fitur tanpa menghilangkan fitur tersebut."""
+    polygons = [[np.asarray(ring, dtype=float) for ring in polygon] for polygon in polygons]
+    largest = max(range(len(polygons)), key=lambda i: _ring_extent(polygons[i][0]))
+    result = []
+    for i, polygon in enumerate(polygons):
+        rings = []
+        for j, ring in enumerate(polygon):
+            if tolerance > 0 and _ring_extent(ring) < tolerance and not (i == largest and j == 0):
+                if j == 0:
+                    break
+                continue
+            simplified = simplify_ring(ring, tolerance)
+            if simplified is not None and precision is not None:
+                simplified = quantize_ring(simplified, precision)
+            if simplified is None:
+                if i == largest and j == 0:
+                    simplified = ring
+                elif j == 0:
+                    break
+                else:
+                    continue
+            rings.append(simplified.tolist())
+        if rings:
+            result.append(rings)
+    return result
+
+
+class GeometryStore:
+    """Geometri batas wilayah yang dinormalisasi dan disederhanakan satu kali per proses.
+
+    Objek GeoJSON yang dikembalikan dipakai bersama oleh semua sesi sehingga
+    tidak boleh diubah oleh pemanggil.
+    """
+
+    def __init__(self, levels, key_property="Propinsi"):
+        self.key_property = key_property
+        self._levels = dict(sorted(levels.items()))
+
+    @classmethod
+    def from_geojson(cls, geojson, aliases=None, tolerances=DEFAULT_TOLERANCES, precision=None,
+                     source_property="NAME_1", key_property="Propinsi", keep_properties=("GID_1", "NAME_1"),
+                     normalize=True):
+        """Membangun semua level dari GeoJSON; kunci fitur diambil dari `source_property`.
+
+        Dengan `normalize`, kunci dinormalisasi seperti nama provinsi panel
+        (lihat `normalize_name`); tanpa itu kunci dipakai apa adanya (mis. GID).
+        """
+        features = []
+        for feature in geojson["features"]:
+            properties = feature["properties"]
+            if source_property not in properties:
+                continue
+            slim = {k: properties[k] for k in keep_properties if k in properties}
+            key = properties[source_property]
+            slim[key_property] = normalize_name(key, aliases) if normalize else key
+            features.append((slim, _as_polygons(feature["geometry"])))
+
+        levels = {}
+        for tolerance in sorted(set(tolerances) | {0.0}):
+            levels[float(tolerance)] = {
+                "type": "FeatureCollection",
+                "features": [
+                    {
+                        "type": "Feature",
+                        "properties": properties,
+                        "geometry": {
+                            "type": "MultiPolygon",
+                            "coordinates": simplify_polygons(polygons, tolerance, precision),
+                        },
+                    }
+                    for properties, polygons in features
+                ],
+            }
+        return cls(levels, key_property=key_property)
+
+    @classmethod
+    def from_file(cls, file_path, **kwargs):
+        with stage("muat_geojson"), open(file_path, "r", encoding="utf-8") as f:
+            geojson = json.load(f)
+        with stage("normalisasi_geojson"):
+            return cls.from_geojson(geojson, **kwargs)
+
+    def to_dict(self):
+        """Semua level dalam bentuk yang dapat ditulis sebagai JSON (lihat `from_dict`)."""
+        return {"key": self.key_property, "levels": {repr(t): level for t, level in self._levels.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({float(t): level for t, level in data["levels"].items()}, key_property=data["key"])
+
+    @property
+    def tolerances(self):
+        return tuple(self._levels)
+
+    @property
+    def featureidkey(self):
+        return f"properties.{self.key_property}"
+
+    @property
+    def keys(self):
+        return [f["properties"][self.key_property] for f in self._levels[0.0]["features"]]
+
+    def bbox(self):
+        """Kotak batas (min_lon, min_lat, max_lon, max_lat) seluruh fitur."""
+        coords = np.concatenate([
+            np.asarray(ring, dtype=float)
+            for feature in self.geojson(max(self._levels))["features"]
+            for polygon in feature["geometry"]["coordinates"]
+            for ring in polygon
+        ])
+        return (*coords.min(axis=0).tolist(), *coords.max(axis=0).tolist())
+
+    def geojson(self, tolerance=0.0):
+        """GeoJSON pada level tersimpan paling kasar yang tidak melebihi `tolerance`."""
+        level = max(t for t in self._levels if t <= tolerance) if tolerance > 0 else 0.0
+        return self._levels[level]
+
+    def quantized_payload(self, tolerance=0.0, bits=16):
+        """Geometri terkuantisasi dan ter-delta-encode (mirip transform TopoJSON) untuk dikirim ke browser."""
+        geojson = self.geojson(tolerance)
+        coords = np.concatenate([
+            np.asarray(ring, dtype=float)
+            for feature in geojson["features"]
+            for polygon in feature["geometry"]["coordinates"]
+            for ring in polygon
+        ])
+        lo = coords.min(axis=0)
+        span = coords.max(axis=0) - lo
+        steps = (1 << bits) - 1
+        scale = np.where(span > 0, span / steps, 1.0)
+
+        features = []
+        for feature in geojson["features"]:
+            polygons = []
+            for polygon in feature["geometry"]["coordinates"]:
+                rings = []
+                for ring in polygon:
+                    q = np.round((np.asarray(ring, dtype=float) - lo) / scale).astype(np.int64)
+                    q = np.vstack([q[:1], np.diff(q, axis=0)])
+                    rings.append(q.ravel().tolist())
+                polygons.append(rings)
+            features.append({"id": feature["properties"][self.key_property],
+                             "properties": feature["properties"],
+                             "polygons": polygons})
+        return {
+            "key": self.key_property,
+            "transform": {"scale": scale.tolist(), "translate": lo.tolist()},
+            "features": features,
+        }
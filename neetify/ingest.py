@@ -0,0 +1,323 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from neetify.data import DEFAULT_CACHE_DIR, ColumnarCache, file_fingerprint, read_panel
+from neetify.model import all_potential_vars
+from neetify.registry import normalize_provinces, normalize_regions, province_region
+
+KEY_COLUMNS = ("provinsi", "tahun")
+REGION_COLUMNS = ("Region", "Wilayah")
+DEFAULT_CHANGELOG = "data/changelog.jsonl"
+MANIFEST_NAME = "artifacts.json"
+
+
+def read_release(file_path):
+    if file_path.endswith((".parquet", ".parq", ".pq")):
+        return pd.read_parquet(file_path)
+    return pd.read_csv(file_path)
+
+
+def validate_release(release):
+    """Memeriksa rilis baru; mengembalikan daftar pesan galat (kosong bila valid).
+
+    Nama provinsi harus dikenali registri (`mapping` lalu `region_map`),
+    pasangan provinsi-tahun tidak boleh ganda, kolom indikator harus numerik,
+    dan kolom wilayah (bila ada) harus sesuai registri.
+    """
+    missing = [col for col in KEY_COLUMNS if col not in release.columns]
+    if missing:
+        return [f"Kolom wajib tidak ada: {', '.join(missing)}"]
+
+    errors = []
+    provinces = normalize_provinces(release["provinsi"].astype(str))
+    unknown = sorted(set(release.loc[~provinces.isin(province_region.keys()), "provinsi"].astype(str)))
+    if unknown:
+        errors.append(f"Provinsi tidak dikenal registri: {', '.join(unknown)} "
+                      "(tambahkan alias di neetify.registry.mapping)")
+
+    tahun = pd.to_numeric(release["tahun"], errors="coerce")
+    if tahun.isna().any() or (tahun % 1 != 0).any():
+        errors.append("Kolom tahun harus berisi bilangan bulat")
+    duplicated = pd.DataFrame({"provinsi": provinces, "tahun": tahun}).duplicated(keep=False)
+    if duplicated.any():
+        pairs = sorted({f"{p} {t:.0f}" for p, t in zip(provinces[duplicated], tahun[duplicated])})
+        errors.append(f"Pasangan provinsi-tahun ganda: {', '.join(pairs[:10])}")
+
+    for col in indicator_columns(release):
+        if pd.to_numeric(release[col], errors="coerce").isna().sum() > release[col].isna().sum():
+            errors.append(f"Kolom {col} berisi nilai bukan angka")
+
+    for col in REGION_COLUMNS:
+        if col in release.columns:
+            given = normalize_regions(release[col].astype(str))
+            expected = provinces.map(province_region)
+            wrong = release.loc[expected.notna() & (given != expected), "provinsi"].astype(str)
+            if len(wrong):
+                errors.append(f"Kolom {col} tidak sesuai registri untuk: {', '.join(sorted(set(wrong)))}")
+    return errors
+
+
+def indicator_columns(frame):
+    return [col for col in frame.columns if col not in KEY_COLUMNS and col not in REGION_COLUMNS]
+
+
+def _plain_numbers(frame):
+    """Angka bulat pada kolom desimal ditulis tanpa `.0`, seperti pada CSV sumber."""
+    frame = frame.copy()
+    for col in frame.columns:
+        values = frame[col]
+        if values.dtype.kind == "f":
+            frame[col] = [("" if np.isnan(v) else str(int(v)) if v.is_integer() else repr(v))
+                          for v in values.astype(float).tolist()]
+    return frame
+
+
+def _line_terminator(file_path):
+    with open(file_path, "rb") as f:
+        return "\r\n" if f.readline().endswith(b"\r\n") else "\n"
+
+
+def merge_release(panel, release):
+    """Menggabungkan `release` ke `panel` (keduanya berformat CSV mentah) per provinsi-tahun.
+
+    Baris baru ditambahkan dengan ejaan provinsi dan kolom `Region` yang
+    sudah dipakai di panel; kolom indikator baru ditambahkan di akhir. Nilai
+    kosong di rilis tidak menghapus nilai yang ada. Mengembalikan panel baru
+    dan ringkasan perubahan.
+    """
+    panel_keys = pd.MultiIndex.from_arrays([normalize_provinces(panel["provinsi"].astype(str)), panel["tahun"].astype(int)])
+    release_keys = pd.MultiIndex.from_arrays([normalize_provinces(release["provinsi"].astype(str)),
+                                              release["tahun"].astype(int)])
+    indicators = indicator_columns(release)
+    new_columns = [col for col in indicators if col not in panel.columns]
+
+    merged = panel.copy()
+    for col in new_columns:
+        merged[col] = np.nan
+
+    existing = release_keys.isin(panel_keys)
+    position = panel_keys.get_indexer(release_keys[existing])
+    changed_cells = []
+    for col in indicators:
+        incoming = pd.to_numeric(release.loc[existing, col], errors="coerce").to_numpy(dtype=float)
+        current = pd.to_numeric(merged[col], errors="coerce").to_numpy(dtype=float)
+        old = current[position]
+        differs = ~np.isnan(incoming) & ~np.isclose(old, incoming, rtol=0, atol=1e-9, equal_nan=False)
+        if differs.any():
+            merged[col] = current
+            merged.loc[merged.index[position[differs]], col] = incoming[differs]
+            for (prov, tahun), before, after in zip(release_keys[existing][differs], old[differs], incoming[differs]):
+                changed_cells.append({"provinsi": prov, "tahun": int(tahun), "kolom": col,
+                                      "lama": None if np.isnan(before) else float(before), "baru": float(after)})
+
+    added = release.loc[~existing].copy()
+    if len(added):
+        spelling = dict(zip(panel_keys.get_level_values(0), panel["provinsi"]))
+        added_keys = normalize_provinces(added["provinsi"].astype(str))
+        added["provinsi"] = added_keys.map(spelling).fillna(added["provinsi"])
+        if "Region" in panel.columns and "Region" not in added.columns:
+            regions = dict(zip(panel_keys.get_level_values(0), panel["Region"]))
+            added["Region"] = added_keys.map(regions).fillna(
+                added_keys.map(province_region).str.title().str.replace("_", " "))
+        added = added.reindex(columns=merged.columns)
+        merged = pd.concat([merged, added], ignore_index=True)
+
+    order = {prov: i for i, prov in enumerate(dict.fromkeys(normalize_provinces(merged["provinsi"].astype(str))))}
+    merged = merged.assign(_urutan=normalize_provinces(merged["provinsi"].astype(str)).map(order))
+    merged = merged.sort_values(["_urutan", "tahun"], kind="stable").drop(columns="_urutan").reset_index(drop=True)
+
+    added_keys = release_keys[~existing]
+    summary = {
+        "rows_added": int((~existing).sum()),
+        "years_added": sorted({int(t) for t in added_keys.get_level_values(1)} - set(panel["tahun"].astype(int))),
+        "provinces_added": sorted(set(added_keys.get_level_values(0)) - set(panel_keys.get_level_values(0))),
+        "columns_added": new_columns,
+        "cells_changed": changed_cells,
+    }
+    return merged, summary
+
+
+def slice_fingerprints(panel, columns=None):
+    """Sidik per irisan (kolom, tahun) dari panel ternormalisasi; tidak bergantung pada urutan baris."""
+    columns = indicator_columns(panel) if columns is None else columns
+    slices = {}
+    for col in columns:
+        if col not in panel.columns:
+            continue
+        # nilai dibandingkan sebagai float agar perubahan dtype (int -> float karena nilai kosong) tidak terhitung
+        values = pd.DataFrame({"provinsi": panel["provinsi"].astype(str),
+                               "nilai": pd.to_numeric(panel[col], errors="coerce").astype(float)})
+        hashes = pd.util.hash_pandas_object(values, index=False)
+        digests = hashes.groupby(panel["tahun"].astype(int)).sum()
+        slices[col] = {str(tahun): f"{digest & 0xFFFFFFFFFFFFFFFF:016x}" for tahun, digest in digests.items()}
+    return slices
+
+
+class Artifact:
+    """Turunan panel beserta irisan yang menjadi dependensinya.
+
+    `columns` `None` berarti semua kolom. `refresh(panel, context)` membangun
+    ulang artefak dan mengembalikan keterangan singkat; artefak mahal diberi
+    `command` untuk dijalankan manual.
+    """
+
+    def __init__(self, name, columns=None, refresh=None, command=None):
+        self.name = name
+        self.columns = columns
+        self.refresh = refresh
+        self.command = command
+
+    def dependency_key(self, slices):
+        columns = sorted(slices) if self.columns is None else [col for col in self.columns if col in slices]
+        parts = []
+        for col in columns:
+            years = sorted(slices[col], key=int)
+            parts += [f"{col}:{year}:{slices[col][year]}" for year in years]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+def _refresh_panel_table(panel, context):
+    tables = ColumnarCache(context["cache_dir"])
+    frame = tables.table("panel", [context["data_path"]], lambda: read_panel(context["data_path"]))
+    return f"{len(frame)} baris -> {tables.path('panel', [context['data_path']])}"
+
+
+def _refresh_statistics(panel, context):
+    from neetify.estimation import StatisticsCache
+
+    cache = StatisticsCache(os.path.join(context["cache_dir"], "gls_statistics.pkl"))
+    changed = cache.update(panel)
+    cache.save()
+    return f"{changed} kelompok provinsi-tahun dihitung ulang"
+
+
+def _refresh_trends(panel, context):
+    from neetify.forecast import TrendForecaster
+
+    forecaster = TrendForecaster(path=os.path.join(context["cache_dir"], "trend_state.pkl"))
+    changed = forecaster.update(panel)
+    forecaster.save()
+    return f"{changed} baris provinsi-tahun diperbarui"
+
+
+MODEL_COLUMNS = ["neet_rate", *all_potential_vars]
+
+ARTIFACTS = [
+    Artifact("tabel_panel", refresh=_refresh_panel_table),
+    Artifact("statistik_gls", MODEL_COLUMNS, refresh=_refresh_statistics),
+    Artifact("tren_proyeksi", MODEL_COLUMNS, refresh=_refresh_trends),
+    Artifact("parameter_model", MODEL_COLUMNS, command="python -m neetify estimate --se"),
+    Artifact("validasi_bootstrap", MODEL_COLUMNS, command="python -m neetify validate"),
+]
+
+
+class ArtifactManifest:
+    """Mencatat kunci dependensi tiap artefak saat terakhir dibangun (`artifacts.json` di folder cache)."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, artifacts=ARTIFACTS):
+        self.path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.cache_dir = cache_dir
+        self.artifacts = artifacts
+        self.built = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.built = json.load(f).get("artifacts", {})
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.path + ".tmp", "w") as f:
+            json.dump({"artifacts": self.built}, f, indent=2, sort_keys=True)
+        os.replace(self.path + ".tmp", self.path)
+
+    def stale(self, slices):
+        return [artifact for artifact in self.artifacts
+                if self.built.get(artifact.name) != artifact.dependency_key(slices)]
+
+    def refresh(self, panel, data_path, slices=None, log=None):
+        """Membangun ulang artefak yang irisan dependensinya berubah; mengembalikan laporan per artefak."""
+        slices = slice_fingerprints(panel) if slices is None else slices
+        context = {"data_path": data_path, "cache_dir": self.cache_dir}
+        report = []
+        for artifact in self.stale(slices):
+            entry = {"artifact": artifact.name}
+            if artifact.refresh is not None:
+                started = time.perf_counter()
+                entry["status"] = "dibangun_ulang"
+                entry["note"] = artifact.refresh(panel, context)
+                entry["seconds"] = round(time.perf_counter() - started, 3)
+            else:
+                entry["status"] = "perlu_dijalankan"
+                entry["note"] = artifact.command
+            if entry["status"] == "dibangun_ulang":
+                self.built[artifact.name] = artifact.dependency_key(slices)
+            if log:
+                log(f"{artifact.name}: {entry['status']} ({entry['note']})")
+            report.append(entry)
+        self.save()
+        return report
+
+    def mark_built(self, name, slices):
+        """Menandai artefak manual (mis. setelah `estimate`/`validate`) sebagai mutakhir."""
+        artifact = next(artifact for artifact in self.artifacts if artifact.name == name)
+        self.built[name] = artifact.dependency_key(slices)
+        self.save()
+
+
+def changed_slices(before, after):
+    """Irisan (kolom -> daftar tahun) yang baru atau berubah antara dua hasil `slice_fingerprints`."""
+    changes = {}
+    for col, years in after.items():
+        old = before.get(col, {})
+        changed = sorted((int(year) for year, digest in years.items() if old.get(year) != digest))
+        if changed:
+            changes[col] = changed
+    return changes
+
+
+def ingest(release_path, data_path, cache_dir=DEFAULT_CACHE_DIR, changelog=DEFAULT_CHANGELOG, dry_run=False,
+           log=None):
+    """Memvalidasi dan menggabungkan rilis BPS ke panel, mencatat perubahan, lalu menyegarkan artefak terdampak.
+
+    Melempar `ValueError` berisi semua galat validasi bila rilis tidak valid.
+    Dengan `dry_run`, panel, changelog dan artefak tidak ditulis.
+    """
+    started = time.perf_counter()
+    release = read_release(release_path)
+    errors = validate_release(release)
+    if errors:
+        raise ValueError("Rilis tidak valid:\n- " + "\n- ".join(errors))
+
+    before = slice_fingerprints(read_panel(data_path))
+    merged, summary = merge_release(pd.read_csv(data_path), release)
+    tmp_path = data_path + ".tmp"
+    _plain_numbers(merged).to_csv(tmp_path, index=False, lineterminator=_line_terminator(data_path))
+    panel = read_panel(tmp_path)
+    after = slice_fingerprints(panel)
+    slices = changed_slices(before, after)
+
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "source": os.path.basename(release_path),
+        "source_sha256": file_fingerprint(release_path, length=64),
+        **summary,
+        "slices_changed": slices,
+    }
+    if dry_run or not slices:
+        os.remove(tmp_path)
+        entry["artifacts"] = []
+        entry["seconds"] = round(time.perf_counter() - started, 3)
+        return entry
+
+    os.replace(tmp_path, data_path)
+    entry["artifacts"] = ArtifactManifest(cache_dir).refresh(panel, data_path, after, log=log)
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    if changelog:
+        os.makedirs(os.path.dirname(changelog) or ".", exist_ok=True)
+        with open(changelog, "a") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return entry
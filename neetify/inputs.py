@@ -0,0 +1,44 @@
+import pandas as pd
+
+from neetify.panel import widen
+
+percentage_vars = ['PPM', 'TPT', 'APS1', 'APS2', 'TIK', 'LAJU']
+
+
+def fallback_default(var):
+    """Nilai awal input simulasi bila data provinsi tidak tersedia."""
+    if var in percentage_vars:
+        return 50.0
+    if var == 'GR':
+        return 0.4
+    if var == 'PDRB':
+        return 100000.0
+    if var in ['KP', 'PL']:
+        return 100.0
+    return 10.0
+
+
+def input_bounds(var, panel):
+    """Batas bawah/atas input yang sama dengan slider dan number input pada simulasi; None berarti tanpa batas."""
+    if var in percentage_vars:
+        return 0.0, 100.0
+    if var == 'GR':
+        return 0.0, 1.0
+    if var == 'PDRB':
+        return 0.0, 1_000_000_000_000.0
+    if var == 'KP':
+        return (widen(panel['KP'].min()), widen(panel['KP'].max())) if not panel.empty else (0.0, 120.0)
+    if var == 'PL':
+        return (widen(panel['PL'].min()), widen(panel['PL'].max())) if not panel.empty else (0.0, 150.0)
+    return None, None
+
+
+def default_inputs(panel, prov, variables):
+    """Nilai input awal simulasi: data provinsi pada tahun terakhir, atau `fallback_default`."""
+    latest = panel[(panel["provinsi"] == prov) & (panel["tahun"] == panel["tahun"].max())]
+    row = latest.iloc[0] if not latest.empty else {}
+    defaults = {}
+    for var in variables:
+        value = row.get(var)
+        defaults[var] = fallback_default(var) if pd.isna(value) else widen(value)
+    return defaults
@@ -0,0 +1,227 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from neetify.registry import assign_regions, normalize_regions
+
+all_potential_vars = ['PPM', 'TPT', 'GR', 'APS1', 'APS2', 'TIK', 'PDRB', 'LAJU', 'KP', 'PL']
+
+significance_threshold = 0.1
+
+var_descriptions = {
+    "PPM": "Persentase Penduduk Miskin",
+    "TPT": "Tingkat Pengangguran Terbuka",
+    "GR": "Gini Ratio (indikator ketimpangan pendapatan)",
+    "APS1": "Angka Partisipasi Sekolah (16-18 tahun)",
+    "APS2": "Angka Partisipasi Sekolah (19-23 tahun)",
+    "TIK": "Keterampilan Teknologi Informasi dan Komputer (misal: persentase pengguna internet)",
+    "PDRB": "Produk Domestik Regional Bruto (per kapita)",
+    "RLS": "Rata-Rata Lama Sekolah",
+    "KP": "Kepadatan Penduduk",
+    "PL": "Proporsi Laki-laki dan Perempuan",
+    "LAJU": "Laju Pertumbuhan Penduduk",
+}
+
+
+def normalize_model_params(model):
+    """Menyeragamkan tabel parameter model: kolom `Region` menjadi `Wilayah` berformat SUMATERA, INDONESIA_TIMUR, dst."""
+    model = model.copy()
+    model.columns = model.columns.str.strip()
+    if "Region" in model.columns:
+        model['Wilayah'] = normalize_regions(model['Region'])
+        model = model.drop(columns=['Region'])
+    elif "Wilayah" in model.columns:
+        model['Wilayah'] = normalize_regions(model['Wilayah'])
+    return model
+
+
+def classify_variables(params, threshold=significance_threshold, variables=all_potential_vars):
+    """Membagi variabel satu baris parameter wilayah seperti pada simulasi.
+
+    Variabel dengan koefisien NaN tidak relevan (tidak ada di model); sisanya
+    dipakai dan dianggap signifikan bila p-value < `threshold`. Variabel yang
+    tidak signifikan tetap ikut dihitung dalam prediksi, tetapi inputnya
+    dikunci pada nilai dasar.
+    """
+    classes = {"used": [], "significant": [], "non_significant": [], "irrelevant": []}
+    for var in variables:
+        if pd.isna(params.get(var)):
+            classes["irrelevant"].append(var)
+            continue
+        classes["used"].append(var)
+        p_value = params.get(f"p_{var}")
+        if pd.notna(p_value) and p_value < threshold:
+            classes["significant"].append(var)
+        else:
+            classes["non_significant"].append(var)
+    return classes
+
+
+def formula_latex(params, variables):
+    """Rumus regresi wilayah dalam LaTeX: NEET = intersep + sum(koefisien x variabel)."""
+    rumus = f"\\text{{NEET}} = {params['intercept']:.2f}"
+    for var in variables:
+        rumus += f" + ({params.get(var):.4f} \\times \\text{{{var}}})"
+    return rumus
+
+
+def covariance_columns(variables=all_potential_vars):
+    """Nama kolom kovarians koefisien `cov_<a>_<b>` (segitiga atas, termasuk intersep) pada file parameter."""
+    terms = ["intercept", *variables]
+    return [(i, j, f"cov_{terms[i]}_{terms[j]}") for i in range(len(terms)) for j in range(i, len(terms))]
+
+
+def stderr_from_pvalues(coef, pvalues, min_pvalue=1e-6):
+    """Galat baku yang diturunkan dari p-value dua sisi (pendekatan normal): se = |b| / z(1 - p/2).
+
+    p-value nol dibatasi `min_pvalue` agar galat baku tidak runtuh ke nol;
+    koefisien tanpa p-value dianggap pasti (se = 0).
+    """
+    p = np.clip(np.asarray(pvalues, dtype=float), min_pvalue, 1.0)
+    z = np.vectorize(lambda q: NormalDist().inv_cdf(1 - q / 2) if np.isfinite(q) else np.nan, otypes=[float])(p)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stderr = np.abs(np.asarray(coef, dtype=float)) / z
+    return np.where(np.isfinite(stderr), stderr, 0.0)
+
+
+class RegionalModel:
+    """Koefisien model regresi per wilayah dalam bentuk matriks (wilayah x variabel).
+
+    Koefisien NaN (variabel tidak dipakai di wilayah tersebut) disimpan sebagai
+    nol struktural sehingga prediksi seluruh baris cukup satu perkalian matriks.
+    `covariance` (wilayah x (1 + variabel) x (1 + variabel), intersep di
+    indeks 0) adalah kovarians koefisien dari `estimate --se`; NaN bila tidak
+    tersedia. `stderr_derived` menandai galat baku yang diturunkan dari p-value.
+    """
+
+    def __init__(self, regions, variables, intercept, coef, pvalues, stderr=None, covariance=None):
+        self.regions = list(regions)
+        self.variables = list(variables)
+        self.intercept = np.asarray(intercept, dtype=float)
+        self.coef = np.asarray(coef, dtype=float)
+        self.pvalues = np.asarray(pvalues, dtype=float)
+        self.used = ~np.isnan(self.coef)
+        self.coef = np.where(self.used, self.coef, 0.0)
+        self.stderr_derived = stderr is None
+        if stderr is None:
+            stderr = stderr_from_pvalues(self.coef, self.pvalues)
+        if covariance is None:
+            covariance = np.full((len(self.regions), len(self.variables) + 1, len(self.variables) + 1), np.nan)
+        self.covariance = np.asarray(covariance, dtype=float)
+        self.stderr = np.where(self.used, np.nan_to_num(np.asarray(stderr, dtype=float), nan=0.0), 0.0)
+        self._region_index = {region: i for i, region in enumerate(self.regions)}
+
+    @classmethod
+    def from_frame(cls, model, variables=all_potential_vars):
+        model = model.dropna(subset=["Wilayah"]).drop_duplicates("Wilayah")
+        pvalues = np.column_stack([
+            model[f"p_{var}"].to_numpy(dtype=float) if f"p_{var}" in model.columns else np.full(len(model), np.nan)
+            for var in variables
+        ])
+        stderr = None
+        if any(f"se_{var}" in model.columns for var in variables):
+            stderr = model.reindex(columns=[f"se_{var}" for var in variables]).to_numpy(dtype=float)
+        covariance = None
+        if any(name in model.columns for _, _, name in covariance_columns(variables)):
+            covariance = np.full((len(model), len(variables) + 1, len(variables) + 1), np.nan)
+            for i, j, name in covariance_columns(variables):
+                if name in model.columns:
+                    covariance[:, i, j] = covariance[:, j, i] = model[name].to_numpy(dtype=float)
+        return cls(
+            regions=model["Wilayah"].tolist(),
+            variables=variables,
+            intercept=model["intercept"].to_numpy(dtype=float),
+            coef=model.reindex(columns=variables).to_numpy(dtype=float),
+            pvalues=pvalues,
+            stderr=stderr,
+            covariance=covariance,
+        )
+
+    @classmethod
+    def from_csv(cls, file_path, variables=all_potential_vars):
+        return cls.from_frame(normalize_model_params(pd.read_csv(file_path)), variables)
+
+    def region_codes(self, regions):
+        """Indeks baris koefisien untuk tiap wilayah; -1 bila wilayah tidak punya model."""
+        return pd.Series(regions).map(self._region_index).fillna(-1).to_numpy(dtype=np.int64)
+
+    def design_matrix(self, data):
+        """Matriks input (baris x variabel); input kosong diperlakukan sebagai 0 seperti pada simulasi."""
+        return np.nan_to_num(data.reindex(columns=self.variables).to_numpy(dtype=float), nan=0.0)
+
+    def predict(self, data, regions=None):
+        """Prediksi NEET untuk setiap baris `data`.
+
+        Wilayah diambil dari `regions`, kolom `Wilayah`, atau diturunkan dari
+        kolom `provinsi` melalui `region_map`. Baris tanpa model wilayah bernilai NaN.
+        """
+        if regions is None:
+            regions = data["Wilayah"] if "Wilayah" in data.columns else assign_regions(data["provinsi"])
+        codes = self.region_codes(regions)
+        scores = self.design_matrix(data) @ self.coef.T
+        known = codes >= 0
+        prediction = np.full(len(codes), np.nan)
+        prediction[known] = scores[known, codes[known]] + self.intercept[codes[known]]
+        return prediction
+
+    def significant(self, threshold=significance_threshold):
+        """Matriks boolean (wilayah x variabel): variabel dipakai dan p-value < `threshold`."""
+        with np.errstate(invalid="ignore"):
+            return self.used & (self.pvalues < threshold)
+
+    def predict_one(self, region, inputs):
+        i = self._region_index[region]
+        x = np.array([inputs.get(var, 0.0) for var in self.variables], dtype=float)
+        return float(self.intercept[i] + self.coef[i] @ np.nan_to_num(x, nan=0.0))
+
+    def score(self, data, target="neet_rate"):
+        """Menambahkan kolom `prediksi` dan `residual` (aktual - prediksi) ke salinan `data`."""
+        scored = data.copy()
+        scored["prediksi"] = self.predict(data)
+        if target in scored.columns:
+            scored["residual"] = scored[target] - scored["prediksi"]
+        return scored
+
+    def has_covariance(self, region):
+        """Apakah kovarians lengkap (intersep dan semua variabel yang dipakai) tersedia untuk `region`."""
+        i = self._region_index[region]
+        terms = np.concatenate(([True], self.used[i]))
+        return bool(np.isfinite(self.covariance[i][np.ix_(terms, terms)]).all())
+
+    def coefficient_draws(self, region, n_draws=10_000, seed=0):
+        """Sampel (n_draws x (1 + variabel)) intersep dan koefisien; kolom 0 adalah intersep.
+
+        Bila kovarians tersedia, sampel diambil dari normal multivariat penuh
+        termasuk intersep. Bila tidak, intersep tetap dan tiap koefisien
+        diambil independen dari N(b, se²); `predict_draws` lalu memusatkan input.
+        """
+        i = self._region_index[region]
+        rng = np.random.default_rng(seed)
+        mean = np.concatenate(([self.intercept[i]], self.coef[i]))
+        if self.has_covariance(region):
+            terms = np.concatenate(([True], self.used[i]))
+            draws = np.tile(mean, (n_draws, 1))
+            draws[:, terms] = rng.multivariate_normal(mean[terms], self.covariance[i][np.ix_(terms, terms)],
+                                                      size=n_draws, method="eigh")
+            return draws
+        noise = rng.standard_normal((n_draws, len(self.variables))) * self.stderr[i]
+        return np.column_stack([np.full(n_draws, self.intercept[i]), self.coef[i] + noise])
+
+    def predict_draws(self, region, draws, inputs, center=None, bounds=(0.0, 100.0)):
+        """Prediksi untuk setiap sampel koefisien sekaligus, dipotong pada `bounds`.
+
+        Tanpa kovarians, korelasi intersep-koefisien tidak diketahui sehingga
+        simpangan koefisien dikalikan input yang dipusatkan pada `center`
+        (rata-rata input wilayah); dengan begitu ketidakpastian tidak membesar
+        hanya karena skala input (mis. PDRB) jauh dari nol.
+        """
+        i = self._region_index[region]
+        x = np.nan_to_num(np.array([inputs.get(var, 0.0) for var in self.variables], dtype=float), nan=0.0)
+        if self.has_covariance(region):
+            prediction = draws @ np.concatenate(([1.0], x))
+        else:
+            offset = np.zeros_like(x) if center is None else np.nan_to_num(
+                np.array([center.get(var, 0.0) for var in self.variables], dtype=float), nan=0.0)
+            prediction = self.predict_one(region, inputs) + (draws[:, 1:] - self.coef[i]) @ (x - offset)
+        return np.clip(prediction, *bounds)
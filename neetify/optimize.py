@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from neetify.inputs import input_bounds
+from neetify.model import significance_threshold
+from neetify.registry import assign_regions
+from neetify.scenarios import baseline_table
+
+
+def input_scales(panel, variables):
+    """Skala tiap variabel (simpangan baku antarprovinsi) agar perubahan beda satuan dapat dibandingkan."""
+    scales = panel.reindex(columns=variables).astype(float).std().to_numpy()
+    return np.where(np.isfinite(scales) & (scales > 0), scales, 1.0)
+
+
+def min_norm_change(coef, gap, lower, upper, scale, iterations=64):
+    """Perubahan Δ berbobot-norma minimum dengan coef·Δ = gap dan lower ≤ Δ ≤ upper, untuk banyak soal sekaligus.
+
+    Semua argumen berbentuk (soal x variabel) kecuali `gap` (soal). Kondisi
+    KKT memberi Δ = clip(λ · coef · scale², lower, upper); λ setiap soal dicari
+    dengan biseksi bersama karena coef·Δ(λ) monoton naik terhadap λ.
+    Variabel yang tidak boleh diubah cukup diberi coef = 0 atau batas 0.
+    Mengembalikan Δ dan penanda apakah `gap` dapat dicapai dalam batas.
+    """
+    direction = coef * scale ** 2
+    movable = direction != 0
+    with np.errstate(invalid="ignore"):
+        reach_high = np.where(movable, np.where(coef > 0, upper, lower) * coef, 0.0).sum(axis=1)
+        reach_low = np.where(movable, np.where(coef > 0, lower, upper) * coef, 0.0).sum(axis=1)
+    reachable = (reach_low <= gap) & (gap <= reach_high)
+
+    # λ sebesar ini menjenuhkan semua variabel berbatas; sisanya dicapai variabel tanpa batas
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.maximum(np.abs(lower), np.abs(upper)) / np.abs(direction)
+    bounded = movable & np.isfinite(ratio)
+    saturate = np.where(bounded, ratio, 0.0).max(axis=1)
+    free = np.where(movable & ~bounded, coef * direction, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        limit = saturate + np.where(free > 0, np.abs(gap) / free, 0.0)
+
+    lo, hi = -limit - 1.0, limit + 1.0
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        delta = np.clip(mid[:, None] * direction, lower, upper)
+        too_low = (coef * delta).sum(axis=1) < gap
+        lo = np.where(too_low, mid, lo)
+        hi = np.where(too_low, hi, mid)
+    delta = np.clip(((lo + hi) / 2)[:, None] * direction, lower, upper)
+    return np.where(movable, delta, 0.0), reachable
+
+
+def target_plan(model, panel, target, baseline=None, threshold=significance_threshold, weights=None):
+    """Perubahan input minimum agar prediksi NEET setiap provinsi turun ke `target`.
+
+    Hanya variabel signifikan di wilayahnya yang diubah, dalam batas slider
+    simulasi (`input_bounds`). `baseline` adalah tabel nilai awal per provinsi
+    (bawaan: tahun terakhir `panel`). `weights` (dict variabel -> bobot biaya)
+    membuat perubahan suatu variabel lebih "mahal". Provinsi yang prediksinya
+    sudah di bawah target tidak diubah.
+    """
+    variables = model.variables
+    if baseline is None:
+        baseline = baseline_table(panel, variables)
+    provinces = baseline.index.to_numpy()
+    x0 = baseline.reindex(columns=variables).to_numpy(dtype=float)
+    regions = assign_regions(pd.Series(provinces, dtype=object)).to_numpy(dtype=object)
+    codes = model.region_codes(regions)
+    known = codes >= 0
+    provinces, regions, codes, x0 = provinces[known], regions[known], codes[known], x0[known]
+
+    coef = np.where(model.significant(threshold)[codes], model.coef[codes], 0.0)
+    prediction = model.intercept[codes] + np.einsum("ij,ij->i", x0, model.coef[codes])
+    gap = np.minimum(target - prediction, 0.0)
+
+    bounds = [input_bounds(var, panel) for var in variables]
+    lower = np.array([-np.inf if b[0] is None else b[0] for b in bounds]) - x0
+    upper = np.array([np.inf if b[1] is None else b[1] for b in bounds]) - x0
+    scale = input_scales(panel, variables)
+    if weights:
+        scale = scale / np.sqrt(np.array([weights.get(var, 1.0) for var in variables], dtype=float))
+    delta, reachable = min_norm_change(coef, gap, np.minimum(lower, 0.0), np.maximum(upper, 0.0),
+                                       np.broadcast_to(scale, x0.shape))
+
+    result = pd.DataFrame({"provinsi": provinces, "Wilayah": regions, "prediksi_awal": prediction})
+    result["prediksi_target"] = prediction + (model.coef[codes] * delta).sum(axis=1)
+    result["tercapai"] = reachable | (gap == 0)
+    result["perubahan_ternormalisasi"] = np.sqrt(((delta / scale) ** 2).sum(axis=1))
+    for j, var in enumerate(variables):
+        result[f"{var}_awal"] = x0[:, j]
+        result[f"{var}_baru"] = x0[:, j] + delta[:, j]
+    return result
+
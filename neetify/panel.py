@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+
+def format_arrow(pct):
+    """Versi vektor dari panah perubahan tooltip peta ("▲ 1.23%", "▼ 0.50%", "-")."""
+    pct = pd.Series(pct, dtype=float)
+    arrow = np.where(pct > 0, "▲ ", "▼ ")
+    text = pd.Series(arrow, index=pct.index) + pct.abs().map("{:.2f}%".format)
+    return text.where(pct.notna(), "-")
+
+
+def widen(values):
+    """float32 ke float64 lewat representasi desimal terpendek, sehingga 13.56 tetap 13.56 (bukan 13.5600004)."""
+    if isinstance(values, pd.Series):
+        return values.astype(str).astype(float) if values.dtype == np.float32 else values.astype(float)
+    return float(str(values)) if isinstance(values, np.float32) else float(values)
+
+
+def _contiguous_slices(values):
+    """Batas (awal, akhir) tiap nilai pada kolom yang sudah terurut."""
+    values = np.asarray(values)
+    bounds = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    stops = np.concatenate((bounds, [len(values)]))
+    return {values[a].item(): (a, b) for a, b in zip(starts, stops) if b > a}
+
+
+def compact_frame(panel, categorical=("provinsi", "Wilayah", "Region"), small_int=("tahun",)):
+    """Salinan panel bertipe hemat memori, terurut per tahun lalu provinsi.
+
+    Kolom teks menjadi kategori, tahun menjadi int16 dan indikator numerik
+    menjadi float32.
+    """
+    frame = panel.sort_values(["tahun", "provinsi"], ignore_index=True)
+    types = {}
+    for col in frame.columns:
+        if col in categorical:
+            types[col] = "category"
+        elif col in small_int:
+            types[col] = "int16"
+        elif pd.api.types.is_numeric_dtype(frame[col]):
+            types[col] = "float32"
+    return frame.astype(types)
+
+
+def read_only_frame(frame):
+    """Salinan `frame` yang array numpy di baliknya (kode untuk kolom kategori) tidak dapat ditulis."""
+    columns = {}
+    for col in frame.columns:
+        values = frame[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy().copy()
+            codes.flags.writeable = False
+            columns[col] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+        else:
+            array = values.to_numpy().copy()
+            array.flags.writeable = False
+            columns[col] = array
+    return pd.DataFrame(columns, index=frame.index, copy=False)
+
+
+class CompactPanel:
+    """Panel baca-saja yang dibagi semua sesi dashboard, beserta indeks per tahun, provinsi dan wilayah.
+
+    Irisan per tahun adalah view posisi tanpa salinan; posisi baris tiap
+    provinsi dan daftar provinsi tiap wilayah dihitung sekali saat dibangun.
+    Array data dibuat tidak dapat ditulis dan `frame` mengembalikan view
+    dangkal, sehingga perubahan di tempat oleh satu sesi gagal atau hanya
+    mengenai view miliknya sendiri.
+    """
+
+    def __init__(self, frame):
+        self._frame = frame = read_only_frame(frame)
+        self._years = _contiguous_slices(frame["tahun"].to_numpy())
+        codes = frame["provinsi"].cat.codes.to_numpy()
+        order = np.argsort(codes, kind="stable")
+        bounds = _contiguous_slices(codes[order])
+        categories = frame["provinsi"].cat.categories
+        self._provinces = {categories[code]: order[a:b] for code, (a, b) in bounds.items() if code >= 0}
+        pairs = frame[["Wilayah", "provinsi"]].drop_duplicates().dropna()
+        self._regions = {
+            region: sorted(group["provinsi"].astype(str))
+            for region, group in pairs.groupby("Wilayah", observed=True)
+        }
+
+    @classmethod
+    def build(cls, panel):
+        return cls(compact_frame(panel))
+
+    @property
+    def frame(self):
+        return self._frame.copy(deep=False)
+
+    @property
+    def empty(self):
+        return self._frame.empty
+
+    @property
+    def years(self):
+        return sorted(self._years)
+
+    @property
+    def provinces(self):
+        return sorted(self._provinces)
+
+    def provinces_in(self, region):
+        return self._regions.get(region, [])
+
+    def year(self, tahun):
+        """Irisan satu tahun (view posisi, tanpa filter boolean)."""
+        if tahun not in self._years:
+            return self._frame.iloc[0:0]
+        start, stop = self._years[tahun]
+        return self._frame.iloc[start:stop]
+
+    def province(self, prov):
+        """Baris satu provinsi untuk semua tahun, terurut menurut tahun."""
+        return self._frame.take(self._provinces.get(prov, np.array([], dtype=np.intp)))
+
+
+class PanelCube:
+    """Panel turunan seluruh unit-tahun yang dihitung sekali secara vektor.
+
+    Untuk setiap indikator tersedia kolom `<ind>_prev` (nilai tahun sebelumnya),
+    `<ind>_diff` (perubahan absolut), `<ind>_pct` (perubahan persen) dan
+    `<ind>_rank` (peringkat dalam tahun yang sama, 1 = tertinggi). Kolom
+    `tooltip` berisi teks hover peta untuk indikator utama.
+    """
+
+    def __init__(self, frame, unit="provinsi", primary="neet_rate"):
+        self.frame = frame
+        self.unit = unit
+        self.primary = primary
+        self._years = _contiguous_slices(frame["tahun"].to_numpy())
+
+    @classmethod
+    def build(cls, panel, indicators=("neet_rate",), unit="provinsi", label="NEET"):
+        primary = indicators[0]
+        current = panel[[unit, "tahun", *indicators]].astype({unit: str, "tahun": int})
+        current = current.assign(**{i: widen(current[i]) for i in indicators})
+        previous = current.assign(tahun=current["tahun"] + 1).rename(columns={i: f"{i}_prev" for i in indicators})
+        cube = current.merge(previous, on=[unit, "tahun"], how="left")
+
+        by_year = cube.groupby("tahun")
+        for ind in indicators:
+            cube[f"{ind}_diff"] = cube[ind] - cube[f"{ind}_prev"]
+            cube[f"{ind}_pct"] = cube[f"{ind}_diff"] / cube[f"{ind}_prev"] * 100
+            cube[f"{ind}_rank"] = by_year[ind].rank(ascending=False, method="min").astype("Int64")
+
+        tooltip = cube[unit] + f"<br>{label}: " + cube[primary].map("{:.2f}".format) + "%"
+        first_year = cube["tahun"] == cube["tahun"].min()
+        cube["tooltip"] = tooltip.where(first_year, tooltip + "<br>Perubahan: " + format_arrow(cube[f"{primary}_pct"]))
+        cube = cube.sort_values(["tahun", unit], ignore_index=True)
+        return cls(cube, unit=unit, primary=primary)
+
+    @property
+    def years(self):
+        return sorted(self._years)
+
+    def year(self, tahun):
+        """Irisan satu tahun (view posisi, tanpa filter boolean)."""
+        if tahun not in self._years:
+            return self.frame.iloc[0:0]
+        start, stop = self._years[tahun]
+        return self.frame.iloc[start:stop]
@@ -0,0 +1,172 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+
+ENV_VAR = "NEETIFY_PROFILE"
+METRICS_ENV_VAR = "NEETIFY_PROFILE_FILE"
+DEFAULT_METRICS_FILE = "data/.cache/profile_metrics.jsonl"
+
+logger = logging.getLogger("neetify.profiling")
+
+_current = contextvars.ContextVar("neetify_profiler", default=None)
+_NULL = nullcontext()
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def profile_mode(value=None, environ=None):
+    """Mode profiling dari `value` (mis. parameter URL `?profile=`) atau `NEETIFY_PROFILE`.
+
+    `1`/`time` berarti waktu saja ("time"); `memory` menambah puncak memori
+    Python lewat `tracemalloc` ("memory", jauh lebih lambat); selain itu "off".
+    """
+    if value is None:
+        value = (os.environ if environ is None else environ).get(ENV_VAR, "")
+    value = str(value).strip().lower()
+    if value in ("memory", "mem", "memori"):
+        return "memory"
+    if value in ("1", "true", "yes", "on", "time", "waktu"):
+        return "time"
+    return "off"
+
+
+def stage(name):
+    """Context manager pengukur tahap `name` pada profiler aktif di konteks ini.
+
+    Tanpa profiler aktif, context manager kosong yang sama dikembalikan
+    sehingga biayanya hanya satu pemanggilan fungsi.
+    """
+    profiler = _current.get()
+    if profiler is None:
+        return _NULL
+    return profiler.stage(name)
+
+
+def current():
+    return _current.get()
+
+
+def activate(profiler):
+    """Menjadikan `profiler` (atau `None`) profiler aktif untuk konteks saat ini."""
+    _current.set(profiler)
+    return profiler
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class Profiler:
+    """Mencatat durasi (dan puncak memori) tahap-tahap dalam satu rerun.
+
+    Tahap boleh bersarang; setiap catatan menyimpan kedalaman dan nama
+    induknya. `finish` menutup rerun, menulis satu baris JSON ke logger
+    `neetify.profiling` dan (bila `metrics_path` diisi) ke file JSONL, lalu
+    mengembalikan catatan tersebut.
+    """
+
+    def __init__(self, mode="time", session=None, kind="rerun", metrics_path=None):
+        self.memory = mode == "memory"
+        self.session = session or uuid.uuid4().hex[:8]
+        self.kind = kind
+        self.metrics_path = metrics_path
+        self.records = []
+        self._stack = [[None, 0]]  # bingkai akar: [nama tahap, puncak memori anak]
+        self._started = time.perf_counter()
+        self._timestamp = time.time()
+        if self.memory:
+            _acquire_tracemalloc()
+            tracemalloc.reset_peak()
+
+    @classmethod
+    def from_env(cls, value=None, environ=None, **kwargs):
+        """Profiler baru bila profiling diaktifkan lewat `value` atau lingkungan, selain itu `None`."""
+        environ = os.environ if environ is None else environ
+        mode = profile_mode(value, environ)
+        if mode == "off":
+            return None
+        kwargs.setdefault("metrics_path", environ.get(METRICS_ENV_VAR, DEFAULT_METRICS_FILE) or None)
+        return cls(mode, **kwargs)
+
+    @contextmanager
+    def stage(self, name):
+        parent = self._stack[-1][0]
+        if self.memory:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            # puncak induk disimpan dulu karena reset_peak berlaku global
+            self._stack[-1][1] = max(self._stack[-1][1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append([name, 0])
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            _, child_peak = self._stack.pop()
+            record = {"stage": name, "parent": parent, "depth": len(self._stack) - 1, "seconds": seconds}
+            if self.memory:
+                peak = max(child_peak, tracemalloc.get_traced_memory()[1])
+                record["peak_kib"] = (peak - start_memory) / 1024
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            self.records.append(record)
+
+    def finish(self, **extra):
+        record = {
+            "timestamp": self._timestamp,
+            "session": self.session,
+            "kind": self.kind,
+            "total_seconds": time.perf_counter() - self._started,
+            "stages": self.records,
+            **extra,
+        }
+        if self.memory:
+            record["peak_kib"] = max(self._stack[0][1], tracemalloc.get_traced_memory()[1]) / 1024
+            _release_tracemalloc()
+            self.memory = False
+        line = json.dumps(record, default=str)
+        logger.info(line)
+        if self.metrics_path:
+            try:
+                os.makedirs(os.path.dirname(self.metrics_path) or ".", exist_ok=True)
+                with open(self.metrics_path, "a") as f:
+                    f.write(line + "\n")
+            except OSError:
+                logger.warning("Tidak dapat menulis metrik profiling ke %s", self.metrics_path)
+        if _current.get() is self:
+            _current.set(None)
+        return record
+
+
+def summarize(runs):
+    """Ringkasan per tahap dari banyak catatan `finish`: jumlah, rata-rata, maksimum dan total detik."""
+    stats = {}
+    for run in runs:
+        for record in run["stages"]:
+            entry = stats.setdefault(record["stage"], {"stage": record["stage"], "count": 0, "total_seconds": 0.0,
+                                                       "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["total_seconds"] += record["seconds"]
+            entry["max_seconds"] = max(entry["max_seconds"], record["seconds"])
+            if "peak_kib" in record:
+                entry["max_peak_kib"] = max(entry.get("max_peak_kib", 0.0), record["peak_kib"])
+    for entry in stats.values():
+        entry["mean_seconds"] = entry["total_seconds"] / entry["count"]
+    return sorted(stats.values(), key=lambda entry: entry["total_seconds"], reverse=True)
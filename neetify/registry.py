@@ -0,0 +1,49 @@
+mapping = {
+    "DI.ACEH": "ACEH",
+    "DAERAHISTIMEWAYOGYAKARTA": "YOGYAKARTA",
+    "DKIJAKARTA": "JAKARTARAYA",
+    "KEPULAUANBANGKABELITUNG": "BANGKABELITUNG"
+}
+
+region_map = {
+    "SUMATERA": [
+        "ACEH", "SUMATERAUTARA", "SUMATERABARAT", "RIAU", "KEPULAUANRIAU",
+        "JAMBI", "SUMATERASELATAN", "BENGKULU", "LAMPUNG", "BANGKABELITUNG"
+    ],
+    "JAWA": [
+        "JAKARTARAYA",
+        "JAWABARAT", "JAWATENGAH", "YOGYAKARTA", "JAWATIMUR", "BANTEN"
+    ],
+    "KALIMANTAN": [
+        "KALIMANTANBARAT", "KALIMANTANTENGAH", "KALIMANTANSELATAN",
+        "KALIMANTANTIMUR", "KALIMANTANUTARA"
+    ],
+    "SULAWESI": [
+        "SULAWESIUTARA", "GORONTALO", "SULAWESITENGAH", "SULAWESIBARAT",
+        "SULAWESISELATAN",
+        "SULAWESITENGGARA"
+    ],
+    "INDONESIA_TIMUR": [
+        "BALI", "NUSATENGGARABARAT", "NUSATENGGARATIMUR",
+        "MALUKU", "MALUKUUTARA", "PAPUA", "PAPUABARAT"
+    ]
+}
+
+province_region = {prov: region for region, prov_list in region_map.items() for prov in prov_list}
+
+
+def assign_region(prov):
+    return province_region.get(prov)
+
+
+def normalize_provinces(series):
+    """Nama provinsi kapital tanpa spasi, lalu disamakan dengan nama GADM lewat `mapping`."""
+    return series.str.upper().str.strip().str.replace(" ", "").replace(mapping)
+
+
+def normalize_regions(series):
+    return series.str.upper().str.strip().str.replace(" ", "_")
+
+
+def assign_regions(provinces):
+    return provinces.map(province_region)
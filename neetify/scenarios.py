@@ -0,0 +1,212 @@
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from neetify.inputs import fallback_default
+from neetify.model import significance_threshold
+from neetify.registry import assign_regions, normalize_provinces, normalize_regions
+
+
+def baseline_table(panel, variables, tahun=None):
+    """Nilai dasar tiap provinsi (baris) untuk `variables` pada tahun `tahun` (bawaan: tahun terakhir).
+
+    Nilai kosong diisi `fallback_default`, sama seperti input awal simulasi.
+    """
+    tahun = panel["tahun"].max() if tahun is None else tahun
+    rows = panel[panel["tahun"] == tahun].drop_duplicates("provinsi").set_index("provinsi")
+    table = rows.reindex(columns=variables).astype(float)
+    return table.fillna({var: fallback_default(var) for var in variables})
+
+
+class ScenarioScorer:
+    """Menilai tabel skenario dengan aturan yang sama seperti bagian simulasi dashboard.
+
+    Setiap baris berisi `provinsi` (dan opsional `Wilayah`) serta nilai
+    variabel skenario. Nilai variabel signifikan wilayahnya dipakai apa
+    adanya; variabel tidak signifikan dikunci pada nilai dasar provinsi, dan
+    variabel yang kosong juga memakai nilai dasar. Hasil berisi kolom
+    `prediksi`, `prediksi_dasar`, `perubahan` dan `variabel_dikunci` (jumlah
+    nilai skenario yang diabaikan karena variabelnya tidak signifikan).
+    """
+
+    def __init__(self, model, panel, threshold=significance_threshold, baseline_year=None):
+        self.model = model
+        self.threshold = threshold
+        self.significant = model.significant(threshold)
+        self.baseline = baseline_table(panel, model.variables, baseline_year)
+        self._fallback = np.array([fallback_default(var) for var in model.variables], dtype=float)
+
+    def _unit_codes(self, chunk):
+        """Kode wilayah dan baris nilai dasar per baris; normalisasi nama cukup sekali per nilai unik."""
+        keys = [col for col in ("provinsi", "Wilayah") if col in chunk.columns]
+        rows, uniques = pd.factorize(pd.MultiIndex.from_frame(chunk[keys]))
+        uniques = pd.DataFrame(list(uniques), columns=keys)
+
+        provinces = normalize_provinces(uniques["provinsi"].astype("string")).astype(object)
+        regions = assign_regions(provinces)
+        if "Wilayah" in uniques.columns:
+            given = normalize_regions(uniques["Wilayah"].astype("string")).astype(object)
+            regions = given.where(given.notna(), regions)
+        base = self.baseline.reindex(provinces).to_numpy(dtype=float)
+        base = np.where(np.isnan(base), self._fallback, base)
+
+        # baris tambahan di akhir untuk provinsi kosong (kode faktor -1)
+        regions = np.append(regions.to_numpy(dtype=object), None)
+        base = np.vstack([base, self._fallback])
+        return regions[rows], self.model.region_codes(regions)[rows], base[rows]
+
+    def score(self, chunk):
+        regions, codes, base = self._unit_codes(chunk)
+        scenario = chunk.reindex(columns=self.model.variables).to_numpy(dtype=float)
+        known = codes >= 0
+        significant = self.significant[codes] & known[:, None]
+        locked = self.model.used[codes] & known[:, None] & ~significant
+        given = ~np.isnan(scenario)
+        values = np.where(significant & given, scenario, base)
+
+        prediction = np.full(len(chunk), np.nan)
+        baseline = np.full(len(chunk), np.nan)
+        coef, intercept = self.model.coef[codes[known]], self.model.intercept[codes[known]]
+        prediction[known] = intercept + np.einsum("ij,ij->i", values[known], coef)
+        baseline[known] = intercept + np.einsum("ij,ij->i", base[known], coef)
+
+        scored = chunk.copy()
+        scored["Wilayah"] = regions
+        scored["prediksi"] = prediction
+        scored["prediksi_dasar"] = baseline
+        scored["perubahan"] = prediction - baseline
+        scored["variabel_dikunci"] = (given & locked).sum(axis=1)
+        return scored
+
+
+    def compare(self, changes, provinces=None, bounds=None):
+        """Menerapkan satu skenario ke banyak provinsi sekaligus.
+
+        `changes` (variabel -> perubahan) ditambahkan ke nilai dasar setiap
+        provinsi (bawaan: semua provinsi pada nilai dasar), lalu dipotong pada
+        `bounds` (variabel -> (bawah, atas), `None` berarti tanpa batas) dan
+        dinilai seperti `score`: perubahan hanya berlaku untuk variabel yang
+        signifikan di wilayah masing-masing provinsi.
+        """
+        base = self.baseline if provinces is None else self.baseline.reindex(provinces)
+        # variabel yang tidak diubah dibiarkan kosong agar `score` memakai nilai dasar
+        table = pd.DataFrame(index=base.index.rename("provinsi"))
+        for var, change in changes.items():
+            values = base[var] + change
+            if bounds and var in bounds:
+                lower, upper = bounds[var]
+                values = values.clip(lower=lower, upper=upper)
+            table[var] = values
+        return self.score(table.reset_index())
+
+
+def read_chunks(file_path, chunk_size):
+    """Membaca CSV atau Parquet per potongan `chunk_size` baris sebagai DataFrame."""
+    import pyarrow as pa
+
+    if file_path.endswith((".parquet", ".parq", ".pq")):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+
+    from pyarrow import csv
+
+    # pembaca CSV pyarrow memecah per blok byte; blok digabung sampai `chunk_size` baris
+    buffered, n_buffered = [], 0
+    for batch in csv.open_csv(file_path, read_options=csv.ReadOptions(block_size=1 << 22)):
+        buffered.append(batch)
+        n_buffered += batch.num_rows
+        if n_buffered >= chunk_size:
+            table = pa.Table.from_batches(buffered)
+            yield table.slice(0, chunk_size).to_pandas()
+            rest = table.slice(chunk_size)
+            buffered, n_buffered = rest.to_batches(), rest.num_rows
+    if n_buffered:
+        yield pa.Table.from_batches(buffered).to_pandas()
+
+
+_worker_scorer = None
+
+
+def _init_worker(scorer):
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def _score_chunk(chunk):
+    return _worker_scorer.score(chunk)
+
+
+class ScoringRun:
+    """Menilai file skenario besar per potongan dan menulis hasilnya ke Parquet.
+
+    Potongan dinilai di process pool; paling banyak `max_pending` potongan
+    berada di memori sekaligus, dan hasil ditulis sesuai urutan masukan
+    sehingga pemakaian memori tetap terbatas berapa pun ukuran file.
+    """
+
+    def __init__(self, out_path, chunk_size=100_000, workers=None, max_pending=None, progress=sys.stderr):
+        self.out_path = out_path
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.progress = progress
+
+    def _log(self, message):
+        if self.progress is not None:
+            print(message, file=self.progress, flush=True)
+
+    def run(self, scorer, input_path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(self.out_path) or ".", exist_ok=True)
+        tmp_path = self.out_path + ".tmp"
+        started = time.perf_counter()
+        rows = 0
+        writer = None
+
+        def write(scored):
+            nonlocal writer, rows
+            table = pa.Table.from_pandas(scored, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            rows += len(scored)
+            elapsed = time.perf_counter() - started
+            self._log(f"{rows:,} baris dinilai ({rows / max(elapsed, 1e-9):,.0f} baris/dtk)")
+
+        chunks = read_chunks(input_path, self.chunk_size)
+        try:
+            if self.workers == 1:
+                for chunk in chunks:
+                    write(scorer.score(chunk))
+            else:
+                with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(scorer,)) as pool:
+                    pending = deque()
+                    for chunk in chunks:
+                        if len(pending) >= self.max_pending:
+                            write(pending.popleft().result())
+                        pending.append(pool.submit(_score_chunk, chunk))
+                    while pending:
+                        write(pending.popleft().result())
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            pq.write_table(pa.table({}), tmp_path)
+        os.replace(tmp_path, self.out_path)
+        elapsed = time.perf_counter() - started
+        self._log(f"Selesai: {rows:,} baris dalam {elapsed:.1f} dtk "
+                  f"({rows / max(elapsed, 1e-9):,.0f} baris/dtk); hasil di {self.out_path}")
+        return rows
@@ -0,0 +1,86 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+
+def sweep_range(value, bounds, spread):
+    """Rentang nilai +/- `spread` (fraksi) di sekitar `value`, dipotong pada batas input."""
+    half = abs(value) * spread if value else spread
+    low, high = value - half, value + half
+    lower, upper = bounds
+    if lower is not None:
+        low = max(low, lower)
+    if upper is not None:
+        high = min(high, upper)
+    return low, high
+
+
+def _tornado_block(model, baseline, variables, ranges):
+    block = np.tile(baseline, (2 * len(variables) + 1, 1))
+    for i, var in enumerate(variables):
+        j = model.variables.index(var)
+        block[2 * i, j], block[2 * i + 1, j] = ranges[var]
+    return block
+
+
+def _surface_block(model, baseline, var_x, var_y, xs, ys):
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    block = np.tile(baseline, (grid_x.size, 1))
+    block[:, model.variables.index(var_x)] = grid_x.ravel()
+    block[:, model.variables.index(var_y)] = grid_y.ravel()
+    return block
+
+
+def _tornado_frame(variables, ranges, predictions):
+    result = pd.DataFrame({
+        "variabel": list(variables),
+        "nilai_rendah": [ranges[var][0] for var in variables],
+        "nilai_tinggi": [ranges[var][1] for var in variables],
+        "prediksi_rendah": predictions[0:-1:2],
+        "prediksi_tinggi": predictions[1:-1:2],
+    })
+    result["rentang_dampak"] = (result["prediksi_tinggi"] - result["prediksi_rendah"]).abs()
+    result.attrs["prediksi_dasar"] = float(predictions[-1])
+    return result.sort_values("rentang_dampak", ignore_index=True)
+
+
+def _predict_block(model, region, block):
+    return model.predict(pd.DataFrame(block, columns=model.variables), regions=[region] * len(block))
+
+
+def tornado(model, region, baseline, variables, ranges):
+    """Prediksi pada batas bawah dan atas setiap variabel (variabel lain tetap), diurutkan menurut rentang dampak."""
+    base = np.array([baseline.get(var, 0.0) for var in model.variables], dtype=float)
+    predictions = _predict_block(model, region, _tornado_block(model, base, variables, ranges))
+    return _tornado_frame(variables, ranges, predictions)
+
+
+def response_surface(model, region, baseline, var_x, var_y, range_x, range_y, steps=41):
+    """Grid prediksi dua variabel; hasil berupa (nilai_x, nilai_y, matriks prediksi [y, x])."""
+    base = np.array([baseline.get(var, 0.0) for var in model.variables], dtype=float)
+    xs, ys = np.linspace(*range_x, steps), np.linspace(*range_y, steps)
+    predictions = _predict_block(model, region, _surface_block(model, base, var_x, var_y, xs, ys))
+    return xs, ys, predictions.reshape(len(ys), len(xs))
+
+
+def sweep_all(model, region, baseline, variables, ranges, steps=41):
+    """Tornado dan permukaan respons untuk semua pasangan variabel dalam satu evaluasi vektor.
+
+    Semua skenario ditumpuk menjadi satu matriks input sehingga pergantian
+    pasangan variabel di UI cukup mengambil hasil yang sudah ada.
+    """
+    base = np.array([baseline.get(var, 0.0) for var in model.variables], dtype=float)
+    pairs = list(combinations(variables, 2))
+    axes = {var: np.linspace(*ranges[var], steps) for var in variables}
+    blocks = [_tornado_block(model, base, variables, ranges)]
+    blocks += [_surface_block(model, base, var_x, var_y, axes[var_x], axes[var_y]) for var_x, var_y in pairs]
+    predictions = _predict_block(model, region, np.vstack(blocks))
+
+    n_tornado = len(blocks[0])
+    surfaces = {}
+    for k, (var_x, var_y) in enumerate(pairs):
+        start = n_tornado + k * steps * steps
+        surfaces[(var_x, var_y)] = (axes[var_x], axes[var_y],
+                                    predictions[start:start + steps * steps].reshape(steps, steps))
+    return _tornado_frame(variables, ranges, predictions[:n_tornado]), surfaces
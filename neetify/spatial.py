@@ -0,0 +1,213 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+LISA_LABELS = {1: "Tinggi-Tinggi", 2: "Rendah-Tinggi", 3: "Rendah-Rendah", 4: "Tinggi-Rendah"}
+LISA_NOT_SIGNIFICANT = "Tidak signifikan"
+
+# dinaikkan bila cara membangun ketetanggaan berubah agar file bobot lama di cache tidak dipakai lagi
+WEIGHTS_VERSION = 2
+
+
+def _feature_vertices(feature, precision):
+    coords = np.concatenate([
+        np.asarray(ring, dtype=float)
+        for polygon in feature["geometry"]["coordinates"]
+        for ring in polygon
+    ])
+    return np.unique(np.round(coords * 10 ** precision).astype(np.int64), axis=0)
+
+
+def _centroid(feature):
+    """Titik tengah tertimbang luas dari ring terluar semua polygon (rumus shoelace)."""
+    total, cx, cy = 0.0, 0.0, 0.0
+    for polygon in feature["geometry"]["coordinates"]:
+        ring = np.asarray(polygon[0], dtype=float)
+        x, y = ring[:, 0], ring[:, 1]
+        cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+        area = cross.sum() / 2
+        if area == 0:
+            continue
+        total += area
+        cx += ((x[:-1] + x[1:]) * cross).sum() / 6
+        cy += ((y[:-1] + y[1:]) * cross).sum() / 6
+    return (cx / total, cy / total) if total else tuple(np.asarray(feature["geometry"]["coordinates"][0][0]).mean(axis=0))
+
+
+class SpatialWeights:
+    """Matriks bobot spasial jarang (CSR) yang distandarkan per baris.
+
+    `indptr`/`indices` mengikuti format CSR: tetangga unit i adalah
+    `indices[indptr[i]:indptr[i + 1]]` dengan bobot `weights` pada posisi
+    yang sama. Fitur tanpa tetangga bersinggungan (pulau) diberi `k`
+    tetangga terdekat menurut jarak titik tengah.
+    """
+
+    def __init__(self, keys, indptr, indices, weights):
+        self.keys = list(keys)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=float)
+        self.cardinality = np.diff(self.indptr)
+        self._rows = np.repeat(np.arange(len(self.keys)), self.cardinality)
+
+    @classmethod
+    def from_geojson(cls, geojson, key_property, precision=3, k=2):
+        """Ketetanggaan dari titik sudut bersama (dibulatkan `precision` desimal) dengan cadangan k tetangga terdekat."""
+        features = geojson["features"]
+        keys = [f["properties"][key_property] for f in features]
+        vertices = [_feature_vertices(f, precision) for f in features]
+
+        owner = np.concatenate([np.full(len(v), i) for i, v in enumerate(vertices)])
+        points = np.concatenate(vertices)
+        _, point_id = np.unique(points, axis=0, return_inverse=True)
+        point_id = point_id.ravel()
+        shared = np.bincount(point_id)[point_id] > 1
+        order = np.lexsort((owner[shared], point_id[shared]))
+        point_id, owner = point_id[shared][order], owner[shared][order]
+        # semua pasangan pemilik titik yang sama, bukan hanya yang berurutan (titik bisa dimiliki 3-4 fitur)
+        pairs = set()
+        for group in np.split(owner, np.flatnonzero(point_id[1:] != point_id[:-1]) + 1):
+            pairs.update((int(a), int(b)) for a in group for b in group if a != b)
+
+        islands = sorted(set(range(len(keys))) - {a for a, _ in pairs})
+        if islands and len(keys) > 1:
+            centroids = np.array([_centroid(f) for f in features])
+            for i in islands:
+                distance = np.hypot(*(centroids - centroids[i]).T)
+                distance[i] = np.inf
+                for j in np.argsort(distance)[:k]:
+                    pairs |= {(i, int(j)), (int(j), i)}
+
+        rows = sorted(pairs)
+        indices = np.array([b for _, b in rows], dtype=np.int64)
+        counts = np.bincount([a for a, _ in rows], minlength=len(keys))
+        indptr = np.concatenate(([0], np.cumsum(counts)))
+        weights = np.repeat(1.0 / np.maximum(counts, 1), counts)
+        return cls(keys, indptr, indices, weights)
+
+    def save(self, file_path):
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path + ".tmp", "wb") as f:
+            np.savez(f, keys=np.array(self.keys), indptr=self.indptr, indices=self.indices, weights=self.weights)
+        os.replace(file_path + ".tmp", file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        with np.load(file_path) as data:
+            return cls(data["keys"].tolist(), data["indptr"], data["indices"], data["weights"])
+
+    def neighbors(self, key):
+        i = self.keys.index(key)
+        return [self.keys[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def lag(self, values):
+        """Lag spasial W @ values untuk vektor (unit) atau matriks (unit x tahun)."""
+        values = np.asarray(values, dtype=float)
+        contributions = self.weights.reshape(-1, *[1] * (values.ndim - 1)) * values[self.indices]
+        lagged = np.zeros_like(values)
+        np.add.at(lagged, self._rows, contributions)
+        return lagged
+
+
+def load_or_build_weights(file_path, geojson, key_property, **kwargs):
+    """Bobot dari file `.npz` bila ada; bila tidak, dibangun dari `geojson` lalu disimpan (bila folder dapat ditulis)."""
+    if file_path and os.path.exists(file_path):
+        return SpatialWeights.load(file_path)
+    weights = SpatialWeights.from_geojson(geojson, key_property, **kwargs)
+    if file_path:
+        try:
+            weights.save(file_path)
+        except OSError:
+            pass
+    return weights
+
+
+def value_matrix(panel, weights, value="neet_rate", unit="provinsi"):
+    """Matriks (unit x tahun) berurutan sesuai `weights.keys`; nilai kosong diisi rata-rata tahunnya."""
+    wide = panel.pivot_table(index=unit, columns="tahun", values=value, observed=True).reindex(weights.keys)
+    wide = wide.apply(lambda column: column.fillna(column.mean()))
+    return wide.columns.to_numpy(dtype=int), wide.to_numpy(dtype=float)
+
+
+def _standardize(x):
+    z = x - x.mean(axis=0)
+    return z, (z * z).sum(axis=0) / len(x)
+
+
+def _pseudo_pvalue(observed, simulated):
+    """p-value permutasi satu sisi ke arah nilai observasi (seperti PySAL)."""
+    larger = (simulated >= observed).sum(axis=0)
+    n = simulated.shape[0]
+    larger = np.where(n - larger < larger, n - larger, larger)
+    return (larger + 1.0) / (n + 1.0)
+
+
+def moran(weights, x, permutations=999, seed=0):
+    """Moran's I global untuk setiap kolom `x` (unit x tahun) beserta uji permutasi dalam satu batch."""
+    z, m2 = _standardize(x)
+    n = len(z)
+    observed = (z * weights.lag(z)).sum(axis=0) / n / m2
+    rng = np.random.default_rng(seed)
+    orders = np.argsort(rng.random((permutations, n)), axis=1)
+    simulated = np.empty((permutations, z.shape[1]))
+    for p, order in enumerate(orders):
+        zp = z[order]
+        simulated[p] = (zp * weights.lag(zp)).sum(axis=0) / n / m2
+    return {
+        "I": observed,
+        "EI": np.full(z.shape[1], -1.0 / (n - 1)),
+        "p_sim": _pseudo_pvalue(observed, simulated),
+        "z_sim": (observed - simulated.mean(axis=0)) / simulated.std(axis=0),
+    }
+
+
+def lisa(weights, x, permutations=999, seed=0):
+    """LISA (Moran lokal) untuk setiap unit dan kolom `x` dengan permutasi bersyarat.
+
+    Untuk unit i, nilai tetangganya diganti `k_i` nilai acak dari unit lain;
+    satu set indeks acak dipakai bersama oleh semua unit dan tahun (seperti
+    `crand` di PySAL) sehingga semua tahun diuji sekaligus.
+    """
+    z, m2 = _standardize(x)
+    n = len(z)
+    lagged = weights.lag(z)
+    local = z * lagged / m2
+
+    rng = np.random.default_rng(seed)
+    k_max = int(weights.cardinality.max())
+    random_ids = np.argsort(rng.random((permutations, n - 1)), axis=1)[:, :k_max]
+    p_values = np.empty_like(local)
+    for i in range(n):
+        k = weights.cardinality[i]
+        ids = random_ids[:, :k]
+        ids = ids + (ids >= i)
+        w = weights.weights[weights.indptr[i]:weights.indptr[i + 1]]
+        simulated = z[i] * np.einsum("k,pkt->pt", w, z[ids]) / m2
+        p_values[i] = _pseudo_pvalue(local[i], simulated)
+
+    quadrant = np.where(z > 0, np.where(lagged > 0, 1, 4), np.where(lagged > 0, 2, 3))
+    return {"z": z, "lag": lagged, "Ii": local, "p_sim": p_values, "quadrant": quadrant}
+
+
+def spatial_summary(panel, weights, value="neet_rate", permutations=999, alpha=0.05, seed=0, unit="provinsi"):
+    """Moran's I per tahun dan klaster LISA per unit-tahun sebagai dua DataFrame."""
+    years, x = value_matrix(panel, weights, value, unit)
+    global_stats = moran(weights, x, permutations, seed)
+    local_stats = lisa(weights, x, permutations, seed)
+
+    moran_frame = pd.DataFrame({"tahun": years, **global_stats})
+    n, t = x.shape
+    labels = np.vectorize(LISA_LABELS.get, otypes=[object])(local_stats["quadrant"])
+    labels = np.where(local_stats["p_sim"] <= alpha, labels, LISA_NOT_SIGNIFICANT)
+    lisa_frame = pd.DataFrame({
+        unit: np.repeat(weights.keys, t),
+        "tahun": np.tile(years, n),
+        value: x.ravel(),
+        f"{value}_lag": weights.lag(x).ravel(),
+        "Ii": local_stats["Ii"].ravel(),
+        "p_sim": local_stats["p_sim"].ravel(),
+        "klaster": labels.ravel(),
+    })
+    return moran_frame, lisa_frame
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from neetify.geometry import GeometryStore, normalize_name
+
+ADM2_TOLERANCES = (0.0, 0.001, 0.005, 0.02)
+ADM2_KEEP_PROPERTIES = ("GID_2", "NAME_2", "TYPE_2", "GID_1", "NAME_1")
+
+
+def zoom_tolerance(bbox, tolerances, pixels=600):
+    """Level penyederhanaan untuk tampilan selebar `bbox`: kira-kira satu piksel layar dalam derajat."""
+    span = max(bbox[2] - bbox[0], bbox[3] - bbox[1])
+    target = span / pixels
+    return max((t for t in tolerances if t <= target), default=0.0)
+
+
+def split_adm2(geojson, out_dir, aliases=None, tolerances=ADM2_TOLERANCES, precision=4,
+               parent_property="NAME_1", key_property="GID_2", keep_properties=ADM2_KEEP_PROPERTIES):
+    """Memecah GeoJSON kabupaten/kota nasional menjadi satu file per provinsi beserta `index.json`.
+
+    Nama file dan kunci indeks memakai nama provinsi ternormalisasi (sama
+    dengan kunci peta provinsi), sedangkan fitur di dalamnya memakai
+    `key_property` (bawaan GID_2) apa adanya sebagai kunci penggabungan data.
+    """
+    by_province = {}
+    for feature in geojson["features"]:
+        properties = feature["properties"]
+        if parent_property not in properties or key_property not in properties:
+            continue
+        by_province.setdefault(normalize_name(properties[parent_property], aliases), []).append(feature)
+
+    os.makedirs(out_dir, exist_ok=True)
+    tiles = {}
+    for province, features in sorted(by_province.items()):
+        store = GeometryStore.from_geojson(
+            {"type": "FeatureCollection", "features": features},
+            tolerances=tolerances, precision=precision, source_property=key_property,
+            key_property=key_property, keep_properties=keep_properties, normalize=False,
+        )
+        file_name = f"adm2-{province}.json"
+        with open(os.path.join(out_dir, file_name), "w", encoding="utf-8") as f:
+            json.dump(store.to_dict(), f, separators=(",", ":"))
+        tiles[province] = {"file": file_name, "bbox": store.bbox(), "features": len(features)}
+
+    index = {"key": key_property, "tolerances": sorted(float(t) for t in set(tolerances) | {0.0}), "tiles": tiles}
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+class TileStore:
+    """Geometri kabupaten/kota per provinsi yang dimuat saat dibutuhkan.
+
+    `index.json` (hasil `split_adm2`) berisi kotak batas tiap provinsi sebagai
+    indeks spasial; file geometri provinsi baru dibaca ketika diminta dan
+    paling banyak `max_tiles` provinsi disimpan di memori (LRU). Objek ini
+    dipakai bersama antar sesi, jadi akses cache dilindungi lock.
+    """
+
+    def __init__(self, directory, max_tiles=8):
+        self.directory = directory
+        self.max_tiles = max_tiles
+        with open(os.path.join(directory, "index.json"), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        self.key_property = index["key"]
+        self.tolerances = tuple(index["tolerances"])
+        self._files = {prov: tile["file"] for prov, tile in index["tiles"].items()}
+        self.provinces = sorted(self._files)
+        self._bboxes = np.array([index["tiles"][prov]["bbox"] for prov in self.provinces], dtype=float).reshape(-1, 4)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def featureidkey(self):
+        return f"properties.{self.key_property}"
+
+    def __contains__(self, province):
+        return province in self._files
+
+    def bbox(self, province):
+        return tuple(self._bboxes[self.provinces.index(province)].tolist())
+
+    def query(self, bbox):
+        """Provinsi yang kotak batasnya beririsan dengan `bbox` (min_lon, min_lat, max_lon, max_lat)."""
+        b = self._bboxes
+        hit = (b[:, 0] <= bbox[2]) & (b[:, 2] >= bbox[0]) & (b[:, 1] <= bbox[3]) & (b[:, 3] >= bbox[1])
+        return [self.provinces[i] for i in np.flatnonzero(hit)]
+
+    def at(self, lon, lat):
+        """Provinsi kandidat untuk sebuah titik (berdasarkan kotak batas)."""
+        return self.query((lon, lat, lon, lat))
+
+    def tile(self, province):
+        """GeometryStore kabupaten/kota satu provinsi, dimuat dari disk bila belum ada di cache."""
+        with self._lock:
+            if province in self._cache:
+                self._cache.move_to_end(province)
+                return self._cache[province]
+        with open(os.path.join(self.directory, self._files[province]), "r", encoding="utf-8") as f:
+            store = GeometryStore.from_dict(json.load(f))
+        with self._lock:
+            self._cache[province] = store
+            while len(self._cache) > self.max_tiles:
+                self._cache.popitem(last=False)
+        return store
+
+    def geojson(self, province, pixels=600):
+        """GeoJSON kabupaten/kota satu provinsi dengan penyederhanaan sesuai luas tampilannya."""
+        return self.tile(province).geojson(zoom_tolerance(self.bbox(province), self.tolerances, pixels))
@@ -0,0 +1,179 @@
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from neetify.estimation import StatisticsCache, _rss, fgls_batch
+from neetify.registry import assign_regions
+
+
+def group_arrays(cache, provinces, variables):
+    """Statistik cukup per (provinsi, tahun) sebagai array padat (provinsi x tahun x ...)."""
+    cols = [0] + [1 + cache.variables.index(var) for var in variables]
+    provinces = sorted(provinces)
+    years = sorted({tahun for prov, tahun in cache.groups if prov in provinces})
+    p_index = {prov: i for i, prov in enumerate(provinces)}
+    t_index = {tahun: j for j, tahun in enumerate(years)}
+    k = len(cols)
+    grams = np.zeros((len(provinces), len(years), k, k))
+    crosses = np.zeros((len(provinces), len(years), k))
+    yys = np.zeros((len(provinces), len(years)))
+    counts = np.zeros((len(provinces), len(years)))
+    for (prov, tahun), (_, gram, cross, yy, n) in cache.groups.items():
+        if prov in p_index:
+            i, j = p_index[prov], t_index[tahun]
+            grams[i, j] = gram[np.ix_(cols, cols)]
+            crosses[i, j] = cross[cols]
+            yys[i, j] = yy
+            counts[i, j] = n
+    return provinces, years, (grams, crosses, yys, counts)
+
+
+def draw_seeds(seed, start, n_draws):
+    """Seed anak untuk sampel ke-`start` .. `start + n_draws - 1` dari `seed` (int atau `SeedSequence`)."""
+    seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.SeedSequence(seed.entropy, spawn_key=(*seed.spawn_key, d)) for d in range(start, start + n_draws)]
+
+
+def bootstrap_chunk(region, variables, arrays, n_draws, seed, iterations=1, start=0):
+    """Bootstrap klaster provinsi: provinsi diambil ulang dengan pengembalian, lalu FGLS untuk semua sampel sekaligus.
+
+    Sampel ke-d memakai seed anak ke-d dari `seed` (lihat `draw_seeds`), sehingga
+    potongan `start`..`start + n_draws` menghasilkan sampel yang sama berapa pun
+    ukuran potongannya.
+    """
+    grams, crosses, yys, counts = (a.sum(axis=1) for a in arrays)
+    n_prov = len(counts)
+    picks = np.array([np.random.default_rng(s).integers(0, n_prov, size=n_prov)
+                      for s in draw_seeds(seed, start, n_draws)]).reshape(n_draws, n_prov)
+    multiplicity = np.zeros((n_draws, n_prov))
+    np.add.at(multiplicity, (np.arange(n_draws)[:, None], picks), 1.0)
+    m = multiplicity
+    beta, _ = fgls_batch(m[:, :, None, None] * grams, m[:, :, None] * crosses, m * yys, m * counts, iterations)
+    return region, variables, beta
+
+
+def cross_validate(region, variables, arrays, iterations=1):
+    """Galat prediksi leave-one-province-out (LOPO) dan leave-one-year-out (LOYO) dari statistik cukup.
+
+    Jumlah kuadrat galat pada fold yang ditahan dihitung tepat dari X'X, X'y dan
+    y'y fold tersebut, tanpa membentuk ulang matriks desain.
+    """
+    grams, crosses, yys, counts = arrays
+    n_prov, n_year = counts.shape
+    rows = []
+    for scheme, n_folds in (("LOPO", n_prov), ("LOYO", n_year)):
+        keep = np.ones((n_folds, n_prov, n_year))
+        for fold in range(n_folds):
+            if scheme == "LOPO":
+                keep[fold, fold, :] = 0
+            else:
+                keep[fold, :, fold] = 0
+        hold = 1 - keep
+        beta, _ = fgls_batch(
+            np.einsum("fpt,ptij->fpij", keep, grams),
+            np.einsum("fpt,pti->fpi", keep, crosses),
+            np.einsum("fpt,pt->fp", keep, yys),
+            np.einsum("fpt,pt->fp", keep, counts),
+            iterations,
+        )
+        sse = _rss(
+            beta,
+            np.einsum("fpt,ptij->fpij", hold, grams),
+            np.einsum("fpt,pti->fpi", hold, crosses),
+            np.einsum("fpt,pt->fp", hold, yys),
+        ).sum(axis=1)
+        n_hold = np.einsum("fpt,pt->f", hold, counts)
+        for fold in range(n_folds):
+            rows.append({"Wilayah": region, "skema": scheme, "fold": fold,
+                         "n": int(n_hold[fold]), "rmse": float(np.sqrt(max(sse[fold], 0.0) / n_hold[fold]))})
+    return rows
+
+
+class ValidationRun:
+    """Menjalankan bootstrap dan validasi silang semua wilayah di process pool.
+
+    Hasil bootstrap ditulis ke `bootstrap_draws.csv` segera setelah tiap
+    potongan selesai; ringkasan akhir ada di `bootstrap_summary.csv` dan
+    `cv_summary.csv`. Setiap wilayah memakai anak `SeedSequence` sendiri dan
+    setiap sampel seed turunannya, sehingga hasil sama berapa pun jumlah
+    proses maupun ukuran potongan.
+    """
+
+    def __init__(self, out_dir, n_draws=2000, chunk_size=250, seed=0, workers=None, iterations=1, progress=sys.stderr):
+        self.out_dir = out_dir
+        self.n_draws = n_draws
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.workers = workers
+        self.iterations = iterations
+        self.progress = progress
+
+    def _log(self, message):
+        if self.progress is not None:
+            print(message, file=self.progress, flush=True)
+
+    def run(self, panel, spec, cache=None):
+        cache = cache or StatisticsCache()
+        panel = panel.assign(Wilayah=assign_regions(panel["provinsi"]))
+        cache.update(panel)
+        os.makedirs(self.out_dir, exist_ok=True)
+
+        region_arrays = {}
+        for region, variables in spec.items():
+            provinces = set(panel.loc[panel["Wilayah"] == region, "provinsi"])
+            region_arrays[region] = group_arrays(cache, provinces, variables)[2]
+
+        chunks = []
+        for region, variables in spec.items():
+            starts = range(0, self.n_draws, self.chunk_size)
+            chunks += [(region, variables, start, min(self.chunk_size, self.n_draws - start)) for start in starts]
+        seeds = dict(zip(spec, np.random.SeedSequence(self.seed).spawn(len(spec))))
+
+        draws_path = os.path.join(self.out_dir, "bootstrap_draws.csv")
+        started = time.perf_counter()
+        cv_rows = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, open(draws_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Wilayah", "draw", "variabel", "koefisien"])
+            cv_futures = [pool.submit(cross_validate, region, variables, region_arrays[region], self.iterations)
+                          for region, variables in spec.items()]
+            futures = {
+                pool.submit(bootstrap_chunk, region, variables, region_arrays[region], size, seeds[region],
+                            self.iterations, start): start
+                for region, variables, start, size in chunks
+            }
+            done = 0
+            for future in as_completed(futures):
+                region, variables, beta = future.result()
+                start = futures[future]
+                names = ["intercept", *variables]
+                for d, row in enumerate(beta):
+                    writer.writerows([region, start + d, name, value] for name, value in zip(names, row))
+                f.flush()
+                done += len(beta)
+                self._log(f"bootstrap {done}/{self.n_draws * len(spec)} sampel "
+                          f"({time.perf_counter() - started:.1f} dtk)")
+            for future in cv_futures:
+                cv_rows += future.result()
+
+        draws = pd.read_csv(draws_path)
+        summary = (
+            draws.groupby(["Wilayah", "variabel"])["koefisien"]
+            .agg(boot_mean="mean", boot_se="std",
+                 ci_low=lambda s: s.quantile(0.025), ci_high=lambda s: s.quantile(0.975))
+            .reset_index()
+        )
+        summary.to_csv(os.path.join(self.out_dir, "bootstrap_summary.csv"), index=False)
+        cv = pd.DataFrame(cv_rows)
+        cv.to_csv(os.path.join(self.out_dir, "cv_folds.csv"), index=False)
+        cv_summary = cv.assign(sse=cv["rmse"] ** 2 * cv["n"]).groupby(["Wilayah", "skema"], as_index=False)[["sse", "n"]].sum()
+        cv_summary["rmse"] = np.sqrt(cv_summary["sse"] / cv_summary["n"])
+        cv_summary = cv_summary.drop(columns="sse")
+        cv_summary.to_csv(os.path.join(self.out_dir, "cv_summary.csv"), index=False)
+        self._log(f"Selesai dalam {time.perf_counter() - started:.1f} dtk; hasil di {self.out_dir}")
+        return summary, cv_summary
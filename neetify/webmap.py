@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import shutil
+
+from neetify.data import file_fingerprint
+
+STATIC_URL = "app/static"
+
+_CLIENT_MAP_TEMPLATE = """
+<div id="neet-map" style="width:100%;height:__HEIGHT__px;"></div>
+<script src="__PLOTLY_URL__"></script>
+<script>
+(function () {
+  var spec = __SPEC__;
+  var storageKey = "neetify-geometry-" + spec.geometry_digest;
+
+  function decode(payload) {
+    var sx = payload.transform.scale[0], sy = payload.transform.scale[1];
+    var tx = payload.transform.translate[0], ty = payload.transform.translate[1];
+    var features = payload.features.map(function (f) {
+      var coordinates = f.polygons.map(function (polygon) {
+        return polygon.map(function (flat) {
+          var ring = [], x = 0, y = 0;
+          for (var i = 0; i < flat.length; i += 2) {
+            x += flat[i]; y += flat[i + 1];
+            ring.push([x * sx + tx, y * sy + ty]);
+          }
+          return ring;
+        });
+      });
+      return {type: "Feature", id: f.id, properties: f.properties,
+              geometry: {type: "MultiPolygon", coordinates: coordinates}};
+    });
+    return {type: "FeatureCollection", features: features};
+  }
+
+  function loadGeometry() {
+    var host = window;
+    try { if (window.parent.document) { host = window.parent; } } catch (e) {}
+    var cache = host.__neetifyGeometry || (host.__neetifyGeometry = {});
+    if (cache[storageKey]) {
+      return Promise.resolve(cache[storageKey]);
+    }
+    var stored = null;
+    try { stored = window.localStorage.getItem(storageKey); } catch (e) {}
+    var raw = stored ? Promise.resolve(JSON.parse(stored)) : fetch(spec.geometry_url).then(function (r) { return r.json(); }).then(function (payload) {
+      try { window.localStorage.setItem(storageKey, JSON.stringify(payload)); } catch (e) {}
+      return payload;
+    });
+    return raw.then(function (payload) {
+      cache[storageKey] = decode(payload);
+      return cache[storageKey];
+    });
+  }
+
+  loadGeometry().then(function (geojson) {
+    var trace = {
+      type: "choropleth",
+      geojson: geojson,
+      featureidkey: spec.featureidkey,
+      locations: spec.locations,
+      z: spec.values,
+      customdata: spec.tooltips,
+      hovertemplate: "%{customdata}<extra></extra>",
+      colorscale: spec.colorscale,
+      zmin: spec.range[0],
+      zmax: spec.range[1],
+      colorbar: {title: {text: spec.colorbar_title}}
+    };
+    var layout = {
+      title: {text: spec.title},
+      geo: {fitbounds: "locations", visible: false, showland: true, landcolor: "white"},
+      paper_bgcolor: "white",
+      margin: {l: 0, r: 0, t: 40, b: 0},
+      height: spec.height
+    };
+    Plotly.react("neet-map", [trace], layout, {responsive: true, displaylogo: false});
+  });
+})();
+</script>
+"""
+
+
+def publish_plotly_js(static_dir):
+    """Menyalin plotly.min.js ke folder static aplikasi dengan nama ber-hash konten."""
+    import plotly
+
+    source = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+    name = f"plotly-{file_fingerprint(source)}.min.js"
+    target = os.path.join(static_dir, name)
+    if not os.path.exists(target):
+        os.makedirs(static_dir, exist_ok=True)
+        shutil.copyfile(source, target + ".tmp")
+        os.replace(target + ".tmp", target)
+    return f"{STATIC_URL}/{name}"
+
+
+def publish_geometry(store, static_dir, tolerance=0.0, bits=16):
+    """Menulis payload geometri terkuantisasi ke folder static; nama file memuat hash isinya."""
+    body = json.dumps(store.quantized_payload(tolerance, bits=bits), separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    name = f"geometry-{digest}.json"
+    target = os.path.join(static_dir, name)
+    if not os.path.exists(target):
+        os.makedirs(static_dir, exist_ok=True)
+        with open(target + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(target + ".tmp", target)
+    return {"url": f"{STATIC_URL}/{name}", "digest": digest, "bytes": len(body)}
+
+
+def client_choropleth_html(geometry, plotly_url, featureidkey, locations, values, tooltips,
+                           value_range, title, colors, colorbar_title="NEET Rate", height=600):
+    """HTML peta yang hanya membawa nilai per wilayah; geometri diambil dan di-cache oleh browser."""
+    spec = {
+        "geometry_url": geometry["url"],
+        "geometry_digest": geometry["digest"],
+        "featureidkey": featureidkey,
+        "locations": list(locations),
+        "values": [float(v) for v in values],
+        "tooltips": list(tooltips),
+        "range": [float(value_range[0]), float(value_range[1])],
+        "title": title,
+        "colorbar_title": colorbar_title,
+        "colorscale": [[i / (len(colors) - 1), c] for i, c in enumerate(colors)],
+        "height": height,
+    }
+    return (
+        _CLIENT_MAP_TEMPLATE
+        .replace("__HEIGHT__", str(height))
+        .replace("__PLOTLY_URL__", plotly_url)
+        .replace("__SPEC__", json.dumps(spec).replace("</", "<\\/"))
+    )
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def panel_path():
+    return os.path.join(ROOT, "data", "neet_data_34prov.csv")
+
+
+@pytest.fixture(scope="session")
+def regional_model():
+    from neetify.data import load_model_params
+    from neetify.model import RegionalModel
+
+    return RegionalModel.from_frame(load_model_params(os.path.join(ROOT, "data", "model_params_region.csv")))
@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+import pytest
+
+from neetify.data import ColumnarCache
+
+
+def write_source(path, values):
+    pd.DataFrame({"provinsi": ["BALI", "ACEH", "RIAU"], "nilai": values}).to_csv(path, index=False)
+
+
+def test_table_is_built_once_and_served_from_the_mapped_file(tmp_path):
+    source = tmp_path / "sumber.csv"
+    write_source(source, [1.5, 2.5, 3.5])
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    calls = []
+
+    def build():
+        calls.append(1)
+        return pd.read_csv(source)
+
+    first = cache.table("uji", [str(source)], build)
+    second = cache.table("uji", [str(source)], build)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    values = second["nilai"].to_numpy()
+    assert not values.flags.writeable
+    assert not values.flags.owndata
+    with pytest.raises(ValueError):
+        values[0] = 0.0
+
+
+def test_table_is_rebuilt_when_source_changes_and_old_version_removed(tmp_path):
+    source = tmp_path / "sumber.csv"
+    write_source(source, [1.5, 2.5, 3.5])
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    cache.table("uji", [str(source)], lambda: pd.read_csv(source))
+
+    write_source(source, [1.5, 2.5, 9.25])
+    table = cache.table("uji", [str(source)], lambda: pd.read_csv(source))
+    assert table["nilai"].tolist() == [1.5, 2.5, 9.25]
+    assert len([name for name in os.listdir(tmp_path / "cache") if name.endswith(".arrow")]) == 1
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neetify.cli import main
+from neetify.estimation import StatisticsCache, fgls
+
+VARIABLES = ["x1", "x2"]
+
+
+def synthetic_panel(seed=0, provinces=6, years=8):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for p in range(provinces):
+        noise = 0.2 + p  # varians galat berbeda per provinsi
+        for tahun in range(2016, 2016 + years):
+            x1, x2 = rng.normal(size=2)
+            rows.append({"provinsi": f"P{p}", "tahun": tahun, "x1": x1, "x2": x2,
+                         "neet_rate": 20 + 1.5 * x1 - 0.7 * x2 + rng.normal(scale=noise)})
+    return pd.DataFrame(rows)
+
+
+def direct_fgls(panel):
+    """OLS gabungan, varians per provinsi dari residual, lalu kuadrat terkecil berbobot biasa."""
+    x = np.column_stack([np.ones(len(panel)), panel[VARIABLES].to_numpy()])
+    y = panel["neet_rate"].to_numpy()
+    beta_ols = np.linalg.lstsq(x, y, rcond=None)[0]
+    resid = pd.Series(y - x @ beta_ols, index=panel.index)
+    variance = (resid ** 2).groupby(panel["provinsi"]).mean()
+    w = 1.0 / panel["provinsi"].map(variance).to_numpy()
+
+    root = np.sqrt(w)
+    beta = np.linalg.lstsq(x * root[:, None], y * root, rcond=None)[0]
+    scale = (w * (y - x @ beta) ** 2).sum() / (len(y) - x.shape[1])
+    covariance = scale * np.linalg.inv(x.T @ (x * w[:, None]))
+    return beta, covariance
+
+
+def statistics_for(panel):
+    cache = StatisticsCache(variables=VARIABLES)
+    cache.update(panel)
+    return cache, cache.province_statistics(set(panel["provinsi"]), VARIABLES)
+
+
+def test_fgls_from_sufficient_statistics_matches_direct_weighted_least_squares():
+    panel = synthetic_panel()
+    _, stats = statistics_for(panel)
+    fit = fgls(stats)
+    beta, covariance = direct_fgls(panel)
+
+    np.testing.assert_allclose(fit["beta"], beta, rtol=1e-9)
+    np.testing.assert_allclose(fit["covariance"], covariance, rtol=1e-9)
+    np.testing.assert_allclose(fit["stderr"], np.sqrt(np.diag(covariance)), rtol=1e-9)
+    assert fit["df_resid"] == len(panel) - 3
+    assert np.all((fit["pvalues"] >= 0) & (fit["pvalues"] <= 1))
+
+
+def test_statistics_cache_recomputes_only_changed_groups():
+    panel = synthetic_panel()
+    cache, _ = statistics_for(panel)
+
+    corrected = panel.copy()
+    corrected.loc[5, "x1"] += 1.0
+    assert cache.update(corrected) == 1
+    assert cache.update(corrected) == 0
+
+    _, fresh = statistics_for(corrected)
+    incremental = cache.province_statistics(set(corrected["provinsi"]), VARIABLES)
+    assert fgls(incremental)["beta"] == pytest.approx(fgls(fresh)["beta"], rel=1e-12)
+
+
+def test_estimate_refuses_to_overwrite_published_parameters_without_flag(tmp_path, panel_path):
+    params = tmp_path / "model_params_region.csv"
+    params.write_bytes(open(os.path.join(os.path.dirname(panel_path), "model_params_region.csv"), "rb").read())
+    published = params.read_bytes()
+
+    args = ["estimate", "--data", panel_path, "--params", str(params), "--cache-dir", str(tmp_path / "cache"), "--workers", "1"]
+    assert main(args + ["--out", str(params)]) == 1
+    assert params.read_bytes() == published
+
+    assert main(args + ["--out", str(tmp_path / "estimated.csv")]) is None
+    assert (tmp_path / "estimated.csv").exists()
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neetify.forecast import TrendForecaster
+
+
+def synthetic_panel(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = [{"provinsi": prov, "tahun": tahun, "neet_rate": 20 + slope * (tahun - 2016) + rng.normal()}
+            for prov, slope in (("BALI", -0.5), ("ACEH", 0.3), ("RIAU", 0.0))
+            for tahun in range(2016, 2024)]
+    return pd.DataFrame(rows)
+
+
+def assert_matches_polyfit(forecaster, panel):
+    fit = forecaster.fit()
+    for i, prov in enumerate(fit["provinces"]):
+        rows = panel[(panel["provinsi"] == prov) & panel["neet_rate"].notna()]
+        slope, intercept = np.polyfit(rows["tahun"] - forecaster.origin, rows["neet_rate"], 1)
+        assert fit["slope"][i, 0] == pytest.approx(slope, rel=1e-9, abs=1e-12)
+        assert fit["intercept"][i, 0] == pytest.approx(intercept, rel=1e-9)
+
+
+def test_incremental_updates_match_polyfit():
+    panel = synthetic_panel()
+    forecaster = TrendForecaster(indicators=("neet_rate",))
+    assert forecaster.update(panel.iloc[:-6]) == len(panel) - 6
+    assert_matches_polyfit(forecaster, panel.iloc[:-6])
+
+    # tahun baru, satu koreksi dan satu nilai hilang
+    panel.loc[3, "neet_rate"] += 2.0
+    panel.loc[10, "neet_rate"] = np.nan
+    assert forecaster.update(panel) == 6 + 2
+    assert forecaster.update(panel) == 0
+    assert_matches_polyfit(forecaster, panel)
+
+    fresh = TrendForecaster(indicators=("neet_rate",))
+    fresh.update(panel)
+    np.testing.assert_allclose(forecaster.fit()["sigma"], fresh.fit()["sigma"], rtol=1e-9)
+
+
+def test_removed_rows_are_subtracted_and_projection_extends_the_trend():
+    panel = synthetic_panel()
+    forecaster = TrendForecaster(indicators=("neet_rate",))
+    forecaster.update(panel)
+    trimmed = panel[panel["tahun"] < 2023]
+    assert forecaster.update(trimmed) == 3
+    assert forecaster.last_year == 2022
+    assert_matches_polyfit(forecaster, trimmed)
+
+    projection = forecaster.project([2023, 2024]).set_index(["provinsi", "tahun"])
+    fit = forecaster.fit()
+    i = fit["provinces"].index("BALI")
+    expected = fit["intercept"][i, 0] + fit["slope"][i, 0] * (2024 - forecaster.origin)
+    assert projection.loc[("BALI", 2024), "neet_rate"] == pytest.approx(expected)
+    assert (projection["neet_rate_low"] <= projection["neet_rate"]).all()
+    assert (projection["neet_rate"] <= projection["neet_rate_high"]).all()
@@ -0,0 +1,114 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from neetify.geometry import GeometryStore
+from neetify.registry import mapping
+from neetify.webmap import publish_geometry
+
+
+@pytest.fixture(scope="module")
+def store(panel_path):
+    path = os.path.join(os.path.dirname(panel_path), "gadm41_IDN_1.json")
+    return GeometryStore.from_file(path, aliases=mapping, precision=3)
+
+
+def rings(geojson):
+    for feature in geojson["features"]:
+        for polygon in feature["geometry"]["coordinates"]:
+            for ring in polygon:
+                yield feature["properties"]["Propinsi"], np.asarray(ring, dtype=float)
+
+
+def signed_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]))
+
+
+def exterior_areas(geojson):
+    """Luas ring luar setiap polygon per fitur."""
+    return {
+        feature["properties"]["Propinsi"]: [abs(signed_area(np.asarray(polygon[0], dtype=float)))
+                                            for polygon in feature["geometry"]["coordinates"]]
+        for feature in geojson["features"]
+    }
+
+
+def square(key, x, y, size=1.0):
+    ring = [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+    return {"type": "Feature", "properties": {"NAME_1": key}, "geometry": {"type": "MultiPolygon", "coordinates": [[ring]]}}
+
+
+def test_every_level_keeps_every_feature_with_closed_nonempty_rings(store):
+    original = exterior_areas(store.geojson(0.0))
+    for tolerance in store.tolerances:
+        level = store.geojson(tolerance)
+        assert [f["properties"]["Propinsi"] for f in level["features"]] == store.keys
+        assert all(f["geometry"]["coordinates"] for f in level["features"])
+        for key, ring in rings(level):
+            assert len(ring) >= 4, (tolerance, key)
+            assert np.array_equal(ring[0], ring[-1]), (tolerance, key)
+            assert abs(signed_area(ring)) > 0, (tolerance, key)
+        # Pulau kecil boleh hilang, tetapi daratan utama tiap provinsi dan luas total tetap terjaga.
+        areas = exterior_areas(level)
+        for key in store.keys:
+            assert max(areas[key]) == pytest.approx(max(original[key]), rel=0.15), (tolerance, key)
+        total = sum(map(sum, areas.values()))
+        assert total == pytest.approx(sum(map(sum, original.values())), rel=0.02), tolerance
+
+
+def test_tiny_feature_survives_coarsest_level():
+    store = GeometryStore.from_geojson({"type": "FeatureCollection",
+                                        "features": [square("Besar", 0, 0), square("Pulau Kecil", 5, 5, size=0.001)]},
+                                       tolerances=(0.0, 0.05), precision=3)
+    coarse = store.geojson(0.05)
+    assert [f["properties"]["Propinsi"] for f in coarse["features"]] == ["BESAR", "PULAUKECIL"]
+    assert all(f["geometry"]["coordinates"] for f in coarse["features"])
+
+
+@pytest.mark.parametrize("bits", [12, 16])
+def test_quantized_payload_decodes_within_half_a_step(store, bits):
+    tolerance = 0.005
+    payload = store.quantized_payload(tolerance, bits=bits)
+    scale = np.array(payload["transform"]["scale"])
+    translate = np.array(payload["transform"]["translate"])
+
+    decoded = [
+        np.cumsum(np.asarray(flat, dtype=np.int64).reshape(-1, 2), axis=0) * scale + translate
+        for feature in payload["features"]
+        for polygon in feature["polygons"]
+        for flat in polygon
+    ]
+    expected = [ring for _, ring in rings(store.geojson(tolerance))]
+    assert [f["id"] for f in payload["features"]] == store.keys
+    assert len(decoded) == len(expected)
+    for got, want in zip(decoded, expected):
+        assert got.shape == want.shape
+        assert np.all(np.abs(got - want) <= scale / 2 + 1e-9)
+
+
+def test_to_dict_round_trips_exactly_through_json(store):
+    data = json.loads(json.dumps(store.to_dict()))
+    restored = GeometryStore.from_dict(data)
+    assert restored.tolerances == store.tolerances
+    assert restored.featureidkey == store.featureidkey
+    for tolerance in store.tolerances:
+        assert restored.geojson(tolerance) == store.geojson(tolerance)
+    assert restored.to_dict() == store.to_dict()
+
+
+def test_published_geometry_name_follows_content(tmp_path):
+    features = [square("Bali", 0, 0), square("Jambi", 2, 0)]
+    first = publish_geometry(GeometryStore.from_geojson({"features": features}), str(tmp_path))
+    again = publish_geometry(GeometryStore.from_geojson({"features": features}), str(tmp_path))
+    assert again == first
+
+    moved = [square("Bali", 0, 0), square("Jambi", 2, 0.5)]
+    changed = publish_geometry(GeometryStore.from_geojson({"features": moved}), str(tmp_path))
+    assert changed["digest"] != first["digest"]
+    assert changed["url"] != first["url"]
+    assert sorted(os.listdir(tmp_path)) == sorted([f"geometry-{first['digest']}.json", f"geometry-{changed['digest']}.json"])
+    with open(tmp_path / f"geometry-{first['digest']}.json", "rb") as f:
+        assert len(f.read()) == first["bytes"]
@@ -0,0 +1,78 @@
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+from neetify.ingest import ingest
+
+
+@pytest.fixture
+def workspace(tmp_path, panel_path):
+    data = tmp_path / "panel.csv"
+    shutil.copyfile(panel_path, data)
+    return {"data_path": str(data), "cache_dir": str(tmp_path / "cache"), "changelog": str(tmp_path / "changelog.jsonl")}
+
+
+def write_release(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def read_lines(path):
+    with open(path, "rb") as f:
+        return f.read().splitlines(keepends=True)
+
+
+def test_correction_changes_one_line_and_repeat_ingest_is_a_no_op(tmp_path, workspace):
+    original = read_lines(workspace["data_path"])
+    release = write_release(tmp_path / "koreksi.csv", [{"provinsi": "Bali", "tahun": 2024, "TPT": 9.99}])
+
+    entry = ingest(release, **workspace)
+    corrected = read_lines(workspace["data_path"])
+    changed = [i for i, (old, new) in enumerate(zip(original, corrected)) if old != new]
+    assert len(corrected) == len(original)
+    assert len(changed) == 1
+    assert b",9.99," in corrected[changed[0]]
+    assert corrected[changed[0]].endswith(b"\r\n")
+    assert entry["slices_changed"] == {"TPT": [2024]}
+    assert [cell["kolom"] for cell in entry["cells_changed"]] == ["TPT"]
+    refreshed = {item["artifact"]: item["status"] for item in entry["artifacts"]}
+    assert refreshed["statistik_gls"] == "dibangun_ulang"
+    assert refreshed["parameter_model"] == "perlu_dijalankan"
+    assert set(refreshed.values()) <= {"dibangun_ulang", "perlu_dijalankan"}
+
+    again = ingest(release, **workspace)
+    assert again["slices_changed"] == {}
+    assert again["artifacts"] == []
+    assert read_lines(workspace["data_path"]) == corrected
+    with open(workspace["changelog"]) as f:
+        assert [json.loads(line)["slices_changed"] for line in f] == [{"TPT": [2024]}]
+
+
+def test_new_year_is_appended_without_touching_existing_lines(tmp_path, workspace):
+    original = read_lines(workspace["data_path"])
+    release = write_release(tmp_path / "rilis.csv", [{"provinsi": "DKI Jakarta", "tahun": 2025, "neet_rate": 17.5}])
+
+    entry = ingest(release, **workspace)
+    merged = read_lines(workspace["data_path"])
+    added = [line for line in merged if line not in original]
+    assert len(merged) == len(original) + 1
+    assert [line for line in merged if line in original] == original
+    assert len(added) == 1 and b",2025,17.5," in added[0]
+    assert entry["years_added"] == [2025]
+    assert entry["rows_added"] == 1
+
+
+def test_invalid_release_is_rejected_before_writing(tmp_path, workspace):
+    original = read_lines(workspace["data_path"])
+    release = write_release(tmp_path / "salah.csv", [
+        {"provinsi": "Atlantis", "tahun": 2025, "TPT": 5.0},
+        {"provinsi": "Bali", "tahun": 2025, "TPT": 5.0},
+        {"provinsi": "BALI", "tahun": 2025, "TPT": 6.0},
+    ])
+
+    with pytest.raises(ValueError, match="Atlantis"):
+        ingest(release, **workspace)
+    assert read_lines(workspace["data_path"]) == original
+    assert not (tmp_path / "changelog.jsonl").exists()
@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neetify.data import read_model_params, read_panel
+from neetify.estimation import params_frame
+from neetify.model import RegionalModel, all_potential_vars, normalize_model_params
+
+
+def fitted_model(covariance):
+    """Model satu wilayah dengan PPM dan TPT, disusun lewat `params_frame` seperti keluaran `estimate --se`."""
+    fit = {
+        "variables": ["PPM", "TPT"],
+        "beta": np.array([10.0, 0.5, -0.2]),
+        "stderr": np.sqrt(np.diag(covariance)),
+        "pvalues": np.array([0.001, 0.01, 0.02]),
+        "covariance": covariance,
+    }
+    return RegionalModel.from_frame(normalize_model_params(params_frame({"SULAWESI": fit}, include_se=True)))
+
+
+def test_coefficient_draws_follow_the_stored_covariance_including_the_intercept():
+    covariance = np.array([[4.0, -0.3, 0.1], [-0.3, 0.05, 0.0], [0.1, 0.0, 0.02]])
+    model = fitted_model(covariance)
+    assert model.has_covariance("SULAWESI") and not model.stderr_derived
+
+    draws = model.coefficient_draws("SULAWESI", n_draws=200_000)
+    terms = [0, 1 + all_potential_vars.index("PPM"), 1 + all_potential_vars.index("TPT")]
+    np.testing.assert_allclose(np.cov(draws[:, terms], rowvar=False), covariance, atol=0.02)
+    unused = np.setdiff1d(np.arange(draws.shape[1]), terms)
+    assert np.all(draws[:, unused] == 0.0)
+
+
+def test_predict_draws_are_clipped_to_percent_range():
+    model = fitted_model(np.diag([400.0, 1.0, 1.0]))
+    draws = model.coefficient_draws("SULAWESI", n_draws=10_000)
+    prediction = model.predict_draws("SULAWESI", draws, {"PPM": 10.0, "TPT": 5.0})
+    assert prediction.min() == 0.0 and prediction.max() <= 100.0
+
+
+def test_without_covariance_the_band_is_centred_on_the_regional_mean(regional_model):
+    region = "JAWA"
+    assert not regional_model.has_covariance(region) and regional_model.stderr_derived
+    center = {var: 1000.0 + i for i, var in enumerate(regional_model.variables)}
+    draws = regional_model.coefficient_draws(region, n_draws=1_000)
+    assert np.all(draws[:, 0] == draws[0, 0])
+
+    at_center = regional_model.predict_draws(region, draws, center, center=center, bounds=(-np.inf, np.inf))
+    assert at_center == pytest.approx(np.full(len(draws), regional_model.predict_one(region, center)))
+
+
+def original_prediction(param_region, inputs):
+    """Rumus skalar simulasi sebelum RegionalModel: koefisien atau input kosong dianggap 0."""
+    model_actual_vars = [var for var in all_potential_vars if pd.notna(param_region.get(var))]
+    prediksi_neet = param_region["intercept"]
+    for var in model_actual_vars:
+        coef_to_use = param_region.get(var)
+        if pd.isna(coef_to_use):
+            coef_to_use = 0.0
+        input_value = inputs.get(var, 0.0)
+        if pd.isna(input_value):
+            input_value = 0.0
+        prediksi_neet += coef_to_use * input_value
+    return prediksi_neet
+
+
+def test_predict_matches_original_scalar_formula_on_shipped_panel(panel_path, regional_model):
+    params = read_model_params(os.path.join(os.path.dirname(panel_path), "model_params_region.csv")).set_index("Wilayah")
+    panel = read_panel(panel_path)
+    # Input kosong (termasuk variabel yang tidak dipakai wilayahnya) harus dianggap 0.
+    panel.loc[panel.index[::7], "PPM"] = np.nan
+    panel.loc[panel.index[::5], "PL"] = np.nan
+
+    expected = np.array([original_prediction(params.loc[row["Wilayah"]], row) for _, row in panel.iterrows()])
+    np.testing.assert_allclose(regional_model.predict(panel), expected, rtol=1e-12)
+    for (_, row), value in zip(panel.iterrows(), expected):
+        inputs = {var: row[var] for var in all_potential_vars}
+        assert regional_model.predict_one(row["Wilayah"], inputs) == pytest.approx(value, rel=1e-12)
+
+    assert np.isnan(regional_model.predict(panel.head(1), regions=["ATLANTIS"])).all()
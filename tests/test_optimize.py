@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neetify.data import load_panel
+from neetify.optimize import min_norm_change, target_plan
+
+
+def test_min_norm_change_spreads_change_then_respects_bounds():
+    coef = np.array([[1.0, 1.0], [1.0, 1.0], [2.0, 0.0]])
+    gap = np.array([-2.0, -2.0, 5.0])
+    lower = np.array([[-np.inf, -np.inf], [-0.5, -np.inf], [-np.inf, -np.inf]])
+    upper = np.full((3, 2), np.inf)
+    delta, reachable = min_norm_change(coef, gap, lower, upper, np.ones((3, 2)))
+
+    np.testing.assert_allclose(delta, [[-1.0, -1.0], [-0.5, -1.5], [2.5, 0.0]], atol=1e-9)
+    assert reachable.all()
+
+
+def test_min_norm_change_flags_unreachable_gap():
+    delta, reachable = min_norm_change(np.array([[1.0]]), np.array([-3.0]), np.array([[-1.0]]),
+                                       np.array([[1.0]]), np.ones((1, 1)))
+    assert not reachable[0]
+    assert delta[0, 0] == pytest.approx(-1.0)
+
+
+def test_target_plan_reaches_target_within_tolerance(panel_path, regional_model):
+    panel, model = load_panel(panel_path), regional_model
+    target = 15.0
+    plan = target_plan(model, panel, target)
+
+    inputs = pd.DataFrame({var: plan[f"{var}_baru"] for var in model.variables}).assign(Wilayah=plan["Wilayah"])
+    np.testing.assert_allclose(model.predict(inputs), plan["prediksi_target"], atol=1e-9)
+
+    above = plan["prediksi_awal"] > target
+    reached = plan["tercapai"] & above
+    assert reached.any()
+    np.testing.assert_allclose(plan.loc[reached, "prediksi_target"], target, atol=1e-6)
+    assert (plan.loc[above & ~plan["tercapai"], "prediksi_target"] > target).all()
+
+    below = plan[~above]
+    for var in model.variables:
+        np.testing.assert_array_equal(below[f"{var}_baru"], below[f"{var}_awal"])
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neetify.data import read_panel
+from neetify.panel import CompactPanel, PanelCube
+
+
+def original_year_merge(neet, tahun):
+    """Penggabungan per tahun dari dashboard sebelum PanelCube (data_now + data_prev)."""
+    data_now = neet[neet["tahun"] == tahun].copy()
+    if tahun == neet["tahun"].min():
+        data_now["perubahan"] = None
+        data_now["tooltip"] = data_now.apply(lambda row: f"{row['provinsi']}<br>NEET: {row['neet_rate']:.2f}%", axis=1)
+        data_now["neet_rate_prev"] = np.nan
+        return data_now.rename(columns={"neet_rate": "neet_rate_now"})
+
+    data_prev = neet[neet["tahun"] == tahun - 1].copy()
+    data_prev.rename(columns={"neet_rate": "neet_rate_prev"}, inplace=True)
+    data_now.rename(columns={"neet_rate": "neet_rate_now"}, inplace=True)
+    data_merge = pd.merge(data_now, data_prev[["provinsi", "neet_rate_prev"]], on="provinsi", how="left")
+    data_merge["perubahan"] = ((data_merge["neet_rate_now"] - data_merge["neet_rate_prev"]) / data_merge["neet_rate_prev"]) * 100
+
+    def format_arrow(val):
+        if pd.isna(val):
+            return "-"
+        return f"▲ {val:.2f}%" if val > 0 else f"▼ {abs(val):.2f}%"
+
+    data_merge["tooltip"] = data_merge.apply(
+        lambda row: f"{row['provinsi']}<br>NEET: {row['neet_rate_now']:.2f}%<br>Perubahan: {format_arrow(row['perubahan'])}",
+        axis=1
+    )
+    return data_merge
+
+
+@pytest.fixture(scope="module")
+def panel(panel_path):
+    return read_panel(panel_path)
+
+
+@pytest.mark.parametrize("missing", [None, ("BALI", 2020)])
+def test_cube_matches_original_per_year_merge(panel, missing):
+    if missing is not None:
+        panel = panel[~((panel["provinsi"] == missing[0]) & (panel["tahun"] == missing[1]))]
+    cube = PanelCube.build(CompactPanel.build(panel).frame)
+
+    assert cube.years == sorted(panel["tahun"].unique())
+    for tahun in cube.years:
+        got = cube.year(tahun).set_index("provinsi")
+        want = original_year_merge(panel, tahun).set_index("provinsi").sort_index()
+        assert list(got.index) == list(want.index)
+
+        np.testing.assert_allclose(got["neet_rate"], want["neet_rate_now"], rtol=1e-12)
+        np.testing.assert_allclose(got["neet_rate_prev"], want["neet_rate_prev"].astype(float), rtol=1e-12)
+        np.testing.assert_allclose(got["neet_rate_diff"], want["neet_rate_now"] - want["neet_rate_prev"], rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(got["neet_rate_pct"], want["perubahan"].astype(float), rtol=1e-9)
+        assert list(got["tooltip"]) == list(want["tooltip"])
+        expected_rank = want["neet_rate_now"].rank(ascending=False, method="min").astype(int)
+        assert list(got["neet_rate_rank"]) == list(expected_rank)
+
+    if missing is not None:
+        prov, tahun = missing
+        after = cube.year(tahun + 1).set_index("provinsi").loc[prov]
+        assert pd.isna(after["neet_rate_prev"]) and after["tooltip"].endswith("Perubahan: -")
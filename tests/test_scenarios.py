@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neetify.data import read_panel
+from neetify.scenarios import ScenarioScorer, ScoringRun
+
+
+@pytest.fixture(scope="module")
+def scorer(panel_path, regional_model):
+    return ScenarioScorer(regional_model, read_panel(panel_path))
+
+
+def random_scenarios(scorer, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    provinces = rng.choice(list(scorer.baseline.index) + ["ATLANTIS"], size=n_rows)
+    table = pd.DataFrame({"provinsi": provinces})
+    for var in scorer.model.variables:
+        values = scorer.baseline[var].reindex(provinces).fillna(1.0).to_numpy() * rng.uniform(0.8, 1.2, n_rows)
+        table[var] = np.where(rng.random(n_rows) < 0.1, np.nan, values)
+    return table
+
+
+def test_non_significant_variables_stay_at_baseline(scorer, regional_model):
+    prov, region = "JAWABARAT", "JAWA"
+    i = regional_model.regions.index(region)
+    locked = [var for j, var in enumerate(regional_model.variables)
+              if regional_model.used[i, j] and not scorer.significant[i, j]]
+    assert locked, "JAWA harus punya variabel tidak signifikan untuk pengujian ini"
+
+    base = scorer.baseline.loc[prov]
+    scenario = {var: base[var] + 5.0 for var in regional_model.variables}
+    scored = scorer.score(pd.DataFrame([{"provinsi": "Jawa Barat", **scenario}])).iloc[0]
+
+    effective = {var: base[var] if var in locked else scenario[var] for var in regional_model.variables}
+    assert scored["Wilayah"] == region
+    assert scored["prediksi"] == pytest.approx(regional_model.predict_one(region, effective))
+    assert scored["prediksi_dasar"] == pytest.approx(regional_model.predict_one(region, base.to_dict()))
+    assert scored["variabel_dikunci"] == len(locked)
+
+    only_locked = scorer.score(pd.DataFrame([{"provinsi": prov, **{var: scenario[var] for var in locked}}])).iloc[0]
+    assert only_locked["perubahan"] == 0.0
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunked_run_equals_single_score(tmp_path, scorer, suffix, workers):
+    table = random_scenarios(scorer, 2_500)
+    input_path = str(tmp_path / f"skenario{suffix}")
+    if suffix == ".csv":
+        table.to_csv(input_path, index=False)
+    else:
+        table.to_parquet(input_path, index=False)
+
+    out_path = str(tmp_path / "hasil.parquet")
+    rows = ScoringRun(out_path, chunk_size=333, workers=workers, progress=None).run(scorer, input_path)
+    assert rows == len(table)
+
+    expected = scorer.score(table)
+    got = pd.read_parquet(out_path)
+    assert list(got.columns) == list(expected.columns)
+    assert list(got["provinsi"]) == list(expected["provinsi"])
+    assert list(got["Wilayah"].fillna("-")) == list(expected["Wilayah"].fillna("-"))
+    for col in ["prediksi", "prediksi_dasar", "perubahan", "variabel_dikunci"]:
+        np.testing.assert_allclose(got[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float), rtol=1e-12)
+    assert got["prediksi"].isna().sum() == (table["provinsi"] == "ATLANTIS").sum()
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from neetify.data import read_panel
+from neetify.inputs import default_inputs, input_bounds
+from neetify.sensitivity import sweep_all, sweep_range
+
+
+def test_sweep_all_matches_predict_one_at_every_point(panel_path, regional_model):
+    panel = read_panel(panel_path)
+    region, prov = "JAWA", "JAWABARAT"
+    baseline = default_inputs(panel, prov, regional_model.variables)
+    variables = ("PPM", "TPT", "TIK")
+    ranges = {var: sweep_range(baseline[var], input_bounds(var, panel), 0.2) for var in variables}
+    steps = 9
+
+    tornado, surfaces = sweep_all(regional_model, region, baseline, variables, ranges, steps=steps)
+
+    assert tornado.attrs["prediksi_dasar"] == pytest.approx(regional_model.predict_one(region, baseline))
+    for row in tornado.itertuples():
+        low = regional_model.predict_one(region, {**baseline, row.variabel: row.nilai_rendah})
+        high = regional_model.predict_one(region, {**baseline, row.variabel: row.nilai_tinggi})
+        assert (row.nilai_rendah, row.nilai_tinggi) == ranges[row.variabel]
+        assert (row.prediksi_rendah, row.prediksi_tinggi) == pytest.approx((low, high))
+    assert list(tornado["rentang_dampak"]) == sorted(tornado["rentang_dampak"])
+
+    assert set(surfaces) == {("PPM", "TPT"), ("PPM", "TIK"), ("TPT", "TIK")}
+    for (var_x, var_y), (xs, ys, grid) in surfaces.items():
+        np.testing.assert_allclose(xs, np.linspace(*ranges[var_x], steps))
+        np.testing.assert_allclose(ys, np.linspace(*ranges[var_y], steps))
+        expected = [[regional_model.predict_one(region, {**baseline, var_x: x, var_y: y}) for x in xs] for y in ys]
+        np.testing.assert_allclose(grid, expected, rtol=1e-12)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from neetify.spatial import SpatialWeights, moran
+
+
+def rook_grid(size):
+    """Bobot ketetanggaan rook (atas/bawah/kiri/kanan) yang distandarkan per baris untuk grid `size` x `size`."""
+    indptr, indices, weights = [0], [], []
+    for r in range(size):
+        for c in range(size):
+            neighbors = [(r + dr) * size + (c + dc) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                         if 0 <= r + dr < size and 0 <= c + dc < size]
+            indices += neighbors
+            weights += [1.0 / len(neighbors)] * len(neighbors)
+            indptr.append(len(indices))
+    return SpatialWeights([f"s{i}" for i in range(size * size)], indptr, indices, weights)
+
+
+def square(key, x, y):
+    ring = [[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1], [x, y]]
+    return {"type": "Feature", "properties": {"kode": key}, "geometry": {"type": "MultiPolygon", "coordinates": [[ring]]}}
+
+
+def test_checkerboard_has_perfect_negative_autocorrelation():
+    size = 4
+    checkerboard = np.array([(r + c) % 2 for r in range(size) for c in range(size)], dtype=float)
+    result = moran(rook_grid(size), checkerboard[:, None], permutations=199)
+    assert result["I"][0] == pytest.approx(-1.0)
+    assert result["EI"][0] == pytest.approx(-1.0 / 15)
+    assert result["p_sim"][0] < 0.05
+
+
+def test_moran_matches_dense_formula_for_every_column():
+    weights = rook_grid(5)
+    dense = np.zeros((25, 25))
+    for i in range(25):
+        for j, w in zip(weights.indices[weights.indptr[i]:weights.indptr[i + 1]],
+                        weights.weights[weights.indptr[i]:weights.indptr[i + 1]]):
+            dense[i, j] = w
+    x = np.random.default_rng(1).normal(size=(25, 3))
+    z = x - x.mean(axis=0)
+    expected = len(z) / dense.sum() * np.einsum("ik,ij,jk->k", z, dense, z) / (z * z).sum(axis=0)
+    np.testing.assert_allclose(moran(weights, x, permutations=9)["I"], expected, rtol=1e-12)
+
+
+def test_gradient_is_positively_autocorrelated_and_islands_get_nearest_neighbors():
+    features = [square(f"s{r}{c}", c, r) for r in range(3) for c in range(3)] + [square("pulau", 10, 0)]
+    weights = SpatialWeights.from_geojson({"type": "FeatureCollection", "features": features}, "kode", k=1)
+    assert sorted(weights.neighbors("s11")) == sorted(f"s{r}{c}" for r in range(3) for c in range(3) if (r, c) != (1, 1))
+    assert weights.neighbors("pulau") == ["s02"]
+
+    gradient = np.array([c for r in range(3) for c in range(3)] + [3], dtype=float)
+    result = moran(weights, gradient[:, None], permutations=499)
+    assert result["I"][0] > 0.3
+    assert result["p_sim"][0] < 0.05
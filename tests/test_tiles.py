@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from neetify.tiles import TileStore, split_adm2
+
+
+def regency(gid, province, x, y, size=1.0):
+    ring = [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+    return {"type": "Feature",
+            "properties": {"GID_2": gid, "NAME_2": gid, "NAME_1": province, "GID_1": province[:3]},
+            "geometry": {"type": "MultiPolygon", "coordinates": [[ring]]}}
+
+
+@pytest.fixture
+def adm2(tmp_path):
+    # tiga provinsi berjajar ke timur, dua kabupaten per provinsi
+    features = []
+    for k, province in enumerate(["Aceh", "Bali", "Jambi"]):
+        features += [regency(f"{province}.{i}", province, 10 * k + 2 * i, 0) for i in range(2)]
+    features.append({"type": "Feature", "properties": {"NAME_2": "tanpa kunci", "NAME_1": "Aceh"},
+                     "geometry": features[0]["geometry"]})
+    index = split_adm2({"type": "FeatureCollection", "features": features}, str(tmp_path))
+    return str(tmp_path), index, features
+
+
+def test_split_index_points_back_to_each_province_file(adm2):
+    directory, index, features = adm2
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+        assert json.load(f) == json.loads(json.dumps(index))
+
+    assert index["key"] == "GID_2"
+    assert sorted(index["tiles"]) == ["ACEH", "BALI", "JAMBI"]
+    for province, tile in index["tiles"].items():
+        with open(os.path.join(directory, tile["file"]), encoding="utf-8") as f:
+            level = json.load(f)["levels"]["0.0"]
+        gids = [feature["properties"]["GID_2"] for feature in level["features"]]
+        assert gids == [feature["properties"]["GID_2"] for feature in features
+                        if "GID_2" in feature["properties"] and feature["properties"]["NAME_1"].upper() == province]
+        assert tile["features"] == len(gids) == 2
+        k = sorted(index["tiles"]).index(province)
+        assert list(tile["bbox"]) == [10.0 * k, 0.0, 10.0 * k + 3.0, 1.0]
+
+
+def test_tile_store_bbox_lookup(adm2):
+    store = TileStore(adm2[0])
+    assert store.provinces == ["ACEH", "BALI", "JAMBI"]
+    assert store.at(10.5, 0.5) == ["BALI"]
+    assert store.at(5.0, 0.5) == []
+    assert store.query((2.5, -1.0, 21.0, 0.1)) == ["ACEH", "BALI", "JAMBI"]
+    assert store.query((13.0, 0.0, 15.0, 1.0)) == ["BALI"]
+    assert "BALI" in store and "PAPUA" not in store
+    assert store.bbox("JAMBI") == (20.0, 0.0, 23.0, 1.0)
+    assert [f["properties"]["GID_2"] for f in store.geojson("BALI")["features"]] == ["Bali.0", "Bali.1"]
+
+
+def test_tile_store_evicts_least_recently_used(adm2):
+    store = TileStore(adm2[0], max_tiles=2)
+    aceh, bali = store.tile("ACEH"), store.tile("BALI")
+    assert store.tile("ACEH") is aceh  # ACEH kini yang terakhir dipakai
+    store.tile("JAMBI")  # BALI terlama, dikeluarkan
+    assert store.tile("ACEH") is aceh
+    assert store.tile("BALI") is not bali
@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neetify.data import load_model_params, read_panel
+from neetify.estimation import StatisticsCache, spec_from_params
+from neetify.validation import ValidationRun, bootstrap_chunk, cross_validate, group_arrays
+
+VARIABLES = ["x1", "x2"]
+
+
+def synthetic_panel(seed=0, provinces=6, years=8):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for p in range(provinces):
+        for tahun in range(2016, 2016 + years):
+            x1, x2 = rng.normal(size=2)
+            rows.append({"provinsi": f"P{p}", "tahun": tahun, "x1": x1, "x2": x2,
+                         "neet_rate": 20 + 1.5 * x1 - 0.7 * x2 + rng.normal(scale=0.2 + p)})
+    return pd.DataFrame(rows)
+
+
+def arrays_for(panel):
+    cache = StatisticsCache(variables=VARIABLES)
+    cache.update(panel)
+    return group_arrays(cache, set(panel["provinsi"]), VARIABLES)
+
+
+def direct_fgls_beta(panel):
+    """OLS gabungan, varians per provinsi dari residual, lalu kuadrat terkecil berbobot pada matriks desain."""
+    x = np.column_stack([np.ones(len(panel)), panel[VARIABLES].to_numpy()])
+    y = panel["neet_rate"].to_numpy()
+    resid = pd.Series(y - x @ np.linalg.lstsq(x, y, rcond=None)[0], index=panel.index)
+    root = np.sqrt(1.0 / panel["provinsi"].map((resid ** 2).groupby(panel["provinsi"]).mean()).to_numpy())
+    return np.linalg.lstsq(x * root[:, None], y * root, rcond=None)[0]
+
+
+def held_out_rmse(train, test):
+    beta = direct_fgls_beta(train)
+    x = np.column_stack([np.ones(len(test)), test[VARIABLES].to_numpy()])
+    return float(np.sqrt(np.mean((test["neet_rate"].to_numpy() - x @ beta) ** 2)))
+
+
+def test_cross_validation_from_statistics_equals_direct_refit():
+    panel = synthetic_panel()
+    provinces, years, arrays = arrays_for(panel)
+    rows = cross_validate("UJI", VARIABLES, arrays)
+
+    lopo = [row for row in rows if row["skema"] == "LOPO"]
+    assert [row["fold"] for row in lopo] == list(range(len(provinces)))
+    for row, prov in zip(lopo, provinces):
+        held = panel["provinsi"] == prov
+        assert row["n"] == held.sum()
+        assert row["rmse"] == pytest.approx(held_out_rmse(panel[~held], panel[held]), rel=1e-8)
+
+    loyo = [row for row in rows if row["skema"] == "LOYO"]
+    assert [row["fold"] for row in loyo] == list(range(len(years)))
+    for row, tahun in zip(loyo, years):
+        held = panel["tahun"] == tahun
+        assert row["n"] == held.sum()
+        assert row["rmse"] == pytest.approx(held_out_rmse(panel[~held], panel[held]), rel=1e-8)
+
+
+def test_bootstrap_chunks_concatenate_to_a_single_call():
+    _, _, arrays = arrays_for(synthetic_panel())
+    seed = np.random.SeedSequence(42).spawn(3)[1]
+    _, _, whole = bootstrap_chunk("UJI", VARIABLES, arrays, 30, seed)
+    parts = [bootstrap_chunk("UJI", VARIABLES, arrays, size, seed, start=start)[2]
+             for start, size in ((0, 7), (7, 16), (23, 7))]
+    np.testing.assert_array_equal(np.vstack(parts), whole)
+
+    _, _, other = bootstrap_chunk("UJI", VARIABLES, arrays, 30, np.random.SeedSequence(43).spawn(3)[1])
+    assert not np.array_equal(other, whole)
+
+
+def test_validation_run_draws_do_not_depend_on_workers_or_chunk_size(tmp_path, panel_path):
+    panel = read_panel(panel_path)
+    spec = spec_from_params(load_model_params(os.path.join(os.path.dirname(panel_path), "model_params_region.csv")))
+
+    def draws(name, workers, chunk_size):
+        out_dir = tmp_path / name
+        ValidationRun(str(out_dir), n_draws=24, chunk_size=chunk_size, seed=7, workers=workers, progress=None).run(panel, spec)
+        return pd.read_csv(out_dir / "bootstrap_draws.csv").sort_values(["Wilayah", "draw", "variabel"], ignore_index=True)
+
+    reference = draws("satu", workers=1, chunk_size=24)
+    assert len(reference) == 24 * sum(len(variables) + 1 for variables in spec.values())
+    pd.testing.assert_frame_equal(draws("dua", workers=2, chunk_size=5), reference)
+    pd.testing.assert_frame_equal(draws("tiga", workers=2, chunk_size=11), reference)